@@ -1,6 +1,7 @@
 import time
 import json
 import os
+import sys
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -9,6 +10,10 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+# 프로젝트 스크립트의 크롬 드라이버 풀 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "프로젝트 스크립트"))
+from DriverPool import DriverPool
+
 def crawl_details_from_file(input_file_name, output_file_name):
     # 1. JSON 파일에서 URL 리스트 로드
     if not os.path.exists(input_file_name):
@@ -29,8 +34,8 @@ def crawl_details_from_file(input_file_name, output_file_name):
     # chrome_options.add_argument("--headless") # 브라우저 안 보고 싶으면 주석 해제
 
     service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    wait = WebDriverWait(driver, 10)
+    # URL마다 드라이버를 빌리고 반납. 일정 페이지마다 새 드라이버로 교체됨.
+    pool = DriverPool(maxSize=1, maxPages=100, options=chrome_options, service=service)
 
     results = []
 
@@ -38,6 +43,8 @@ def crawl_details_from_file(input_file_name, output_file_name):
     for i, url in enumerate(url_list):
         print(f"\n[{i+1}/{len(url_list)}] 이동 중: {url}")
         
+        driver = pool.Acquire()
+        wait = WebDriverWait(driver, 10)
         try:
             driver.get(url)
             
@@ -97,7 +104,10 @@ def crawl_details_from_file(input_file_name, output_file_name):
             # 실패해도 멈추지 않고 다음 URL로 넘어갑니다.
             continue
 
-    driver.quit()
+        finally:
+            pool.Release(driver)
+
+    pool.Close()
 
     # 4. 결과를 JSON 파일로 저장
     with open(output_file_name, 'w', encoding='utf-8') as f:
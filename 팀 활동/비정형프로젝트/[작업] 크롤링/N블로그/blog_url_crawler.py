@@ -1,5 +1,7 @@
 import json
 import time
+import sys
+import os
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -7,6 +9,10 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
+# 프로젝트 스크립트의 크롬 드라이버 풀 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "프로젝트 스크립트"))
+from DriverPool import DriverPool
+
 def crawl_blog_headlines(target_count=20, output_file="blog_headlines.json"):
     # 1. 크롬 옵션 설정
     chrome_options = Options()
@@ -16,7 +22,8 @@ def crawl_blog_headlines(target_count=20, output_file="blog_headlines.json"):
 
     # 2. 브라우저 실행
     service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    pool = DriverPool(maxSize=1, options=chrome_options, service=service)
+    driver = pool.Acquire()
 
     # 3. 네이버 검색 페이지 이동
     keyword = input("검색할 키워드를 입력하세요: ")
@@ -79,7 +86,8 @@ def crawl_blog_headlines(target_count=20, output_file="blog_headlines.json"):
         # 만약 스크롤을 내려도 더 이상 새로운게 안 나오면 종료하는 로직이 필요하다면 추가 가능
         # (현재는 목표 개수 채울 때까지 계속 내립니다)
 
-    driver.quit()
+    pool.Release(driver)
+    pool.Close()
 
     # 결과 저장
     result_list = list(collected_links)[:target_count]
@@ -1,119 +1,272 @@
 import os
+import sys
 import json
 import time
+import queue
 import requests
 import multiprocessing
-import numpy as np
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
+# 프로젝트 스크립트의 크롬 드라이버 풀 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "프로젝트 스크립트"))
+from DriverPool import DriverPool
+
 # ==========================================
 # ⚙️ 설정
 # ==========================================
 PROCESS_COUNT = 4         # 🚀 동시에 띄울 크롬 창 개수 (컴퓨터 사양에 따라 4~8 조절)
 URL_FILE = "all_urls.json" # 1단계에서 만든 파일 이름
 BASE_DIR = "./raw_data"
+BATCH_SIZE = 5            # 워커가 작업 큐에서 한 번에 가져갈 URL 수 (작을수록 고르게 분배)
+MAX_RETRIES = 2           # 🔁 실패한 URL을 다시 큐에 넣는 최대 횟수
+REPORT_INTERVAL = 5.0     # 📊 진행 상황 출력 주기 (초)
+DOWNLOAD_TIMEOUT = 10     # 이미지 다운로드 제한 시간 (초)
+
+# ==========================================
+# 🔎 상세 페이지 하나 크롤링
+# ==========================================
+def crawl_url(driver, url, downloaded_ids, process_id, count):
+    """
+    상세 페이지에서 태그와 이미지를 찾아 이미지를 저장.
+    반환 : 메타 데이터 dict, 저장할 이미지가 없으면 None (재시도하지 않음)
+    예외 : 페이지 로딩, 이미지 다운로드 실패 (재시도 대상)
+    """
+    driver.get(url)
+    time.sleep(1.5) # 로딩 대기
+
+    target_img = None
+    extracted_tags = []
+
+    # -------------------------------------------------
+    # [기존 로직] 상세 페이지 분석 (alt 태그 + 이미지 찾기)
+    # -------------------------------------------------
+    images = driver.find_elements(By.TAG_NAME, "img")
+
+    for img in images:
+        try:
+            alt_text = img.get_attribute("alt")
+            src = img.get_attribute("src")
+
+            # 조건: alt에 #이 있고, 코디맵/스냅 이미지
+            if alt_text and "#" in alt_text and src and ("codimap" in src or "snap" in src):
+                temp_id = src.split("/")[-1].split("?")[0].replace(".jpg", "")
+
+                # 같은 프로세스 내 중복 방지
+                if temp_id in downloaded_ids:
+                    continue
+
+                target_img = img
+                extracted_tags = [t.strip() for t in alt_text.split("#") if t.strip()]
+                break
+        except: continue
+
+    if not target_img:
+        return None # 못 찾으면 패스
+
+    # 데이터 저장
+    img_url = target_img.get_attribute("src")
+    unique_id = img_url.split("/")[-1].split("?")[0].replace(".jpg", "")
+
+    if len(unique_id) < 5: unique_id = f"snap_{int(time.time())}_{process_id}_{count}"
+
+    img_filename = f"{unique_id}.jpg"
+    img_path = os.path.join(BASE_DIR, img_filename)
+
+    # 이미지 다운로드. 오류 응답을 이미지로 저장하지 않도록 상태 코드 확인.
+    response = requests.get(img_url, timeout=DOWNLOAD_TIMEOUT)
+    response.raise_for_status()
+    with open(img_path, "wb") as f:
+        f.write(response.content)
+
+    # 저장에 성공한 이미지만 중복으로 기록 (실패하면 재시도 때 다시 받을 수 있도록)
+    downloaded_ids.add(unique_id)
+    return {
+        "id": unique_id,
+        "tags": extracted_tags,
+        "image_path": img_path,
+        "url": url
+    }
 
 # ==========================================
 # 🛠️ 워커 함수 (각 프로세스가 할 일)
 # ==========================================
-def worker_task(process_id, urls):
-    print(f"🤖 프로세스 {process_id} 시작! (담당 URL: {len(urls)}개)")
-    
+def worker_task(process_id, task_queue, event_queue):
+    """
+    작업 큐에서 URL 묶음을 가져와 크롤링. None을 받으면 종료.
+    가져간 URL과 URL마다 결과를 이벤트 큐로 보내고, 실패한 URL은 재시도 횟수가 남았으면 작업 큐 뒤에 다시 넣음.
+    드라이버를 만들지 못하면 (크롬 실행 실패 등) 남은 묶음을 그대로 다시 넣고 비정상 종료.
+    종료할 때는 항상 지금까지의 결과를 저장.
+    """
+    print(f"🤖 프로세스 {process_id} 시작!")
+
     # 프로세스별 저장 폴더/파일 설정
-    if not os.path.exists(BASE_DIR):
-        os.makedirs(BASE_DIR)
-        
+    os.makedirs(BASE_DIR, exist_ok=True)
+
     save_file = f"./result_part_{process_id}.json"
     results = []
+    pool = None
+
+    try:
+        # 옵션: 병렬 처리 시에는 창을 안 띄우는게(Headless) 성능에 좋음
+        chrome_options = Options()
+        chrome_options.add_argument("--headless") # ⭐ 화면 안 보이기 (속도 향상)
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+
+        service = Service(ChromeDriverManager().install())
+        # 묶음마다 드라이버를 빌리고 반납. 일정 페이지마다 새 드라이버로 교체되어 메모리 누적 방지.
+        pool = DriverPool(maxSize=1, maxPages=200, options=chrome_options, service=service)
+
+        # 이미 다운받은 ID 체크 (재시작 시 유용)
+        downloaded_ids = set()
+
+        while True:
+            batch = task_queue.get()
+            if batch is None:
+                break
+
+            # 집계 프로세스가 이 워커가 비정상 종료했을 때 잃은 URL을 알 수 있도록 가져간 URL 전달
+            for url, attempt in batch:
+                event_queue.put(("taken", process_id, url))
+
+            # 드라이버는 묶음마다 한 번만 빌리고 반납 (반납할 때마다 쿠키 초기화와 빈 페이지 로딩이 있으므로)
+            driver = None
+            pages = 0
+            try:
+                for index, (url, attempt) in enumerate(batch):
+                    # 드라이버를 만들지 못하면 (크롬 실행 실패 등) 남은 묶음을 재시도 횟수를 쓰지 않고 다시 넣고 워커 종료
+                    if driver is None:
+                        try:
+                            driver = pool.Acquire()
+                        except Exception:
+                            task_queue.put(batch[index:])
+                            for rest, _ in batch[index:]:
+                                event_queue.put(("requeued", process_id, rest))
+                            raise
+                        pages = 0
 
-    # 옵션: 병렬 처리 시에는 창을 안 띄우는게(Headless) 성능에 좋음
-    chrome_options = Options()
-    chrome_options.add_argument("--headless") # ⭐ 화면 안 보이기 (속도 향상)
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-    
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    
-    # 이미 다운받은 ID 체크 (재시작 시 유용)
-    downloaded_ids = set()
-
-    count = 0
-    for url in urls:
+                    try:
+                        pages += 1
+                        meta_data = crawl_url(driver, url, downloaded_ids, process_id, len(results))
+                        if meta_data is None:
+                            event_queue.put(("skipped", process_id, url))
+                        else:
+                            results.append(meta_data)
+                            event_queue.put(("success", process_id, url))
+
+                    except Exception as e:
+                        # 드라이버 오류면 드라이버 교체. 다음 URL에서 새로 빌림.
+                        if isinstance(e, WebDriverException):
+                            pool.Release(driver, pages=pages, broken=True)
+                            driver = None
+                        if attempt < MAX_RETRIES:
+                            task_queue.put([(url, attempt + 1)])
+                            event_queue.put(("retry", process_id, url))
+                        else:
+                            event_queue.put(("failed", process_id, url))
+
+            finally:
+                if driver is not None:
+                    pool.Release(driver, pages=pages)
+
+    finally:
+        # 최종 결과 저장 (비정상 종료해도 지금까지의 결과는 저장)
+        with open(save_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+
+        if pool is not None:
+            pool.Close()
+        print(f"🏁 프로세스 {process_id} 종료! (총 {len(results)}개 저장)")
+
+# ==========================================
+# 📊 진행 상황 집계
+# ==========================================
+def report_progress(stats, total, start_time):
+    """ 전체 처리 속도와 성공률 출력 """
+    done = stats["success"] + stats["skipped"] + stats["failed"]
+    elapsed = time.time() - start_time
+    rate = done / elapsed if elapsed > 0 else 0.0
+    success_rate = stats["success"] / done if done > 0 else 0.0
+    print(
+        f"📊 {done}/{total} ({done / max(total, 1):.1%}) | {rate:.2f} URLs/sec | 성공률 {success_rate:.1%} "
+        f"| 성공 {stats['success']}, 이미지 없음 {stats['skipped']}, 실패 {stats['failed']}, 재시도 {stats['retry']}, 유실 {stats['lost']}"
+    )
+
+def record_event(event, stats, per_process, in_flight):
+    """ 워커 이벤트 하나를 집계. in_flight에는 프로세스별로 가져가서 아직 결과가 없는 URL을 기록. """
+    kind, process_id, url = event
+    taken = in_flight.setdefault(process_id, [])
+    if kind == "taken":
+        taken.append(url)
+        return
+    if url in taken:
+        taken.remove(url)
+    if kind == "requeued":
+        return
+    stats[kind] += 1
+    if kind != "retry":
+        per_process[process_id] = per_process.get(process_id, 0) + 1
+
+def drain_events(event_queue, stats, per_process, in_flight):
+    """ 이벤트 큐에 남은 이벤트를 기다리지 않고 모두 집계 """
+    while True:
+        try:
+            record_event(event_queue.get_nowait(), stats, per_process, in_flight)
+        except queue.Empty:
+            return
+
+def aggregate_progress(event_queue, processes, total, start_time):
+    """
+    모든 URL의 결과가 나올 때까지 워커 이벤트를 모아서 주기적으로 출력.
+    워커가 비정상 종료하면 (종료 코드가 0이 아님) 그 워커가 가져가서 다시 넣지 못한 URL을 유실로 기록하고,
+    남은 워커가 나머지 URL을 처리하는 동안 계속 집계. 워커가 모두 종료하면 남은 URL을 유실로 기록하고 중단.
+    processes : 프로세스 번호별 Process dict
+    반환 : 결과별 URL 수 dict
+    """
+    stats = {"success": 0, "skipped": 0, "failed": 0, "retry": 0, "lost": 0}
+    per_process = {}
+    in_flight = {}
+    reported = set()
+    last_report = time.time()
+
+    while stats["success"] + stats["skipped"] + stats["failed"] + stats["lost"] < total:
         try:
-            driver.get(url)
-            time.sleep(1.5) # 로딩 대기
-
-            target_img = None
-            extracted_tags = []
-
-            # -------------------------------------------------
-            # [기존 로직] 상세 페이지 분석 (alt 태그 + 이미지 찾기)
-            # -------------------------------------------------
-            images = driver.find_elements(By.TAG_NAME, "img")
-            
-            for img in images:
-                try:
-                    alt_text = img.get_attribute("alt")
-                    src = img.get_attribute("src")
-
-                    # 조건: alt에 #이 있고, 코디맵/스냅 이미지
-                    if alt_text and "#" in alt_text and src and ("codimap" in src or "snap" in src):
-                        temp_id = src.split("/")[-1].split("?")[0].replace(".jpg", "")
-                        
-                        # 같은 프로세스 내 중복 방지
-                        if temp_id in downloaded_ids:
-                            continue
-                            
-                        target_img = img
-                        downloaded_ids.add(temp_id)
-                        extracted_tags = [t.strip() for t in alt_text.split("#") if t.strip()]
-                        break
-                except: continue
-            
-            if not target_img:
-                continue # 못 찾으면 패스
-
-            # 데이터 저장
-            img_url = target_img.get_attribute("src")
-            unique_id = img_url.split("/")[-1].split("?")[0].replace(".jpg", "")
-            
-            if len(unique_id) < 5: unique_id = f"snap_{int(time.time())}_{process_id}_{count}"
-
-            img_filename = f"{unique_id}.jpg"
-            img_path = os.path.join(BASE_DIR, img_filename)
-
-            # 이미지 다운로드
-            img_data = requests.get(img_url).content
-            with open(img_path, "wb") as f:
-                f.write(img_data)
-            
-            meta_data = {
-                "id": unique_id,
-                "tags": extracted_tags,
-                "image_path": img_path,
-                "url": url
-            }
-            results.append(meta_data)
-            count += 1
-            
-            if count % 10 == 0:
-                print(f"   [P{process_id}] {count}개 완료...")
-
-        except Exception as e:
-            continue
-            
-    # 최종 결과 저장
-    with open(save_file, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=4)
-    
-    driver.quit()
-    print(f"🏁 프로세스 {process_id} 종료! (총 {len(results)}개 저장)")
+            record_event(event_queue.get(timeout=REPORT_INTERVAL), stats, per_process, in_flight)
+        except queue.Empty:
+            pass
+
+        # 비정상 종료한 워커가 가져간 URL 중 다시 넣지 못한 URL은 결과가 나올 수 없음
+        crashed = {process_id: p.exitcode for process_id, p in processes.items() if p.exitcode not in (None, 0)}
+        alive = any(p.is_alive() for p in processes.values())
+        if len(crashed) > 0 or not alive:
+            # 종료 전에 보낸 이벤트 (다시 넣은 URL 등)를 먼저 집계
+            drain_events(event_queue, stats, per_process, in_flight)
+            stats["lost"] = sum(len(in_flight.get(process_id, [])) for process_id in crashed)
+            for process_id in crashed.keys() - reported:
+                print(f"⚠️ 프로세스 {process_id} 비정상 종료 (종료 코드 {crashed[process_id]}), 유실 URL {len(in_flight.get(process_id, []))}개")
+            reported.update(crashed)
+
+        # 워커가 모두 종료했으면 남은 URL은 처리할 수 없음
+        if not alive:
+            done = stats["success"] + stats["skipped"] + stats["failed"]
+            if done + stats["lost"] < total:
+                stats["lost"] = total - done
+                print(f"⚠️ 모든 워커가 종료되어 남은 URL을 처리하지 못했습니다. (유실 {stats['lost']}개)")
+            break
+
+        if time.time() - last_report >= REPORT_INTERVAL:
+            report_progress(stats, total, start_time)
+            last_report = time.time()
+
+    report_progress(stats, total, start_time)
+    print(f"   프로세스별 처리 URL 수: {dict(sorted(per_process.items()))}")
+    return stats
 
 
 # ==========================================
@@ -124,35 +277,40 @@ if __name__ == "__main__":
     if not os.path.exists(URL_FILE):
         print(f"❌ '{URL_FILE}' 파일이 없습니다. 1단계 코드를 먼저 실행하세요.")
         exit()
-        
+
     with open(URL_FILE, "r", encoding="utf-8") as f:
         all_urls = json.load(f)
-        
+
     print(f"📂 총 {len(all_urls)}개의 URL을 불러왔습니다.")
-    
-    # 2. URL 분배 (N등분)
-    # numpy가 없으면 아래 방식으로 분배 가능:
-    # chunk_size = len(all_urls) // PROCESS_COUNT
-    # url_chunks = [all_urls[i:i + chunk_size] for i in range(0, len(all_urls), chunk_size)]
-    
-    # 간단하게 리스트 슬라이싱으로 분배
-    chunk_size = int(len(all_urls) / PROCESS_COUNT) + 1
-    url_chunks = [all_urls[i:i + chunk_size] for i in range(0, len(all_urls), chunk_size)]
-    
+
+    # 2. 작업 큐에 작은 묶음으로 넣기
+    # 미리 N등분하지 않고, 끝난 워커가 다음 묶음을 가져가므로 느린 페이지가 몰려도 다른 워커가 놀지 않음.
+    manager = multiprocessing.Manager()
+    task_queue = manager.Queue()
+    event_queue = manager.Queue()
+    for i in range(0, len(all_urls), BATCH_SIZE):
+        task_queue.put([(url, 0) for url in all_urls[i:i + BATCH_SIZE]])
+
     # 3. 프로세스 생성 및 시작
     processes = []
-    
+
     start_time = time.time()
-    
-    for i in range(len(url_chunks)):
-        p = multiprocessing.Process(target=worker_task, args=(i+1, url_chunks[i]))
+
+    for i in range(PROCESS_COUNT):
+        p = multiprocessing.Process(target=worker_task, args=(i+1, task_queue, event_queue))
         processes.append(p)
         p.start()
-        
-    # 4. 모든 프로세스가 끝날 때까지 대기
+
+    # 4. 모든 URL의 결과가 나올 때까지 진행 상황 집계 후 워커 종료 신호 전달
+    stats = aggregate_progress(event_queue, dict(enumerate(processes, start=1)), len(all_urls), start_time)
+    for _ in processes:
+        task_queue.put(None)
+
+    # 5. 모든 프로세스가 끝날 때까지 대기
     for p in processes:
         p.join()
-        
+    manager.shutdown()
+
     end_time = time.time()
     print(f"\n✨ 전체 작업 완료! 소요 시간: {round(end_time - start_time, 2)}초")
-    print("각 'result_part_N.json' 파일에 데이터가 저장되었습니다.")
\ No newline at end of file
+    print("각 'result_part_N.json' 파일에 데이터가 저장되었습니다.")
@@ -0,0 +1,631 @@
+"""
+성능 비교 스크립트
+
+python Benchmark.py : 모든 비교 실행
+python Benchmark.py CleanTexts : 이름이 같은 비교만 실행
+"""
+from FashionTrendCrawling import FashionTrendCrawling as ftc
+from KeywordCounter import KeywordCounter
+from KeywordMatcher import KeywordMatcher
+from NounAnalyzer import NounAnalyzer
+from StagePipeline import StagePipeline
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import random
+import time
+import sys
+
+# 메모리 확인용. 없으면 resource 모듈 사용 (리눅스, 맥).
+try:
+    import psutil
+except ImportError:
+    psutil = None
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def RSSMB() -> float:
+    """
+    현재 프로세스 메모리 사용량 (MB). psutil이 없으면 최대 사용량.
+
+    반환 : MB
+    """
+    if psutil != None:
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    if resource != None:
+        # 리눅스는 KB 단위 최대값
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return 0.0
+
+
+
+
+def SampleTexts(
+    count:int = 2000,
+    seed:int = 0
+) -> list[str]:
+    """
+    블로그 본문과 비슷한 예시 글 생성
+
+    반환 : 글 리스트
+
+    count : 글 수
+    seed : 난수 시드
+    """
+    words = [
+        "가을", "뮤트톤", "코디", "니트", "가디건", "슬랙스", "베이지", "브라운", "캐시미어",
+        "(내돈내산)", "(협찬)", "(사진=블로그주인)", "출근룩", "데이트", "오늘은", "추천합니다",
+        "2024", "10월", "\n", "\t", "  ", "\r\n"
+    ]
+    emojis = ["😀", "👍🏻", "❤️", "👩‍👩‍👧", "#️⃣", "✨", "🍂"]
+    generator = random.Random(seed)
+    return [
+        " ".join(
+            generator.choice(emojis) if generator.random() < 0.03 else generator.choice(words)
+            for _ in range(generator.randint(200, 800))
+        )
+        for _ in range(count)
+    ]
+
+
+
+def BenchmarkCleanTexts(
+    texts:list[str] = None,
+    workers:int = 4
+):
+    """
+    CleanText 반복 호출과 CleanTexts 비교. 초당 처리한 글 수 출력.
+
+    texts : 비교에 사용할 글 리스트. None이면 예시 글 사용.
+    workers : CleanTexts 작업 프로세스 수
+    """
+    if texts == None:
+        texts = SampleTexts()
+
+    # 기존 방식
+    startTime = time.perf_counter()
+    expected = [ftc.CleanText(text) for text in texts]
+    baseline = time.perf_counter() - startTime
+    print(f"CleanText 반복 : {len(texts) / baseline:,.0f} docs/sec")
+
+    # 한 프로세스
+    startTime = time.perf_counter()
+    result = ftc.CleanTexts(texts)
+    elapsed = time.perf_counter() - startTime
+    print(f"CleanTexts : {len(texts) / elapsed:,.0f} docs/sec (x{baseline / elapsed:.1f}), 결과 일치 {result == expected}")
+
+    # 작업 프로세스
+    startTime = time.perf_counter()
+    result = ftc.CleanTexts(texts, workers = workers)
+    elapsed = time.perf_counter() - startTime
+    print(f"CleanTexts workers={workers} : {len(texts) / elapsed:,.0f} docs/sec (x{baseline / elapsed:.1f}), 결과 일치 {result == expected}")
+
+
+
+def BenchmarkKeywordMatcher(
+    texts:list[str] = None
+):
+    """
+    키워드별 in 검사 반복과 KeywordMatcher 비교. 초당 처리한 단어 수 출력.
+    명사 추출 대신 공백으로 나눈 단어를 사용.
+
+    texts : 비교에 사용할 글 리스트. None이면 예시 글 사용.
+    """
+    if texts == None:
+        texts = SampleTexts()
+    documents = [text.split() for text in texts]
+    words = sum(len(document) for document in documents)
+    keywords = [
+        "코트", "자켓", "가디건", "니트", "셔츠", "바지", "청바지", "슬랙스", "스커트", "부츠",
+        "블랙", "화이트", "베이지", "그레이", "브라운", "카키", "레드", "블루", "스카이블루",
+        "울", "캐시미어", "가죽", "코튼", "데님", "니트", "퍼", "스웨이드", "코듀로이"
+    ]
+
+    # 기존 방식
+    startTime = time.perf_counter()
+    expected = np.zeros(len(keywords), dtype = np.int64)
+    for document in documents:
+        for i, keyword in enumerate(keywords):
+            for word in document:
+                if keyword in word:
+                    expected[i] += 1
+    baseline = time.perf_counter() - startTime
+    print(f"in 검사 반복 : {words / baseline:,.0f} words/sec")
+
+    # 검색기 생성 포함
+    startTime = time.perf_counter()
+    matcher = KeywordMatcher(keywords)
+    result = np.zeros(len(keywords), dtype = np.int64)
+    for document in documents:
+        matcher.CountWords(document, result)
+    elapsed = time.perf_counter() - startTime
+    print(f"KeywordMatcher : {words / elapsed:,.0f} words/sec (x{baseline / elapsed:.1f}), 결과 일치 {(result == expected).all()}")
+
+
+
+def BenchmarkNounAnalyzer(
+    texts:list[str] = None,
+    workers:int = 4
+):
+    """
+    형태소 분석기별 명사 추출 속도와 키워드 계측 결과 비교. 초당 추출한 명사 수 출력.
+    설치되지 않은 분석기는 건너뜀.
+
+    texts : 비교에 사용할 글 리스트. None이면 예시 글 사용.
+    workers : NounsBatch 작업 프로세스 수
+    """
+    if texts == None:
+        texts = [ftc.CleanText(text) for text in SampleTexts(count = 200)]
+    keywords = [
+        "코트", "자켓", "가디건", "니트", "셔츠", "바지", "청바지", "슬랙스", "스커트", "부츠",
+        "블랙", "화이트", "베이지", "그레이", "브라운", "카키", "레드", "블루", "스카이블루",
+        "울", "캐시미어", "가죽", "코튼", "데님", "니트", "퍼", "스웨이드", "코듀로이"
+    ]
+    matcher = KeywordMatcher(keywords)
+
+    counts = {}
+    for backend in NounAnalyzer.BACKENDS:
+        for count in [0, workers]:
+            analyzer = NounAnalyzer(backend, count)
+            try:
+                # 분석기 생성 시간 제외
+                analyzer.NounsBatch(texts[ : 1])
+            except ImportError as e:
+                print(f"{backend} : 설치되지 않음 ({e.name})")
+                break
+
+            startTime = time.perf_counter()
+            nouns = analyzer.NounsBatch(texts)
+            elapsed = time.perf_counter() - startTime
+            analyzer.Close()
+
+            total = sum(len(words) for words in nouns)
+            print(f"{backend} workers={count} : {total / elapsed:,.0f} nouns/sec, {len(texts) / elapsed:,.1f} docs/sec")
+
+            # 키워드 계측
+            counts[backend] = np.zeros(len(keywords), dtype = np.int64)
+            for words in nouns:
+                matcher.CountWords(words, counts[backend])
+
+    # 분석기 사이 키워드 계측 결과 비교
+    if len(counts) == 2:
+        okt, kiwi = counts["okt"], counts["kiwi"]
+        print(f"키워드 계측 일치 : {(okt == kiwi).sum()} / {len(keywords)}")
+        print(f"계측 수 차이 합 : {np.abs(okt - kiwi).sum()} / {max(okt.sum(), kiwi.sum())}")
+        print(f"상관계수 : {np.corrcoef(okt, kiwi)[0, 1]:.3f}")
+
+
+
+def BenchmarkAnalyzerStartup(
+    backend:str = "okt",
+    sessions:int = 3
+):
+    """
+    세션마다 계측기를 만들 때 걸리는 시간과 메모리 비교.
+    이전 방식은 계측기마다 분석기를 생성하고 바로 분석. 현재 방식은 앱 시작 시 WarmUp으로 한 번만 생성.
+
+    backend : 형태소 분석기. "okt" 또는 "kiwi"
+    sessions : 만들 계측기 수 (Streamlit 세션 수)
+    """
+    sentence = "가을 뮤트톤 니트와 울 코트로 출근 코디를 완성했어요."
+
+    # 이전 방식 : 계측기마다 분석기 생성
+    try:
+        if backend == "okt":
+            from konlpy.tag import Okt as Analyzer
+        else:
+            from kiwipiepy import Kiwi as Analyzer
+    except ImportError as e:
+        print(f"{backend} : 설치되지 않음 ({e.name})")
+        return
+    for i in range(sessions):
+        memory = RSSMB()
+        startTime = time.perf_counter()
+        analyzer = Analyzer()
+        analyzer.nouns(sentence) if backend == "okt" else analyzer.tokenize(sentence)
+        print(f"이전 방식 세션 {i + 1} : 첫 분석까지 {time.perf_counter() - startTime:.3f}초, 메모리 +{RSSMB() - memory:.1f}MB")
+
+    # 앱 시작 시 미리 생성
+    memory = RSSMB()
+    startTime = time.perf_counter()
+    NounAnalyzer.WarmUp(backend).join()
+    print(f"WarmUp : {time.perf_counter() - startTime:.3f}초 (생성 {NounAnalyzer.GetLoadStats()[backend]:.3f}초), 메모리 +{RSSMB() - memory:.1f}MB")
+
+    # 현재 방식 : 세션마다 계측기 생성 후 첫 분석
+    for i in range(sessions):
+        memory = RSSMB()
+        startTime = time.perf_counter()
+        counter = KeywordCounter(["니트", "코트"], ["베이지"], ["울"], backend = backend)
+        counter.BeginCounting(sentence)
+        print(f"현재 방식 세션 {i + 1} : 첫 분석까지 {time.perf_counter() - startTime:.3f}초, 메모리 +{RSSMB() - memory:.1f}MB")
+
+
+
+def BenchmarkSessionStartup(
+    sessions:int = 5,
+    texts:list[str] = None
+):
+    """
+    Streamlit 세션이 늘어날 때 세션마다 추가되는 메모리와 첫 계측까지 걸리는 시간 비교.
+    이전 방식은 세션마다 계측기, 명사 캐시, 응답 캐시, 링크 변환기, 문단 선택기를 새로 생성.
+    현재 방식은 한 번 만든 자원을 공유하고 세션마다 계측 수만 따로 가짐.
+    명사 추출 대신 공백으로 나눈 단어를 사용. 메모리는 tracemalloc으로 측정한 세션별 파이썬 할당량.
+
+    sessions : 만들 세션 수
+    texts : 첫 계측에 사용할 글 리스트. None이면 예시 글 200개 사용.
+    """
+    from ChatResponseCache import ChatResponseCache
+    from BlogUrlResolver import BlogUrlResolver
+    from PassageRanker import PassageRanker
+    from NounCache import NounCache
+    import contextlib
+    import tracemalloc
+    import tempfile
+    import os
+    import io
+
+    if texts == None:
+        texts = SampleTexts(200)
+    documents = [text.split() for text in texts]
+    keywords = (
+        ["코트", "패딩", "자켓", "가디건", "니트", "셔츠", "바지", "청바지", "슬랙스", "스커트", "부츠", "가방"],
+        ["블랙", "화이트", "베이지", "그레이", "네이비", "브라운", "카키", "버건디", "크림", "오트밀"],
+        ["울", "캐시미어", "가죽", "코튼", "데님", "린넨", "스웨이드", "코듀로이", "플리스", "다운"]
+    )
+    folder = tempfile.mkdtemp()
+
+    def measure(label:str, create:callable):
+        """
+        세션 수만큼 생성하고 첫 계측. 생성한 세션은 끝까지 유지. create(i)는 (계측기, 나머지 자원...) 튜플 반환.
+        """
+        alive = []
+        tracemalloc.start()
+        for i in range(sessions):
+            before = tracemalloc.get_traced_memory()[0]
+            startTime = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                session = create(i)
+            created = time.perf_counter() - startTime
+            session[0].CountNouns(documents)
+            print(f"{label} 세션 {i + 1} : 생성 {created * 1000:.1f}ms, 첫 계측까지 {(time.perf_counter() - startTime) * 1000:.1f}ms, 메모리 +{(tracemalloc.get_traced_memory()[0] - before) / 1024:.0f}KB")
+            alive.append(session)
+        tracemalloc.stop()
+
+    # 이전 방식 : 세션마다 모든 자원 생성
+    def create(i:int) -> tuple:
+        return KeywordCounter(
+            *keywords,
+            workers = 4,
+            cache = NounCache(os.path.join(folder, f"nouns{i}.sqlite"))
+        ), ChatResponseCache(os.path.join(folder, f"chat{i}.sqlite")), BlogUrlResolver(), PassageRanker()
+    measure("이전 방식", create)
+
+    # 현재 방식 : 자원은 한 번만 만들고 세션마다 Share
+    with contextlib.redirect_stdout(io.StringIO()):
+        shared = create(sessions)[0]
+    measure("현재 방식", lambda i : (shared.Share(), ))
+
+    # 실제 분석기 생성. 첫 세션이 공유 자원을 만들고 이후 세션은 재사용.
+    try:
+        from LLMResponse import LLMResponse
+    except ImportError as e:
+        print(f"LLMResponse : 설치되지 않음 ({e.name})")
+        return
+    memory = RSSMB()
+    for i in range(sessions):
+        startTime = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            LLMResponse()
+        print(f"LLMResponse 세션 {i + 1} : 생성 {(time.perf_counter() - startTime) * 1000:.1f}ms, 누적 메모리 +{RSSMB() - memory:.1f}MB")
+
+
+
+def BenchmarkStagePipeline(
+    batches:int = 5,
+    batchSize:int = 10
+):
+    """
+    단계를 차례로 끝내는 방식과 StagePipeline 비교. 네트워크 대기는 sleep으로 흉내.
+    검색은 스크롤마다 batchSize개씩 링크를 만들고, 링크 변환과 본문 수집은 8개씩 동시 처리.
+
+    batches : 스크롤 수
+    batchSize : 스크롤마다 새로 나오는 글 수
+    """
+    def search():
+        for i in range(batches):
+            time.sleep(0.2)
+            for j in range(batchSize):
+                yield i * batchSize + j
+    def resolve(item):
+        time.sleep(0.05)
+        return item
+    def fetch(item):
+        time.sleep(0.1)
+        return item
+    def clean(item):
+        return ftc.CleanText(" 가을 니트 (협찬) " * 200) and item
+    def count(item):
+        time.sleep(0.01)
+        return item
+
+    # 기존 방식 : 단계마다 모든 글을 끝낸 뒤 다음 단계
+    startTime = time.perf_counter()
+    items = list(search())
+    with ThreadPoolExecutor(max_workers = 8) as executor:
+        items = list(executor.map(resolve, items))
+        items = list(executor.map(fetch, items))
+    items = [count(clean(item)) for item in items]
+    sequential = time.perf_counter() - startTime
+    print(f"단계별 순차 : {sequential:.2f}초")
+
+    # 스트리밍
+    pipeline = StagePipeline()
+    pipeline.AddStage("resolve", resolve, workers = 8)
+    pipeline.AddStage("fetch", fetch, workers = 8)
+    pipeline.AddStage("clean", clean, workers = 1)
+    pipeline.AddStage("count", count, workers = 1)
+    startTime = time.perf_counter()
+    result = pipeline.Run(search())
+    elapsed = time.perf_counter() - startTime
+    print(f"StagePipeline : {elapsed:.2f}초 (x{sequential / elapsed:.1f}), 결과 일치 {result == items}")
+    for stage in pipeline.GetStats()["stages"]:
+        print(f"  {stage['name']} : workers={stage['workers']}, 작업 {stage['busySeconds']:.2f}초, 최대 대기 {stage['maxQueue']}")
+
+
+
+def BenchmarkStreaming(
+    tokens:int = 200,
+    latency:float = 0.01
+):
+    """
+    FashionChatbot의 RequestResponse와 RequestResponseStream 첫 토큰까지 걸리는 시간 비교.
+    토큰마다 latency초씩 걸리는 가짜 채팅 모델 사용.
+
+    tokens : 응답 토큰 수
+    latency : 토큰당 생성 시간 (초)
+    """
+    try:
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from langchain_core.outputs import ChatResult, ChatGenerationChunk
+        from langchain_core.messages import AIMessageChunk
+        from FashionChatbot import FashionChatbot
+    except ImportError as e:
+        print(f"langchain : 설치되지 않음 ({e.name})")
+        return
+
+    class SlowFakeChatModel(GenericFakeChatModel):
+        """
+        토큰마다 시간이 걸리는 가짜 채팅 모델
+        """
+        latency: float = 0.01
+
+        def _generate(self, messages, stop = None, run_manager = None, **kwargs) -> ChatResult:
+            result = super()._generate(messages, stop = stop, run_manager = run_manager, **kwargs)
+            time.sleep(self.latency * len(result.generations[0].message.content.split()))
+            return result
+
+        def _stream(self, messages, stop = None, run_manager = None, **kwargs):
+            # 기다리지 않는 _generate로 응답을 받고 단어마다 기다리며 반환
+            content = GenericFakeChatModel._generate(self, messages, stop = stop, run_manager = run_manager, **kwargs).generations[0].message.content
+            words = content.split(" ")
+            for i, word in enumerate(words):
+                time.sleep(self.latency)
+                yield ChatGenerationChunk(message = AIMessageChunk(content = word if i == len(words) - 1 else word + " "))
+
+    answer = " ".join(f"토큰{i}" for i in range(tokens))
+
+    # 전체 응답을 기다림
+    bot = FashionChatbot(llm = SlowFakeChatModel(messages = iter([answer]), latency = latency))
+    startTime = time.perf_counter()
+    response = bot.RequestResponse("가을뮤트 추움 출근 코디")
+    blocking = time.perf_counter() - startTime
+    print(f"RequestResponse : 첫 토큰까지 {blocking:.3f}초 (전체 응답과 같음)")
+
+    # 조각마다 반환
+    bot = FashionChatbot(llm = SlowFakeChatModel(messages = iter([answer]), latency = latency))
+    responseReturn = []
+    firstToken = None
+    startTime = time.perf_counter()
+    for _ in bot.RequestResponseStream("가을뮤트 추움 출근 코디", responseReturn):
+        if firstToken == None:
+            firstToken = time.perf_counter() - startTime
+    total = time.perf_counter() - startTime
+    print(f"RequestResponseStream : 첫 토큰까지 {firstToken:.3f}초, 전체 {total:.3f}초, 응답 일치 {responseReturn[0].content == response.content}")
+
+
+
+def BenchmarkAsyncChatbot(
+    users:int = 8,
+    latency:float = 0.5
+):
+    """
+    여러 사용자의 요청을 차례대로 보낼 때와 RequestResponseBatchAsync로 동시에 보낼 때 비교.
+    요청마다 latency초씩 기다리는 가짜 채팅 모델 사용. 스레드는 추가로 만들지 않음.
+
+    users : 동시 요청 수
+    latency : 요청당 응답 시간 (초)
+    """
+    try:
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from FashionChatbot import FashionChatbot
+    except ImportError as e:
+        print(f"langchain : 설치되지 않음 ({e.name})")
+        return
+    import threading
+    import asyncio
+
+    class SlowFakeChatModel(GenericFakeChatModel):
+        """
+        요청마다 시간이 걸리는 가짜 채팅 모델. 비동기 요청은 기다리는 동안 이벤트 루프를 막지 않음.
+        """
+        latency: float = 0.5
+
+        def _generate(self, messages, stop = None, run_manager = None, **kwargs):
+            time.sleep(self.latency)
+            return super()._generate(messages, stop = stop, **kwargs)
+
+        async def _agenerate(self, messages, stop = None, run_manager = None, **kwargs):
+            await asyncio.sleep(self.latency)
+            return GenericFakeChatModel._generate(self, messages, stop = stop, **kwargs)
+
+    questions = [f"사용자{i} 가을뮤트 추움 출근 코디" for i in range(users)]
+    answers = [f"답변{i}" for i in range(users)]
+
+    # 차례대로
+    bot = FashionChatbot(llm = SlowFakeChatModel(messages = iter(answers), latency = latency))
+    startTime = time.perf_counter()
+    for question in questions:
+        bot.RequestResponse(question)
+    sequential = time.perf_counter() - startTime
+    print(f"RequestResponse {users}번 : {sequential:.3f}초")
+
+    # 동시에
+    bot = FashionChatbot(llm = SlowFakeChatModel(messages = iter(answers), latency = latency))
+    threads = threading.active_count()
+    startTime = time.perf_counter()
+    asyncio.run(bot.RequestResponseBatchAsync(questions))
+    concurrent = time.perf_counter() - startTime
+    print(f"RequestResponseBatchAsync {users}개 : {concurrent:.3f}초 ({sequential / concurrent:.1f}배), 추가 스레드 {threading.active_count() - threads}개")
+
+
+
+def BenchmarkSnapIndex(
+    sizes:list[int] = (5000, 50000, 500000),
+    queries:int = 50
+):
+    """
+    app.py의 스냅 추천에서 전체 스냅을 훑는 방식과 SnapIndex의 조회 시간 비교.
+    처음 보는 키워드 조회와 이미 조회한 키워드 조회를 따로 측정.
+
+    sizes : 스냅 수 리스트
+    queries : 조회 수
+    """
+    from SnapIndex import SnapIndex
+    import tempfile
+    import json
+    import os
+
+    vocabulary = [
+        "가을뮤트", "봄웜톤", "겨울쿨톤", "여름쿨톤", "추움", "보통", "더움", "한파",
+        "출근", "데이트", "캐주얼", "여행", "코디", "니트", "코트", "패딩", "슬랙스", "데님",
+        "스트릿", "미니멀", "아메카지", "빈티지", "블랙", "베이지", "브라운", "레이어드"
+    ]
+    generator = random.Random(0)
+    keywordSets = [
+        [generator.choice(vocabulary[0 : 4]), generator.choice(vocabulary[4 : 8]), generator.choice(vocabulary[8 : 12]), "코디"]
+        for _ in range(queries)
+    ]
+
+    for size in sizes:
+        # 예시 스냅 파일
+        items = [
+            {
+                "tags" : [f"#{tag}" for tag in generator.sample(vocabulary, generator.randint(3, 8))],
+                "image_path" : f"images/{i}.jpg",
+                "url" : f"https://www.musinsa.com/snap/{i}"
+            }
+            for i in range(size)
+        ]
+        path = os.path.join(tempfile.mkdtemp(), "fashion_data.json")
+        with open(path, "w", encoding = "utf-8") as f:
+            json.dump(items, f, ensure_ascii = False)
+
+        # 전체 스냅 훑기. 색인 생성 시간과 비교하도록 파일 읽기는 제외.
+        linearResults = []
+        startTime = time.perf_counter()
+        for keywords in keywordSets:
+            scores = [(sum(1 for keyword in keywords if keyword in " ".join(item["tags"])), item) for item in items]
+            best = max(score for score, _ in scores)
+            linearResults.append((best, [item for score, item in scores if score == best and score > 0]))
+        linear = (time.perf_counter() - startTime) / queries
+
+        # 색인
+        index = SnapIndex(path)
+        startTime = time.perf_counter()
+        index.Search([])
+        build = time.perf_counter() - startTime
+        startTime = time.perf_counter()
+        index.Search(keywordSets[0])
+        cold = time.perf_counter() - startTime
+        indexResults = []
+        startTime = time.perf_counter()
+        for keywords in keywordSets:
+            indexResults.append(index.Search(keywords))
+        warm = (time.perf_counter() - startTime) / queries
+
+        print(
+            f"스냅 {size:,}개 : 전체 훑기 {linear * 1000:.1f}ms, "
+            f"색인 생성 {build:.2f}초, 첫 조회 {cold * 1000:.1f}ms, 조회 {warm * 1000:.2f}ms ({linear / warm:.0f}배), "
+            f"결과 일치 {linearResults == indexResults}"
+        )
+
+
+
+def BenchmarkThumbnails(
+    count:int = 48,
+    size:tuple[int, int] = (1200, 1500)
+):
+    """
+    원본 스냅 이미지와 ThumbnailCache 썸네일의 전송량, 디코딩 시간 비교.
+    무신사 스냅과 비슷한 크기의 예시 JPEG 사용.
+
+    count : 이미지 수
+    size : 원본 (가로, 세로)
+    """
+    try:
+        from PIL import Image
+        from ThumbnailCache import ThumbnailCache
+    except ImportError as e:
+        print(f"Pillow : 설치되지 않음 ({e.name})")
+        return
+    import tempfile
+    import os
+
+    # 예시 원본 이미지
+    sourceDir = tempfile.mkdtemp()
+    generator = np.random.default_rng(0)
+    for i in range(count):
+        pixels = generator.random((size[1], size[0], 3)) * 40 + np.linspace(0, 200, size[0])[None, :, None]
+        Image.fromarray(pixels.astype(np.uint8)).save(os.path.join(sourceDir, f"snap{i:05d}.jpg"), quality = 92)
+    sources = sorted(os.path.join(sourceDir, name) for name in os.listdir(sourceDir))
+
+    # 한 번에 생성
+    cache = ThumbnailCache(tempfile.mkdtemp())
+    startTime = time.perf_counter()
+    result = cache.BuildAll(sourceDir)
+    print(f"BuildAll : {result['generated']}개 {time.perf_counter() - startTime:.2f}초")
+
+    # 전송량과 디코딩 시간
+    def decode(paths):
+        startTime = time.perf_counter()
+        for path in paths:
+            with Image.open(path) as image:
+                image.load()
+        return (time.perf_counter() - startTime) / len(paths)
+
+    thumbnails = [cache.Get(source) for source in sources]
+    sourceBytes = sum(os.path.getsize(path) for path in sources) / count
+    thumbnailBytes = sum(os.path.getsize(path) for path in thumbnails) / count
+    print(f"원본 : 평균 {sourceBytes / 1024:.0f}KB, 디코딩 {decode(sources) * 1000:.1f}ms")
+    print(f"썸네일 : 평균 {thumbnailBytes / 1024:.0f}KB ({thumbnailBytes / sourceBytes:.1%}), 디코딩 {decode(thumbnails) * 1000:.1f}ms")
+
+
+
+if __name__ == "__main__":
+    benchmarks = {
+        "CleanTexts": BenchmarkCleanTexts,
+        "KeywordMatcher": BenchmarkKeywordMatcher,
+        "NounAnalyzer": BenchmarkNounAnalyzer,
+        "AnalyzerStartup": BenchmarkAnalyzerStartup,
+        "SessionStartup": BenchmarkSessionStartup,
+        "StagePipeline": BenchmarkStagePipeline,
+        "Streaming": BenchmarkStreaming,
+        "AsyncChatbot": BenchmarkAsyncChatbot,
+        "SnapIndex": BenchmarkSnapIndex,
+        "Thumbnails": BenchmarkThumbnails
+    }
+    for name, benchmark in benchmarks.items():
+        if len(sys.argv) < 2 or name in sys.argv[1:]:
+            print(f"\n[{name}]")
+            benchmark()
@@ -0,0 +1,138 @@
+from FashionTrendCrawling import FashionTrendCrawling as ftc
+from ExtractionPlan import ExtractionPlan
+from urllib.parse import urlparse, parse_qs
+import threading
+import re
+
+class BlogUrlResolver:
+    """
+    네이버 블로그 검색 결과 링크를 본문이 있는 모바일 글 주소로 변환.
+    링크의 블로그 아이디와 글 번호로 바로 만들고, 알 수 없는 형식일 때만 블로그 페이지의 iframe src를 요청.
+    변환 결과는 기억해서 같은 링크는 다시 변환하지 않음.
+
+    Resolve : 모바일 글 주소로 변환
+    GetStats : 변환 방법별 통계
+    """
+    # 블로그 주소
+    __HOSTS = ("blog.naver.com", "m.blog.naver.com")
+    __MOBILE_POST = "https://m.blog.naver.com/PostView.naver?blogId={blogId}&logNo={logNo}"
+
+    # 경로형 주소 /블로그아이디/글번호, 블로그 아이디와 글 번호 형식
+    __PATH = re.compile(r'^/([A-Za-z0-9_-]+)/(\d+)/?$')
+    __BLOG_ID = re.compile(r'^[A-Za-z0-9_-]+$')
+    __LOG_NO = re.compile(r'^\d+$')
+
+    # 직접 만들 수 없을 때 블로그 페이지의 iframe src 추출 계획
+    __IFRAME_PLAN = ExtractionPlan(["iframe"], ["iframe 태그"], ["src"])
+
+
+
+    def __init__(self):
+        # 링크별 변환 결과. 실패한 링크는 다음에 다시 시도하도록 기억하지 않음.
+        self.__resolved = {}
+        self.__lock = threading.Lock()
+
+        # 통계
+        self.__stats = {
+            "direct": 0,
+            "fallback": 0,
+            "failed": 0,
+            "memo_hits": 0
+        }
+
+
+
+    def __Count(self, name:str):
+        """
+        통계 증가
+        """
+        with self.__lock:
+            self.__stats[name] += 1
+
+
+
+    def __Parse(url:str) -> str:
+        """
+        링크의 블로그 아이디와 글 번호로 모바일 글 주소 생성.
+        예) https://blog.naver.com/아이디/글번호, https://blog.naver.com/PostView.naver?blogId=아이디&logNo=글번호
+
+        반환 : 모바일 글 주소, 알 수 없는 형식이면 None
+        """
+        parsed = urlparse(url)
+        if parsed.netloc.lower() not in BlogUrlResolver.__HOSTS:
+            return None
+
+        # 경로형 주소
+        match = BlogUrlResolver.__PATH.match(parsed.path)
+        if match != None:
+            return BlogUrlResolver.__MOBILE_POST.format(blogId = match.group(1), logNo = match.group(2))
+
+        # 쿼리형 주소
+        query = parse_qs(parsed.query)
+        blogId = query.get("blogId", [""])[0]
+        logNo = query.get("logNo", [""])[0]
+        if BlogUrlResolver.__BLOG_ID.match(blogId) and BlogUrlResolver.__LOG_NO.match(logNo):
+            return BlogUrlResolver.__MOBILE_POST.format(blogId = blogId, logNo = logNo)
+        return None
+
+
+
+    def __Fetch(url:str) -> str:
+        """
+        블로그 페이지를 요청해서 iframe src로 모바일 글 주소 생성
+
+        반환 : 모바일 글 주소, 실패 시 None
+        """
+        temp = ftc.BeginCrawlingOne(url, BlogUrlResolver.__IFRAME_PLAN)
+        if temp is None or len(temp) == 0 or not isinstance(temp.loc[0, "iframe 태그"], str):
+            return None
+
+        # iframe src의 블로그 아이디와 글 번호로 다시 만들고, 안 되면 그대로 연결
+        src = temp.loc[0, "iframe 태그"]
+        link = BlogUrlResolver.__Parse("https://blog.naver.com/" + src.lstrip("/"))
+        return link if link != None else "https://m.blog.naver.com/" + src.lstrip("/")
+
+
+
+    def Resolve(self, url:str) -> str:
+        """
+        모바일 글 주소로 변환. 여러 스레드에서 동시에 호출 가능.
+
+        반환 : 모바일 글 주소, 실패 시 None
+
+        url : 검색 결과의 블로그 링크
+        """
+        with self.__lock:
+            if url in self.__resolved:
+                self.__stats["memo_hits"] += 1
+                return self.__resolved[url]
+
+        # 링크로 바로 만들고, 안 되면 페이지 요청
+        link = BlogUrlResolver.__Parse(url)
+        if link != None:
+            self.__Count("direct")
+        else:
+            link = BlogUrlResolver.__Fetch(url)
+            self.__Count("fallback" if link != None else "failed")
+
+        if link != None:
+            with self.__lock:
+                self.__resolved[url] = link
+        return link
+
+
+
+    def GetStats(self) -> dict:
+        """
+        변환 방법별 통계
+
+        반환 : dict(direct, fallback, failed, memo_hits, direct_rate, requests_saved)
+               direct_rate는 새로 변환한 링크 중 페이지 요청 없이 만든 비율
+               requests_saved는 페이지 요청 없이 변환한 수 (기억한 결과 포함)
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+        total = stats["direct"] + stats["fallback"] + stats["failed"]
+        stats["direct_rate"] = stats["direct"] / total if total > 0 else 0.0
+        stats["requests_saved"] = stats["direct"] + stats["memo_hits"]
+        return stats
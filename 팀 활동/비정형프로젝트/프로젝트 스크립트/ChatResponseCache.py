@@ -0,0 +1,335 @@
+from collections import OrderedDict
+import threading
+import hashlib
+import sqlite3
+import json
+import time
+import re
+import os
+
+class ChatResponseCache:
+    """
+    챗봇 응답 캐시. 같은 메세지를 같은 모델 설정으로 다시 요청하면 저장된 응답을 반환.
+    메모리 LRU와 디스크 SQLite 두 단계로 저장하고, 디스크의 응답은 유효 기간이 지나면 사용하지 않음.
+    similarity를 지정하면 마지막 메세지만 조금 다르고 앞의 대화가 같은 요청도 비슷한 요청으로 보고 저장된 응답 사용.
+
+    Get : 저장된 응답 조회
+    Put : 응답 저장
+    GetStats : 캐시 적중 통계
+    Clear : 캐시 비우기
+    """
+    # 정규화
+    __SPACES = re.compile(r'\s+')
+
+
+
+    def __init__(
+        self,
+        cachePath:str = None,
+        ttl:float = 86400.0,
+        maxEntries:int = 256,
+        similarity:float = None,
+        maxCandidates:int = 64
+    ):
+        """
+        cachePath : 캐시 파일 경로. None이면 사용자 폴더의 .cache/FashionTrendCrawling/chat_responses.sqlite
+        ttl : 응답을 사용할 시간 (초)
+        maxEntries : 메모리에 기억할 최대 응답 수
+        similarity : 비슷한 요청으로 볼 마지막 메세지의 최소 유사도 (0 ~ 1). None이면 같은 요청만 사용.
+                     마지막 메세지에 검색 결과가 들어가는 요청은 다른 요청의 응답을 받을 수 있으므로 사용하지 않음.
+        maxCandidates : 비슷한 요청을 찾을 때 비교할 디스크의 최근 응답 수
+        """
+        if cachePath == None:
+            cachePath = os.path.join(os.path.expanduser("~"), ".cache", "FashionTrendCrawling", "chat_responses.sqlite")
+        os.makedirs(os.path.dirname(os.path.abspath(cachePath)), exist_ok = True)
+        self.__cachePath = cachePath
+        self.__ttl = ttl
+        self.__maxEntries = maxEntries
+        self.__similarity = similarity
+        self.__maxCandidates = maxCandidates
+
+        # 메모리 캐시. 키별 (응답, 저장 시각, 앞 대화 키, 마지막 메세지 글자 쌍)
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+        # 스레드별 DB 연결
+        self.__local = threading.local()
+        self.__Connect().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                digest TEXT PRIMARY KEY,
+                context TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            DROP INDEX IF EXISTS responses_context;
+            CREATE INDEX IF NOT EXISTS responses_context_time ON responses (context, created_at);
+            """
+        )
+
+        # 통계
+        self.__stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "similar_hits": 0,
+            "misses": 0,
+            "stored": 0
+        }
+
+
+
+    def __Connect(self) -> sqlite3.Connection:
+        """
+        현재 스레드의 DB 연결. 없으면 생성.
+
+        반환 : sqlite3.Connection
+        """
+        connection = getattr(self.__local, "connection", None)
+        if connection == None:
+            connection = sqlite3.connect(
+                self.__cachePath,
+                timeout = 30.0,
+                isolation_level = None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            self.__local.connection = connection
+        return connection
+
+
+
+    def __Count(self, name:str):
+        """
+        통계 증가
+        """
+        with self.__lock:
+            self.__stats[name] += 1
+
+
+
+    def __Digest(*parts:str) -> str:
+        """
+        문자열들의 해시
+
+        반환 : sha256 16진수 문자열
+        """
+        return hashlib.sha256(
+            json.dumps(parts, ensure_ascii = False).encode("utf-8", errors = "surrogatepass")
+        ).hexdigest()
+
+
+
+    def __Keys(
+        messages:list,
+        settings:tuple
+    ) -> tuple[str, str, str]:
+        """
+        메세지를 정규화해서 키 생성. 메세지 종류와 공백을 정리한 내용만 사용.
+
+        반환 : (요청 키, 앞 대화 키, 정규화한 마지막 메세지)
+        """
+        normalized = [
+            message.type + ":" + ChatResponseCache.__SPACES.sub(" ", message.content).strip()
+            for message in messages
+        ]
+        settings = [str(value) for value in settings]
+        return (
+            ChatResponseCache.__Digest(*settings, *normalized),
+            ChatResponseCache.__Digest(*settings, *normalized[ : -1]),
+            normalized[-1]
+        )
+
+
+
+    def __Bigrams(text:str) -> frozenset:
+        """
+        유사도 비교용 글자 쌍 집합
+        """
+        return frozenset(text[i : i + 2] for i in range(len(text) - 1))
+
+
+
+    def __Similarity(
+        a:frozenset,
+        b:frozenset
+    ) -> float:
+        """
+        글자 쌍 집합의 자카드 유사도
+
+        반환 : 0 ~ 1
+        """
+        if len(a) == 0 and len(b) == 0:
+            return 1.0
+        return len(a & b) / len(a | b)
+
+
+
+    def __Remember(
+        self,
+        digest:str,
+        response:dict,
+        createdAt:float,
+        context:str,
+        prompt:str
+    ):
+        """
+        메모리 캐시에 저장. 넘치면 오래 안 쓴 응답부터 삭제.
+        """
+        with self.__lock:
+            self.__entries[digest] = (response, createdAt, context, ChatResponseCache.__Bigrams(prompt))
+            self.__entries.move_to_end(digest)
+            while len(self.__entries) > self.__maxEntries:
+                self.__entries.popitem(last = False)
+
+
+
+    def __FindSimilar(
+        self,
+        context:str,
+        prompt:str,
+        now:float
+    ) -> tuple[str, dict, float]:
+        """
+        앞 대화가 같고 마지막 메세지가 가장 비슷한 응답 검색. 디스크는 최근 응답 maxCandidates개만 비교.
+
+        반환 : (요청 키, 응답, 저장 시각), 없으면 None
+        """
+        bigrams = ChatResponseCache.__Bigrams(prompt)
+        best = None
+        bestScore = self.__similarity
+
+        # 메모리
+        with self.__lock:
+            candidates = [
+                (digest, response, createdAt, promptBigrams)
+                for digest, (response, createdAt, entryContext, promptBigrams) in self.__entries.items()
+                if entryContext == context
+            ]
+        for digest, response, createdAt, promptBigrams in candidates:
+            score = ChatResponseCache.__Similarity(bigrams, promptBigrams)
+            if now - createdAt < self.__ttl and score >= bestScore:
+                best, bestScore = (digest, response, createdAt), score
+
+        # 디스크. 응답은 고른 것만 읽음.
+        rows = self.__Connect().execute(
+            "SELECT digest, prompt, created_at FROM responses WHERE context = ? AND created_at > ? ORDER BY created_at DESC LIMIT ?",
+            (context, now - self.__ttl, self.__maxCandidates)
+        ).fetchall()
+        bestRow = None
+        for digest, entryPrompt, createdAt in rows:
+            score = ChatResponseCache.__Similarity(bigrams, ChatResponseCache.__Bigrams(entryPrompt))
+            if score >= bestScore:
+                bestRow, bestScore = (digest, createdAt), score
+        if bestRow != None:
+            row = self.__Connect().execute("SELECT response FROM responses WHERE digest = ?", (bestRow[0], )).fetchone()
+            if row != None:
+                best = (bestRow[0], json.loads(row[0]), bestRow[1])
+        return best
+
+
+
+    def Get(
+        self,
+        messages:list,
+        settings:tuple
+    ) -> tuple[dict, str]:
+        """
+        저장된 응답 조회. 메모리, 디스크, 비슷한 요청 순서로 검색.
+
+        반환 : (응답 dict(content, response_metadata, usage_metadata), 적중 종류 "memory", "disk", "similar"), 없으면 None
+
+        messages : 모델에 보낼 메세지 리스트
+        settings : 모델 설정. 예) (모델 이름, temperature, max_tokens)
+        """
+        digest, context, prompt = ChatResponseCache.__Keys(messages, settings)
+        now = time.time()
+
+        # 메모리
+        with self.__lock:
+            entry = self.__entries.get(digest)
+            if entry != None and now - entry[1] < self.__ttl:
+                self.__entries.move_to_end(digest)
+                self.__stats["memory_hits"] += 1
+                return (entry[0], "memory")
+
+        # 디스크
+        row = self.__Connect().execute(
+            "SELECT response, created_at FROM responses WHERE digest = ? AND created_at > ?",
+            (digest, now - self.__ttl)
+        ).fetchone()
+        if row != None:
+            response = json.loads(row[0])
+            self.__Remember(digest, response, row[1], context, prompt)
+            self.__Count("disk_hits")
+            return (response, "disk")
+
+        # 비슷한 요청
+        if self.__similarity != None:
+            found = self.__FindSimilar(context, prompt, now)
+            if found != None:
+                self.__Count("similar_hits")
+                return (found[1], "similar")
+
+        self.__Count("misses")
+        return None
+
+
+
+    def Put(
+        self,
+        messages:list,
+        settings:tuple,
+        response:dict
+    ):
+        """
+        응답 저장
+
+        messages : 모델에 보낸 메세지 리스트
+        settings : 모델 설정. Get과 같은 형식.
+        response : dict(content, response_metadata, usage_metadata). JSON으로 저장 가능해야 함.
+        """
+        digest, context, prompt = ChatResponseCache.__Keys(messages, settings)
+        now = time.time()
+        self.__Remember(digest, response, now, context, prompt)
+
+        # 디스크에 저장하고 유효 기간이 지난 응답 삭제
+        connection = self.__Connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (digest, context, prompt, json.dumps(response, ensure_ascii = False, default = str), now)
+            )
+            connection.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.__ttl,))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        self.__Count("stored")
+
+
+
+    def GetStats(self) -> dict:
+        """
+        캐시 적중 통계. 현재 프로세스 기준.
+
+        반환 : dict(memory_hits, disk_hits, similar_hits, misses, stored, hit_rate, memory_entries, disk_entries)
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats["memory_entries"] = len(self.__entries)
+        hits = stats["memory_hits"] + stats["disk_hits"] + stats["similar_hits"]
+        total = hits + stats["misses"]
+        stats["hit_rate"] = hits / total if total > 0 else 0.0
+        stats["disk_entries"] = self.__Connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return stats
+
+
+
+    def Clear(self):
+        """
+        캐시 비우기
+        """
+        with self.__lock:
+            self.__entries.clear()
+        self.__Connect().execute("DELETE FROM responses")
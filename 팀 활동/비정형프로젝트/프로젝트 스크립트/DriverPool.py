@@ -0,0 +1,360 @@
+from selenium.webdriver.chrome.options import Options
+from selenium import webdriver
+from contextlib import contextmanager
+import threading
+import atexit
+import time
+
+# 메모리 확인용. 없으면 메모리 기준 재생성은 하지 않음.
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+class DriverPool:
+    """
+    크롬 드라이버 풀. 드라이버를 매번 새로 띄우지 않고 재사용.
+
+    Shared : 프로세스 공용 풀
+    Lease : 드라이버 대여 (with 문)
+    Acquire : 드라이버 대여
+    Release : 드라이버 반납
+    GetStats : 풀 상태
+    Close : 모든 드라이버 종료
+    """
+    # 프로세스 공용 풀
+    __shared = None
+    __sharedLock = threading.Lock()
+
+
+
+    def __init__(
+        self,
+        maxSize:int = 2,
+        maxPages:int = 50,
+        maxMemoryMB:float = 1024.0,
+        options:Options = None,
+        service = None
+    ):
+        """
+        maxSize : 동시에 띄울 수 있는 최대 드라이버 수
+        maxPages : 드라이버 하나가 처리할 최대 페이지 수. 넘으면 새로 띄움.
+        maxMemoryMB : 처음 띄웠을 때보다 메모리가 이만큼 늘어나면 새로 띄움 (MB)
+        options : 크롬 옵션. None이면 헤드리스 기본 옵션.
+        service : 크롬 드라이버 서비스
+        """
+        self.__maxSize = maxSize
+        self.__maxPages = maxPages
+        self.__maxMemoryMB = maxMemoryMB
+        self.__options = options if options != None else DriverPool.__DefaultOptions()
+        self.__service = service
+
+        # 대기 중인 드라이버와 관리 정보
+        self.__idle = []
+        self.__entries = {}
+        self.__created = 0
+        self.__closed = False
+        self.__condition = threading.Condition()
+
+        # 통계
+        self.__stats = {
+            "created": 0,
+            "reused": 0,
+            "recycled": 0,
+            "unhealthy": 0
+        }
+
+
+
+    def __DefaultOptions() -> Options:
+        """
+        헤드리스 브라우저 기본 옵션
+
+        반환 : Options
+        """
+        options = Options()
+        options.add_argument("--headless=new") # 헤드리스 모드
+        options.add_argument("--no-sandbox") # 샌드박스 모드에서는 브라우저 실행인 안 되는 경우가 있어 비활성화
+        options.add_argument("--disable-dev-shm-usage") # 공유 메모리 대신 일반 디스크 사용. 공유 메모리는 크기가 작아서 크롬이 충분한 공간을 확보하지 못하면 크래시가 발생할 수 있음.
+        options.add_argument("--start-maximized")
+        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        return options
+
+
+
+    @classmethod
+    def Shared(cls):
+        """
+        프로세스 공용 풀. 처음 호출될 때 생성.
+
+        반환 : DriverPool
+        """
+        with cls.__sharedLock:
+            if cls.__shared == None:
+                cls.__shared = cls()
+                atexit.register(cls.__shared.Close)
+            return cls.__shared
+
+
+
+    def __MemoryMB(driver) -> float:
+        """
+        드라이버와 크롬 프로세스들의 메모리 사용량
+
+        반환 : MB, 확인할 수 없으면 0
+        """
+        if psutil == None:
+            return 0.0
+        try:
+            process = psutil.Process(driver.service.process.pid)
+            total = process.memory_info().rss
+            for child in process.children(recursive = True):
+                total += child.memory_info().rss
+            return total / 1024 / 1024
+        except Exception:
+            return 0.0
+
+
+
+    def __IsHealthy(driver) -> bool:
+        """
+        드라이버 응답 확인
+
+        반환 : 정상이면 True
+        """
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+
+
+    def __Reset(driver):
+        """
+        쿠키, 저장소를 비우고 빈 페이지로 이동
+        """
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception:
+            driver.delete_all_cookies()
+        driver.get("about:blank")
+
+
+
+    def __Quit(driver):
+        """
+        드라이버 종료
+        """
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+
+    def __Count(self, name:str):
+        """
+        통계 증가. Acquire, Release는 여러 스레드에서 동시에 호출되므로 잠금 안에서 증가.
+        """
+        with self.__condition:
+            self.__stats[name] += 1
+
+
+
+    def __Create(self):
+        """
+        드라이버 생성
+
+        반환 : 관리 정보 dict
+        """
+        if self.__service != None:
+            driver = webdriver.Chrome(service = self.__service, options = self.__options)
+        else:
+            driver = webdriver.Chrome(options = self.__options)
+        self.__Count("created")
+        return {
+            "driver": driver,
+            "pages": 0,
+            "memory": DriverPool.__MemoryMB(driver)
+        }
+
+
+
+    def Acquire(
+        self,
+        timeout:float = None
+    ):
+        """
+        드라이버 대여. 사용 후 Release로 반납해야 됨.
+
+        반환 : WebDriver, 시간 초과 시 None
+
+        timeout : 빈 드라이버를 기다릴 최대 시간 (초). None일때 무한.
+        """
+        deadline = None if timeout == None else time.perf_counter() + timeout
+        while True:
+            entry = None
+            with self.__condition:
+                while True:
+                    if self.__closed:
+                        print("\n오류\nDriverPool.Acquire()\n이미 종료된 풀입니다.")
+                        return None
+
+                    # 대기 중인 드라이버 재사용
+                    if len(self.__idle) > 0:
+                        entry = self.__idle.pop()
+                        break
+
+                    # 여유가 있으면 새로 생성
+                    if self.__created < self.__maxSize:
+                        self.__created += 1
+                        break
+
+                    # 반납될 때까지 대기
+                    remaining = None if deadline == None else deadline - time.perf_counter()
+                    if remaining != None and remaining <= 0:
+                        print("\n오류\nDriverPool.Acquire()\n사용할 수 있는 드라이버가 없습니다.")
+                        return None
+                    self.__condition.wait(remaining)
+
+            # 새 드라이버 생성
+            if entry == None:
+                try:
+                    entry = self.__Create()
+                except Exception:
+                    with self.__condition:
+                        self.__created -= 1
+                        self.__condition.notify()
+                    raise
+
+            # 재사용하는 드라이버는 상태 확인
+            elif DriverPool.__IsHealthy(entry["driver"]):
+                self.__Count("reused")
+            else:
+                self.__Count("unhealthy")
+                self.__Discard(entry)
+                continue
+
+            with self.__condition:
+                self.__entries[id(entry["driver"])] = entry
+            return entry["driver"]
+
+
+
+    def __Discard(self, entry:dict):
+        """
+        드라이버를 종료하고 자리 반환
+        """
+        DriverPool.__Quit(entry["driver"])
+        with self.__condition:
+            self.__created -= 1
+            self.__condition.notify()
+
+
+
+    def Release(
+        self,
+        driver,
+        pages:int = 1,
+        broken:bool = False
+    ):
+        """
+        드라이버 반납
+
+        driver : Acquire로 대여한 드라이버
+        pages : 대여하는 동안 처리한 페이지 수
+        broken : 오류가 나서 재사용하면 안 되는 경우 True
+        """
+        with self.__condition:
+            entry = self.__entries.pop(id(driver), None)
+        if entry == None:
+            return
+
+        # 재생성 여부 확인
+        entry["pages"] += pages
+        recycle = broken or self.__closed or (self.__maxPages > 0 and entry["pages"] >= self.__maxPages)
+        if not recycle and entry["memory"] > 0:
+            recycle = DriverPool.__MemoryMB(driver) - entry["memory"] > self.__maxMemoryMB
+
+        # 쿠키, 저장소 초기화
+        if not recycle:
+            try:
+                DriverPool.__Reset(driver)
+            except Exception:
+                recycle = True
+
+        if recycle:
+            if not broken and not self.__closed:
+                self.__Count("recycled")
+            self.__Discard(entry)
+            return
+
+        # 대기 목록으로 반환
+        with self.__condition:
+            self.__idle.append(entry)
+            self.__condition.notify()
+
+
+
+    @contextmanager
+    def Lease(
+        self,
+        timeout:float = None
+    ):
+        """
+        with 문으로 드라이버 대여. 블록이 끝나면 자동 반납.
+        블록에서 예외가 발생하면 드라이버는 재사용하지 않음.
+
+        반환 : WebDriver, 시간 초과 시 None
+
+        timeout : 빈 드라이버를 기다릴 최대 시간 (초). None일때 무한.
+        """
+        driver = self.Acquire(timeout)
+        try:
+            yield driver
+        except GeneratorExit:
+            # 드라이버를 쓰던 제너레이터가 중간에 닫힌 경우. 드라이버는 정상.
+            if driver != None:
+                self.Release(driver)
+            raise
+        except BaseException:
+            if driver != None:
+                self.Release(driver, broken = True)
+            raise
+        else:
+            if driver != None:
+                self.Release(driver)
+
+
+
+    def GetStats(self) -> dict:
+        """
+        풀 상태
+
+        반환 : dict
+        """
+        with self.__condition:
+            stats = dict(self.__stats)
+            stats["alive"] = self.__created
+            stats["idle"] = len(self.__idle)
+            stats["leased"] = len(self.__entries)
+        return stats
+
+
+
+    def Close(self):
+        """
+        대기 중인 드라이버 모두 종료. 대여 중인 드라이버는 반납될 때 종료.
+        """
+        with self.__condition:
+            self.__closed = True
+            idle = self.__idle
+            self.__idle = []
+            self.__created -= len(idle)
+            self.__condition.notify_all()
+        for entry in idle:
+            DriverPool.__Quit(entry["driver"])
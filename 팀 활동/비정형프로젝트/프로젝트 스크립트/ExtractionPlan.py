@@ -0,0 +1,82 @@
+from lxml.cssselect import CSSSelector
+from lxml import etree
+import lxml.html
+import pandas as pd
+
+class ExtractionPlan:
+    """
+    선택자 추출 계획. 선택자를 한 번만 컴파일해서 여러 페이지에 재사용.
+    BeautifulSoup 태그 대신 문자열 컬럼을 만들고, 파싱한 페이지는 바로 해제.
+
+    Extract : html에서 문자열 DataFrame 추출
+    """
+    # 텍스트 추출. BeautifulSoup의 .text처럼 script, style 내용은 제외.
+    __TEXT = etree.XPath("descendant-or-self::text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+
+
+    def __init__(
+        self,
+        selectors:list[str],
+        element_names:list[str],
+        attributes:list[str]
+    ):
+        """
+        selectors : 가져올 요소 리스트
+        element_names : 수집한 요소를 구분할 이름
+        attributes : 요소에서 추출할 속성 이름 리스트. "text"일때 태그 안의 텍스트.
+        """
+        self.__selectors = [CSSSelector(selector) for selector in selectors]
+        self.__element_names = element_names
+        self.__attributes = attributes
+
+
+
+    def __Value(
+        element,
+        attribute:str
+    ) -> str:
+        """
+        요소에서 값 추출
+
+        반환 : 문자열
+        """
+        if attribute == "text":
+            return "".join(ExtractionPlan.__TEXT(element))
+        return element.get(attribute, "")
+
+
+
+    def Extract(
+        self,
+        html:str
+    ) -> pd.DataFrame:
+        """
+        html에서 요소 값 추출
+
+        반환 : 문자열 컬럼 DataFrame
+
+        html : 웹 페이지 html
+        """
+        # 파싱
+        try:
+            tree = lxml.html.fromstring(html)
+        except ValueError:
+            # 인코딩 선언이 있는 문자열은 바이트로 파싱
+            tree = lxml.html.fromstring(html.encode("utf-8"))
+        except etree.ParserError:
+            tree = None
+
+        # 선택자별 값 추출. 같은 이름은 한 컬럼으로 이어 붙임.
+        columns = {}
+        i = 0
+        while i < len(self.__selectors):
+            values = [] if tree is None else [ExtractionPlan.__Value(element, self.__attributes[i]) for element in self.__selectors[i](tree)]
+            columns.setdefault(self.__element_names[i], []).extend(values)
+            i += 1
+
+        # 파싱한 페이지 해제
+        del tree
+
+        # 반환
+        return pd.DataFrame({name : pd.Series(values, dtype = "string") for name, values in columns.items()})
@@ -1,62 +1,343 @@
 import os
+import json
 import httpx
+import asyncio
+import hashlib
+import weakref
+import threading
 from langchain.chat_models import init_chat_model
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+from ChatResponseCache import ChatResponseCache
 
 class FashionChatbot:
+    # API 키 설정 파일. {"openai_api_key" : "..."}
+    __CONFIG_PATH = os.path.join(os.path.expanduser("~"), ".config", "FashionTrendCrawling", "config.json")
+
+    # 모든 챗봇이 공유하는 HTTP 연결 풀. 비동기 클라이언트는 이벤트 루프마다 하나이고 (클라이언트, 루프가 끝날 때 닫는 작업)으로 보관.
+    __POOL_LIMITS = httpx.Limits(max_connections = 32, max_keepalive_connections = 16)
+    __TIMEOUT = httpx.Timeout(60.0, connect = 10.0)
+    __httpClient = None
+    __asyncClients = weakref.WeakKeyDictionary()
+    __lock = threading.Lock()
+
+    # 모든 챗봇이 공유하는 모델. (API 키 해시, 설정)별로 하나, 비동기 모델은 이벤트 루프마다 따로.
+    __models = {}
+    __asyncModels = weakref.WeakKeyDictionary()
+    __modelsLock = threading.Lock()
+
+    # 확인된 API 키 해시. 유효하지 않은 키는 요청하지 않고 바로 실패.
+    __validKeys = set()
+    __invalidKeys = set()
+
+
+
     def __init__(
         self,
         model_name:str = "openai:gpt-4.1-nano",
         temperature:int = 0,
-        max_tokens:int = 256
+        max_tokens:int = 256,
+        llm = None,
+        response_cache:ChatResponseCache = None,
+        api_key:str = None
     ):
-        # 모델 생성
-        self.__llm = FashionChatbot.__RegisterAPIKey(model_name, temperature, max_tokens)
-        if self.__llm == None:
-            raise Exception("모델 생성 실패")
+        """
+        모델은 처음 요청할 때 생성하고, API 키도 그때 확인.
+        API 키와 설정이 같은 챗봇은 모델을 공유하고, 챗봇마다 대화 내역만 따로 가짐.
+
+        model_name : 모델 이름
+        temperature : 응답 다양성
+        max_tokens : 최대 토큰 수
+        llm : 사용할 채팅 모델. None이면 API 키로 생성.
+        response_cache : 응답 캐시. 같은 요청은 모델을 호출하지 않고 저장된 응답 사용. temperature가 0일 때만 사용.
+        api_key : API 키. None이면 환경 변수 OPENAI_API_KEY, 설정 파일 순서로 찾음.
+        """
+        # 모델. 직접 받은 모델이 없으면 공유 모델 사용.
+        self.__llm = llm
+        self.__injected = llm != None
+        self.__apiKey = api_key
+        self.__modelLock = threading.Lock()
+
+        # 응답 캐시. 응답이 매번 달라야 하는 경우에는 사용하지 않음.
+        self.__cache = response_cache if temperature == 0 else None
+        self.__settings = (model_name, temperature, max_tokens)
 
         # 채팅 내역 담을 리스트
-        self.__history = [SystemMessage(content = (
+        self.__system = SystemMessage(content = (
             "당신은 패션 전문가다. "
             "패션 관련헤서 추천할 때 추천 아이템, 피해야될 소재를 말한다. "
             "코디맵을 제시하고 해당하는 상품 링크와 이미지를 보여준다. "
             "상품 링크를 가져올 때 query에 들어갈 값에는 띄어쓰기 대신 +를 사용한다. "
             "이미지를 가져올 때는 url을 지어내지 않고 상품 링크에 있는 이미지 하나를 가져온다. "
             "답변은 마크다운언어로 작성하고 이미지도 마크다운언어 내에서 이미지로 표시되도록 한다."
-        ))]
+        ))
+        self.__history = [self.__system]
 
 
-        
-    def __RegisterAPIKey(
-        model_name,
-        temperature,
-        max_tokens
+
+    @classmethod
+    def __GetHttpClient(cls) -> httpx.Client:
+        """
+        공용 HTTP 클라이언트 반환. 처음 호출될 때 생성.
+
+        반환 : httpx.Client
+        """
+        with cls.__lock:
+            if cls.__httpClient == None:
+                cls.__httpClient = httpx.Client(limits = cls.__POOL_LIMITS, timeout = cls.__TIMEOUT)
+            return cls.__httpClient
+
+
+
+    @classmethod
+    def __GetAsyncHttpClient(cls) -> httpx.AsyncClient:
+        """
+        현재 이벤트 루프의 공용 비동기 HTTP 클라이언트 반환. 처음 호출될 때 생성.
+        비동기 연결은 만든 이벤트 루프에서만 쓸 수 있으므로 루프마다 따로 보관하고, 루프가 끝날 때 닫음.
+
+        반환 : httpx.AsyncClient
+        """
+        loop = asyncio.get_running_loop()
+        with cls.__lock:
+            entry = cls.__asyncClients.get(loop)
+            if entry == None:
+                client = httpx.AsyncClient(limits = cls.__POOL_LIMITS, timeout = cls.__TIMEOUT)
+                entry = (client, loop.create_task(cls.__CloseOnShutdown(loop, client)))
+                cls.__asyncClients[loop] = entry
+            return entry[0]
+
+
+
+    @classmethod
+    async def __CloseOnShutdown(
+        cls,
+        loop:asyncio.AbstractEventLoop,
+        client:httpx.AsyncClient
     ):
         """
-        API 키 등록
+        이벤트 루프가 끝날 때까지 기다렸다가 비동기 HTTP 클라이언트를 닫고 그 루프의 모델 삭제.
+        asyncio.run은 끝나기 전에 남은 작업을 취소하므로 그때 닫힘.
+        """
+        try:
+            await loop.create_future()
+        finally:
+            await cls.__CloseAsyncClient(loop, client)
 
-        반환 : LLM 모델
+
+
+    @classmethod
+    async def __CloseAsyncClient(
+        cls,
+        loop:asyncio.AbstractEventLoop,
+        client:httpx.AsyncClient
+    ):
         """
-        while True:
-            # API 키 유효성 확인용 모델
-            apiKey = input("API 키 입력 >> ")
-            llm = init_chat_model(
-                api_key = apiKey,
-                model = "openai:gpt-4.1-nano",
-                temperature = 0,
-                max_tokens = 1
-            )
-            
-            # 테스트 요청, 실패 시 예외 발생
-            llm.invoke("ping")
-            
-            # 성공 시 실제로 사용하기 위한 모델 반환
-            return init_chat_model(
-                api_key = apiKey,
-                model = model_name,
-                temperature = temperature,
-                max_tokens = max_tokens
+        루프의 비동기 HTTP 클라이언트와 모델을 목록에서 빼고 클라이언트 닫기
+        """
+        with cls.__lock:
+            cls.__asyncClients.pop(loop, None)
+        with cls.__modelsLock:
+            cls.__asyncModels.pop(loop, None)
+        await client.aclose()
+
+
+
+    @classmethod
+    async def CloseAsync(cls):
+        """
+        현재 이벤트 루프의 비동기 HTTP 클라이언트를 닫음.
+        asyncio.run을 쓰지 않고 루프를 직접 닫는 경우 닫기 전에 호출.
+        """
+        loop = asyncio.get_running_loop()
+        with cls.__lock:
+            entry = cls.__asyncClients.get(loop)
+        if entry == None:
+            return
+        # 닫는 작업이 시작되지 않았으면 취소만 되므로 직접 닫음
+        entry[1].cancel()
+        await asyncio.gather(entry[1], return_exceptions = True)
+        await cls.__CloseAsyncClient(loop, entry[0])
+
+
+
+    def __GetAPIKey(self) -> str:
+        """
+        API 키 찾기. 인자, 환경 변수 OPENAI_API_KEY, 설정 파일 순서.
+        작업 스레드에서도 호출되므로 직접 입력은 받지 않음.
+
+        반환 : API 키
+
+        예외 : 어디에서도 API 키를 찾을 수 없음
+        """
+        if self.__apiKey == None:
+            self.__apiKey = os.environ.get("OPENAI_API_KEY")
+        if self.__apiKey == None and os.path.exists(FashionChatbot.__CONFIG_PATH):
+            try:
+                with open(FashionChatbot.__CONFIG_PATH, encoding = "utf-8") as f:
+                    self.__apiKey = json.load(f).get("openai_api_key")
+            except (OSError, ValueError) as e:
+                print(f"설정 파일을 읽을 수 없습니다 : {FashionChatbot.__CONFIG_PATH}\n{e}")
+        if self.__apiKey == None:
+            raise PermissionError(
+                f"API 키가 없습니다. 환경 변수 OPENAI_API_KEY 또는 설정 파일 {FashionChatbot.__CONFIG_PATH}의 openai_api_key를 지정하세요."
             )
+        return self.__apiKey
+
+
+
+    def __KeyDigest(self) -> str:
+        """
+        API 키 해시. 직접 받은 모델이면 None.
+        """
+        if self.__injected or self.__apiKey == None:
+            return None
+        return hashlib.sha256(self.__apiKey.encode("utf-8")).hexdigest()
+
+
+
+    def __CreateModel(
+        self,
+        models:dict,
+        asyncClient:httpx.AsyncClient = None
+    ):
+        """
+        공유 모델 반환. 같은 API 키와 설정의 모델이 없으면 생성. 요청은 보내지 않음.
+        스트리밍할 때도 토큰 사용량을 받음.
+
+        반환 : LLM 모델
+
+        models : 모델을 보관할 공유 dict. (API 키 해시, 설정) : 모델
+        asyncClient : 비동기 HTTP 클라이언트. 동기 모델이면 None.
+
+        예외 : 유효하지 않은 것으로 확인된 API 키
+        """
+        apiKey = self.__GetAPIKey()
+        digest = self.__KeyDigest()
+        if digest in FashionChatbot.__invalidKeys:
+            raise PermissionError("유효하지 않은 API 키")
+
+        # 여러 세션이 동시에 요청해도 한 번만 생성
+        with FashionChatbot.__modelsLock:
+            llm = models.get((digest, self.__settings))
+            if llm == None:
+                model_name, temperature, max_tokens = self.__settings
+                llm = init_chat_model(
+                    api_key = apiKey,
+                    model = model_name,
+                    temperature = temperature,
+                    max_tokens = max_tokens,
+                    stream_usage = True,
+                    http_client = FashionChatbot.__GetHttpClient(),
+                    http_async_client = asyncClient
+                )
+                models[(digest, self.__settings)] = llm
+            return llm
+
+
+
+    def __GetModel(self):
+        """
+        동기 요청용 모델. 처음 호출될 때 공유 모델을 가져옴.
+
+        반환 : LLM 모델
+        """
+        with self.__modelLock:
+            if self.__llm == None:
+                self.__llm = self.__CreateModel(FashionChatbot.__models)
+            return self.__llm
+
+
+
+    def __GetAsyncModel(self):
+        """
+        현재 이벤트 루프의 비동기 요청용 공유 모델. 없으면 생성.
+        직접 받은 모델이 있으면 그대로 사용.
+
+        반환 : LLM 모델
+        """
+        if self.__injected:
+            return self.__llm
+        loop = asyncio.get_running_loop()
+        with FashionChatbot.__modelsLock:
+            models = FashionChatbot.__asyncModels.setdefault(loop, {})
+        return self.__CreateModel(models, FashionChatbot.__GetAsyncHttpClient())
+
+
+
+    def __CheckKey(self, error:Exception = None):
+        """
+        요청 결과로 API 키 확인. 처음 성공한 요청이 키 확인을 대신하므로 따로 확인 요청을 보내지 않음.
+        인증 실패면 키를 유효하지 않은 것으로 기록해서 이후 요청은 바로 실패.
+
+        error : 요청 중 발생한 예외. 성공이면 None.
+        """
+        digest = self.__KeyDigest()
+        if digest == None:
+            return
+        with FashionChatbot.__lock:
+            if error == None:
+                FashionChatbot.__validKeys.add(digest)
+            elif type(error).__name__ == "AuthenticationError":
+                FashionChatbot.__invalidKeys.add(digest)
+                FashionChatbot.__validKeys.discard(digest)
+
+
+
+    def IsKeyValidated(self) -> bool:
+        """
+        API 키 확인 여부. 같은 키로 성공한 요청이 한 번이라도 있으면 확인된 것으로 봄.
+
+        반환 : 확인됐으면 True, 유효하지 않으면 False, 아직 모르면 None
+        """
+        digest = self.__KeyDigest()
+        if digest in FashionChatbot.__validKeys:
+            return True
+        if digest in FashionChatbot.__invalidKeys:
+            return False
+        return None
+
+
+
+    def __GetCached(self, messages:list) -> AIMessage:
+        """
+        저장된 응답 조회. response_metadata의 cached에 적중 종류 기록.
+
+        반환 : AIMessage, 없으면 None
+        """
+        if self.__cache == None:
+            return None
+        found = self.__cache.Get(messages, self.__settings)
+        if found == None:
+            return None
+
+        response, hit = found
+        metadata = dict(response["response_metadata"])
+        metadata["cached"] = hit
+        return AIMessage(
+            content = response["content"],
+            response_metadata = metadata,
+            usage_metadata = response["usage_metadata"]
+        )
+
+
+
+    def __PutCached(
+        self,
+        messages:list,
+        response:AIMessage
+    ):
+        """
+        응답 저장. 저장에 실패해도 응답은 그대로 사용.
+        """
+        if self.__cache == None:
+            return
+        try:
+            self.__cache.Put(messages, self.__settings, {
+                "content" : response.content,
+                "response_metadata" : dict(response.response_metadata),
+                "usage_metadata" : dict(response.usage_metadata) if response.usage_metadata else None
+            })
+        except Exception as e:
+            print(f"응답 캐시 저장 실패\n{e}")
 
 
 
@@ -74,8 +355,17 @@ class FashionChatbot:
         # 사용자 메세지 추가
         self.__history.append(HumanMessage(content = message))
 
-        # 응답 요청
-        response = self.__llm.invoke(self.__history)
+        # 저장된 응답이 없으면 응답 요청
+        messages = list(self.__history)
+        response = self.__GetCached(messages)
+        if response == None:
+            try:
+                response = self.__GetModel().invoke(messages)
+            except Exception as e:
+                self.__CheckKey(e)
+                raise
+            self.__CheckKey()
+            self.__PutCached(messages, response)
 
         # 응답 추가
         self.__history.append(response)
@@ -85,6 +375,158 @@ class FashionChatbot:
 
 
 
+    async def RequestResponseAsync(
+        self,
+        message:str
+    ):
+        """
+        응답 비동기 요청. RequestResponse와 같고, 기다리는 동안 이벤트 루프의 다른 요청 진행 가능.
+        같은 챗봇에 동시에 요청하면 대화 내역 순서가 섞이므로 챗봇 하나에는 하나씩 요청.
+
+        반환 : AIMessage
+
+        message : 사용자 입력
+        """
+        # 사용자 메세지 추가
+        self.__history.append(HumanMessage(content = message))
+
+        # 저장된 응답이 없으면 응답 요청
+        messages = list(self.__history)
+        response = self.__GetCached(messages)
+        if response == None:
+            try:
+                response = await self.__GetAsyncModel().ainvoke(messages)
+            except Exception as e:
+                self.__CheckKey(e)
+                raise
+            self.__CheckKey()
+            self.__PutCached(messages, response)
+
+        # 응답 추가
+        self.__history.append(response)
+
+        # 응답 반환
+        return response
+
+
+
+    async def RequestResponseBatchAsync(
+        self,
+        messages:list[str],
+        max_concurrency:int = 8
+    ) -> list:
+        """
+        서로 관계없는 여러 요청을 동시에 비동기 요청. 예) 여러 사용자의 첫 질문.
+        요청마다 시스템 메세지와 사용자 입력만 보내고 대화 내역에는 추가하지 않음.
+
+        반환 : 입력 순서대로 AIMessage 리스트. 실패한 요청은 예외 객체.
+
+        messages : 사용자 입력 리스트
+        max_concurrency : 최대 동시 요청 수
+        """
+        requests = [[self.__system, HumanMessage(content = message)] for message in messages]
+        responses = [self.__GetCached(request) for request in requests]
+
+        # 저장된 응답이 없는 요청만 모아서 요청
+        missing = [i for i, response in enumerate(responses) if response == None]
+        if len(missing) > 0:
+            results = await self.__GetAsyncModel().abatch(
+                [requests[i] for i in missing],
+                config = {"max_concurrency" : max_concurrency},
+                return_exceptions = True
+            )
+            for i, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    self.__CheckKey(result)
+                else:
+                    self.__CheckKey()
+                    self.__PutCached(requests[i], result)
+                responses[i] = result
+        return responses
+
+
+
+    def __ToMessage(
+        chunk,
+        modelName:str
+    ) -> AIMessage:
+        """
+        스트리밍으로 받은 조각을 합친 결과를 AIMessage로 변환.
+        토큰 사용량은 invoke 결과처럼 response_metadata의 token_usage에도 기록.
+
+        반환 : AIMessage
+
+        chunk : 합친 조각. 받은 조각이 없으면 None.
+        modelName : 응답에 모델 이름이 없을 때 기록할 모델 이름
+        """
+        if chunk == None:
+            return AIMessage(content = "", response_metadata = {"model_name" : modelName})
+
+        metadata = dict(chunk.response_metadata)
+        metadata.setdefault("model_name", modelName)
+        usage = chunk.usage_metadata
+        if usage and "token_usage" not in metadata:
+            metadata["token_usage"] = {
+                "prompt_tokens" : usage["input_tokens"],
+                "completion_tokens" : usage["output_tokens"],
+                "total_tokens" : usage["total_tokens"]
+            }
+        return AIMessage(
+            content = chunk.content,
+            response_metadata = metadata,
+            usage_metadata = usage,
+            id = chunk.id
+        )
+
+
+
+    def RequestResponseStream(
+        self,
+        message:str,
+        responseReturn:list[None] = None
+    ):
+        """
+        응답을 조각으로 나눠서 요청. 조각이 도착하는 대로 반환.
+        끝나면 합친 응답을 대화 내역에 추가.
+
+        반환 : 응답 문자열 조각 생성기
+
+        message : 사용자 입력
+        responseReturn : 끝나면 합친 AIMessage 반환
+        """
+        # 사용자 메세지 추가
+        self.__history.append(HumanMessage(content = message))
+
+        # 저장된 응답은 한 번에 반환
+        messages = list(self.__history)
+        response = self.__GetCached(messages)
+        if response != None:
+            if response.content:
+                yield response.content
+
+        # 조각이 도착하는 대로 반환
+        else:
+            try:
+                for chunk in self.__GetModel().stream(messages):
+                    response = chunk if response == None else response + chunk
+                    if chunk.content:
+                        yield chunk.content
+            except Exception as e:
+                self.__CheckKey(e)
+                raise
+            self.__CheckKey()
+            response = FashionChatbot.__ToMessage(response, self.__settings[0])
+            self.__PutCached(messages, response)
+
+        # 합친 응답 추가
+        self.__history.append(response)
+
+        # 합친 응답 반환
+        if responseReturn != None:
+            responseReturn.append(response)
+
+
+
     def GetHistory(
         self
     ):
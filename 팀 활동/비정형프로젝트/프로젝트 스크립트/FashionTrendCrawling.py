@@ -1,22 +1,73 @@
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
-from selenium import webdriver
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
+from ExtractionPlan import ExtractionPlan
+from ResponseCache import ResponseCache
+from RecordSink import RecordSink
+from DriverPool import DriverPool
 import pandas as pd
+import threading
 import requests
 import emoji
 import time
 import re
 
+# 메모리 확인용. 없으면 resource 모듈 사용 (리눅스, 맥).
+try:
+    import psutil
+except ImportError:
+    psutil = None
+try:
+    import resource
+except ImportError:
+    resource = None
+
 class FashionTrendCrawling:
     """
     크롤링 기본 동작
 
     BeginCrawling : 웹 페이지에서 태그 수집
+    BeginCrawlingIncremental : 스크롤할 때마다 새로 추가된 태그 수집
+    BeginCrawlingMany : 여러 웹 페이지에서 동시에 태그 수집
+    BeginCrawlingOne : 웹 페이지 하나에서 추출 계획으로 문자열 수집
     GetSpecific : 수집한 태그에서 특정 요소 추출
     ToDataFrame : DataFrame 리스트를 한 DataFrame으로 병합
+    CleanText : 글 정리
+    CleanTexts : 여러 글을 한 번에 정리
+    EnableCache : 디스크 응답 캐시 사용
+    GetCacheStats : 캐시 적중 통계
     """
+    # 요청 헤더
+    __USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+    # 연결을 재사용하기 위한 공용 세션
+    __session = None
+    __POOL_SIZE = 32
+
+    # 디스크 응답 캐시. EnableCache로 사용.
+    __cache = None
+
+    # 호스트별 동시 요청 수 제한
+    __hostSemaphores = {}
+    __lock = threading.Lock()
+
+    # 스크롤 후 페이지 변화 확인용 스크립트
+    __PAGE_SIZE_SCRIPT = "return [document.body.scrollHeight, document.getElementsByTagName('*').length];"
+    __SELECTOR_SIZE_SCRIPT = "return [document.body.scrollHeight, arguments[0].map(s => document.querySelectorAll(s).length)];"
+    __NEW_ELEMENTS_SCRIPT = "return arguments[0].map((s, i) => Array.from(document.querySelectorAll(s)).slice(arguments[1][i]).map(e => e.outerHTML));"
+
+    # CleanTexts용 미리 컴파일한 패턴
+    __BRACKETS = re.compile(r'\(.*?\)')
+    __SPACES = re.compile(r'\s+')
+    # 이모지를 이루는 문자로만 된 구간. 이 구간에만 emoji.replace_emoji 적용.
+    # 숫자, #, * 같은 ASCII 문자만 있는 구간은 바뀌지 않으므로 제외.
+    __EMOJI_RUNS = None
+
+
+
     def __Scrolling(
         driver,
         deltaTime:float,
@@ -33,8 +84,8 @@ class FashionTrendCrawling:
         timeout : 스크롤 후 페이지가 렌더링 되는지 확인할 최대 시간 (초)
         scrollCountLimit : 스크롤 횟수 제한. 0일때 무한.
         """
-        # 스크롤 전 페이지 소스
-        previous = driver.page_source
+        # 스크롤 전 페이지 크기. 페이지 소스 전체를 비교하지 않고 높이와 요소 수로 변화 확인.
+        previous = driver.execute_script(FashionTrendCrawling.__PAGE_SIZE_SCRIPT)
         
         # 동적 페이지 전체 스크롤할 때까지 무한반복
         timePatience = 0.0
@@ -45,7 +96,7 @@ class FashionTrendCrawling:
             
             # 페이지 로드 확인
             while timePatience < timeout:
-                current = driver.page_source
+                current = driver.execute_script(FashionTrendCrawling.__PAGE_SIZE_SCRIPT)
                 
                 # 페이지 로드가 안 됐을 시
                 if previous == current:
@@ -58,14 +109,73 @@ class FashionTrendCrawling:
                     if scrollCountLimit > 0:
                         count += 1
                         if scrollCountLimit <= count:
-                            return current
+                            return driver.page_source
                     # 스크롤 반복
                     timePatience = 0.0
                     previous = current
                     break
         
         # 최종 로드된 페이지 반환
-        return current
+        return driver.page_source
+
+
+
+    def __ScrollingIncremental(
+        driver,
+        selectors:list[str],
+        deltaTime:float,
+        timeout:float,
+        scrollCountLimit:int
+    ):
+        """
+        페이지 스크롤. 스크롤할 때마다 새로 추가된 요소만 반환.
+        
+        반환 : 제너레이터. 선택자별 새 요소의 html 리스트
+        
+        driver : 페이지를 연 드라이버
+        selectors : 가져올 요소 리스트
+        detaTime : 스크롤 후 페이지가 렌더링 됐는지 확인할 시간 간격 (초)
+        timeout : 스크롤 후 페이지가 렌더링 되는지 확인할 최대 시간 (초)
+        scrollCountLimit : 스크롤 횟수 제한. 0일때 무한.
+        """
+        # 처음 로드된 요소
+        counts = [0] * len(selectors)
+        batch = driver.execute_script(FashionTrendCrawling.__NEW_ELEMENTS_SCRIPT, selectors, counts)
+        counts = [counts[i] + len(batch[i]) for i in range(len(selectors))]
+        yield batch
+        previous = driver.execute_script(FashionTrendCrawling.__SELECTOR_SIZE_SCRIPT, selectors)
+        
+        # 동적 페이지 전체 스크롤할 때까지 무한반복
+        timePatience = 0.0
+        count = 0
+        while timePatience < timeout:
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            
+            # 페이지 로드 확인
+            while timePatience < timeout:
+                current = driver.execute_script(FashionTrendCrawling.__SELECTOR_SIZE_SCRIPT, selectors)
+                
+                # 페이지 로드가 안 됐을 시
+                if previous == current:
+                    timePatience += deltaTime
+                    time.sleep(deltaTime)
+                    continue
+                
+                # 새로 추가된 요소만 반환
+                if current[1] != previous[1]:
+                    batch = driver.execute_script(FashionTrendCrawling.__NEW_ELEMENTS_SCRIPT, selectors, counts)
+                    counts = [counts[i] + len(batch[i]) for i in range(len(selectors))]
+                    yield batch
+                
+                # 스크롤 횟수 제한 확인
+                if scrollCountLimit > 0:
+                    count += 1
+                    if scrollCountLimit <= count:
+                        return
+                # 스크롤 반복
+                timePatience = 0.0
+                previous = current
+                break
         
         
         
@@ -78,7 +188,7 @@ class FashionTrendCrawling:
         showLogs:bool
     ):
         """
-        헤드리스 브라우저 실행
+        헤드리스 브라우저 대여
         웹 페이지 접속
         페이지 스크롤
         정보 수집
@@ -90,37 +200,28 @@ class FashionTrendCrawling:
         scrollCountLimit : 스크롤 횟수 제한. 0일때 무한.
         showLogs : 로그 출력
         """
-        # 페이지 상태 확인
-        status = requests.get(url).status_code
-        if showLogs: print("페이지 상태 : ", status)
-        if status > 300:
+        # 페이지 상태 확인. 캐시를 사용하면 캐시를 거쳐서 확인하므로 저장된 페이지는 다시 받지 않음.
+        if cls.__RequestWithSession(url, timeout, cls.__POOL_SIZE, showLogs) == None:
             return None
         
-        # 브라우저 옵션
-        options = Options()
-        options.add_argument("--headless=new") # 헤드리스 모드
-        options.add_argument("--no-sandbox") # 샌드박스 모드에서는 브라우저 실행인 안 되는 경우가 있어 비활성화
-        options.add_argument("--disable-dev-shm-usage") # 공유 메모리 대신 일반 디스크 사용. 공유 메모리는 크기가 작아서 크롬이 충분한 공간을 확보하지 못하면 크래시가 발생할 수 있음.
-        options.add_argument("--start-maximized")
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-        
-        # 헤드리스 브라우저 열기
-        driver = webdriver.Chrome(options = options)
-        if showLogs: print("헤드리스 브라우저 실행")
-        
-        # 페이지 로드
-        driver.set_page_load_timeout(timeout)
-        driver.get(url)
-        if showLogs: print("페이지 로드")
-        
-        # 페이지 스크롤
-        if showLogs: print("스크롤 시작")
-        html = cls.__Scrolling(driver, 0.1, timeout / 1000.0, scrollCountLimit)
-        if showLogs: print("스크롤 완료")
+        # 공용 풀에서 헤드리스 브라우저 대여
+        with DriverPool.Shared().Lease() as driver:
+            if driver == None:
+                return None
+            if showLogs: print("헤드리스 브라우저 대여")
+            
+            # 페이지 로드
+            driver.set_page_load_timeout(timeout)
+            driver.get(url)
+            if showLogs: print("페이지 로드")
+            
+            # 페이지 스크롤
+            if showLogs: print("스크롤 시작")
+            html = cls.__Scrolling(driver, 0.1, timeout / 1000.0, scrollCountLimit)
+            if showLogs: print("스크롤 완료")
         
-        # 브라우저 종료
-        driver.quit()
-        if showLogs: print("브라우저 종료")
+        # 브라우저 반납
+        if showLogs: print("브라우저 반납")
         
         # BeautifulSoup로 파싱
         html = BeautifulSoup(html, "lxml")
@@ -131,8 +232,11 @@ class FashionTrendCrawling:
 
 
 
+    @classmethod
     def __GetSoupWithoutScrolling(
+        cls,
         url:str,
+        timeout:int,
         showLogs:bool
     ):
         """
@@ -141,23 +245,141 @@ class FashionTrendCrawling:
         반환 : BeautifulSoup
         
         url : 웹 페이지 주소
+        timeout : 요청 제한 시간 (ms)
         showLogs : 로그 출력
         """
         # 페이지 요청
-        res = requests.get(
-            url,
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-        )
-        
+        html = cls.__RequestWithSession(url, timeout, cls.__POOL_SIZE, showLogs)
+        if html == None:
+            return None
+
+        # 반환
+        return BeautifulSoup(html, "lxml")
+
+
+
+    @classmethod
+    def __GetSession(cls) -> requests.Session:
+        """
+        공용 세션 반환. 처음 호출될 때 생성.
+
+        반환 : requests.Session
+        """
+        with cls.__lock:
+            if cls.__session == None:
+                # keep-alive 연결을 풀에 보관해 재사용
+                adapter = HTTPAdapter(
+                    pool_connections = cls.__POOL_SIZE,
+                    pool_maxsize = cls.__POOL_SIZE
+                )
+                session = requests.Session()
+                session.headers["User-Agent"] = cls.__USER_AGENT
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                cls.__session = session
+            return cls.__session
+
+
+
+    @classmethod
+    def __GetHostSemaphore(
+        cls,
+        url:str,
+        maxPerHost:int
+    ) -> threading.Semaphore:
+        """
+        호스트별 동시 요청 수 제한용 세마포어 반환
+
+        반환 : threading.Semaphore
+
+        url : 웹 페이지 주소
+        maxPerHost : 호스트당 최대 동시 요청 수
+        """
+        key = (urlparse(url).netloc, maxPerHost)
+        with cls.__lock:
+            if key not in cls.__hostSemaphores:
+                cls.__hostSemaphores[key] = threading.Semaphore(maxPerHost)
+            return cls.__hostSemaphores[key]
+
+
+
+    @classmethod
+    def __RequestWithSession(
+        cls,
+        url:str,
+        timeout:int,
+        maxPerHost:int,
+        showLogs:bool
+    ) -> str:
+        """
+        공용 세션으로 웹 페이지 요청
+
+        반환 : html 문자열, 실패 시 None
+
+        url : 웹 페이지 주소
+        timeout : 요청 제한 시간 (ms)
+        maxPerHost : 호스트당 최대 동시 요청 수
+        showLogs : 로그 출력
+        """
+        # 페이지 요청. 캐시를 사용하면 캐시를 거쳐서 요청.
+        try:
+            with cls.__GetHostSemaphore(url, maxPerHost):
+                if cls.__cache != None:
+                    status, html = cls.__cache.Fetch(cls.__GetSession(), url, timeout / 1000.0)
+                else:
+                    res = cls.__GetSession().get(url, timeout = timeout / 1000.0)
+                    status, html = res.status_code, res.text
+        except requests.RequestException as e:
+            if showLogs: print(f"페이지 요청 실패 : {url}\n{e}")
+            return None
+
         # 페이지 상태 확인
-        if showLogs: print("페이지 상태 : ", res.status_code)
-        if res.status_code > 300:
+        if showLogs: print("페이지 상태 : ", status)
+        if status > 300:
             return None
 
         # 반환
-        return BeautifulSoup(res.text, "lxml")
+        return html
+
+
+
+    def __RSSMB() -> float:
+        """
+        현재 프로세스 메모리 사용량
+
+        반환 : MB, 확인할 수 없으면 0
+        """
+        if psutil != None:
+            return psutil.Process().memory_info().rss / 1024 / 1024
+        if resource != None:
+            # 리눅스는 KB 단위 최대값
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return 0.0
+
+
+
+    def __CheckSelectors(
+        selectors:list[str],
+        element_names:list[str],
+        caller:str
+    ) -> bool:
+        """
+        선택자 인자 확인
+
+        반환 : 올바르면 True
+
+        selectors : 가져올 요소 리스트
+        element_names : 수집한 요소를 구분할 이름
+        caller : 오류 메세지에 표시할 함수 이름
+        """
+        if len(selectors) != len(element_names):
+            print(f"\n오류\nFashionTrendCrawling.{caller}()\nselectors 길이와 element_names 길이가 같아야됩니다.")
+            print(f"selectors : {len(selectors)}, element_names : {len(element_names)}\n")
+            return False
+        elif len(selectors) < 1:
+            print(f"\n오류\nFashionTrendCrawling.{caller}()\nselectors에 하나 이상의 선택자가 들어가야됩니다.")
+            return False
+        return True
 
 
 
@@ -178,23 +400,43 @@ class FashionTrendCrawling:
         showLogs : 로그 출력
         """
         # 요소 수집
-        result = pd.DataFrame()
+        elementLists = []
         i = 0
         while i < len(selectors):
-            # 요소 수집
-            elements = soup.select(selectors[i])
-            if showLogs: print(f"{element_names[i]} {len(elements)}개 찾음")
-            
+            elementLists.append(soup.select(selectors[i]))
+            if showLogs: print(f"{element_names[i]} {len(elementLists[i])}개 찾음")
+            i += 1
+
+        # 반환
+        return FashionTrendCrawling.__ToElementFrame(elementLists, element_names)
+
+
+
+    def __ToElementFrame(
+        elementLists:list[list],
+        element_names:list[str]
+    ) -> pd.DataFrame:
+        """
+        선택자별로 수집한 요소를 DataFrame으로 변환
+
+        반환 : DataFrame
+
+        elementLists : 선택자별 요소 리스트
+        element_names : 수집한 요소를 구분할 이름
+        """
+        result = pd.DataFrame()
+        i = 0
+        while i < len(elementLists):
             # 이미 존재하는 컬럼에 추가
             if element_names[i] in result.columns:
                 temp = pd.DataFrame()
-                temp[element_names[i]] = elements
+                temp[element_names[i]] = elementLists[i]
                 result = pd.concat([result, temp])
                 result.index = range(0, len(result))
 
             # 새로운 컬럼 추가
             else:
-                result[element_names[i]] = elements
+                result[element_names[i]] = elementLists[i]
             
             i += 1
 
@@ -230,19 +472,14 @@ class FashionTrendCrawling:
         soupReturn : html 반환
         """
         # 오류 확인
-        if len(selectors) != len(element_names):
-            print("\n오류\nFashionTrendCrawling.BeginCrawling()\nselectors 길이와 element_names 길이가 같아야됩니다.")
-            print(f"selectors : {len(selectors)}, element_names : {len(element_names)}\n")
-            return None
-        elif len(selectors) < 1:
-            print("\n오류\nFashionTrendCrawling.BeginCrawling()\nselectors에 하나 이상의 선택자가 들어가야됩니다.")
+        if not cls.__CheckSelectors(selectors, element_names, "BeginCrawling"):
             return None
         
         # 페이지 요청
         if scrolling:
             soup = cls.__GetSoupWithScrolling(url, timeout, scrollCountLimit, showLogs)
         else:
-            soup = cls.__GetSoupWithoutScrolling(url, showLogs)
+            soup = cls.__GetSoupWithoutScrolling(url, timeout, showLogs)
 
         # 페이지 상태 확인
         if soup == None:
@@ -264,6 +501,252 @@ class FashionTrendCrawling:
 
 
 
+    @classmethod
+    def BeginCrawlingIncremental(
+        cls,
+        url:str,
+        selectors:list[str],
+        element_names:list[str],
+        timeout:int = 5000,
+        scrollCountLimit:int = 0,
+        showLogs:bool = True
+    ):
+        """
+        크롤링 시작. 스크롤할 때마다 새로 추가된 태그만 수집.
+        페이지 전체를 다시 파싱하지 않아서 스크롤 도중에 다음 작업을 시작할 수 있음.
+
+        반환 : 제너레이터. 스크롤마다 새로 추가된 태그 DataFrame
+
+        url : 웹 페이지 주소
+        selectors : 가져올 요소 리스트
+        element_names : 수집한 요소를 구분할 이름
+        timeout : 웹 패이지 로드를 기다릴 최대 시간 (ms)
+        scrollCountLimit : 스크롤 횟수 제한. 0일때 무한.
+        showLogs : 로그 출력
+        """
+        # 오류 확인
+        if not cls.__CheckSelectors(selectors, element_names, "BeginCrawlingIncremental"):
+            return
+
+        # 페이지 상태 확인. 캐시를 사용하면 캐시를 거쳐서 확인하므로 저장된 페이지는 다시 받지 않음.
+        if cls.__RequestWithSession(url, timeout, cls.__POOL_SIZE, showLogs) == None:
+            print(f"\n오류\nFashionTrendCrawling.BeginCrawlingIncremental()\n페이지를 요청할 수 없습니다.\n{url}")
+            return
+
+        # 공용 풀에서 헤드리스 브라우저 대여
+        with DriverPool.Shared().Lease() as driver:
+            if driver == None:
+                print(f"\n오류\nFashionTrendCrawling.BeginCrawlingIncremental()\n브라우저를 대여할 수 없습니다.\n{url}")
+                return
+
+            # 페이지 로드
+            driver.set_page_load_timeout(timeout)
+            driver.get(url)
+            if showLogs: print("페이지 로드")
+
+            # 스크롤마다 새 요소만 파싱
+            for batch in cls.__ScrollingIncremental(driver, selectors, 0.1, timeout / 1000.0, scrollCountLimit):
+                elementLists = [[BeautifulSoup(html, "html.parser").find(True) for html in htmls] for htmls in batch]
+                if showLogs: print(", ".join(f"{element_names[i]} {len(elementLists[i])}개 추가" for i in range(len(selectors))))
+                yield cls.__ToElementFrame(elementLists, element_names)
+
+
+
+    @classmethod
+    def BeginCrawlingMany(
+        cls,
+        urls:list[str],
+        selectors:list[str],
+        element_names:list[str],
+        timeout:int = 5000,
+        maxWorkers:int = 16,
+        maxPerHost:int = 8,
+        showLogs:bool = False,
+        progress = None,
+        attributes:list[str] = None,
+        statsReturn:list[None] = None,
+        sink:RecordSink = None
+    ) -> list[pd.DataFrame]:
+        """
+        여러 웹 페이지를 동시에 요청해서 태그 수집. 스크롤 없음.
+
+        반환 : DataFrame 리스트. urls와 같은 순서, 실패한 페이지는 None.
+               sink를 지정하면 결과를 sink에 기록하고 sink 반환.
+
+        urls : 웹 페이지 주소 리스트
+        selectors : 가져올 요소 리스트
+        element_names : 수집한 요소를 구분할 이름
+        timeout : 페이지당 요청 제한 시간 (ms)
+        maxWorkers : 최대 동시 요청 수
+        maxPerHost : 호스트당 최대 동시 요청 수
+        showLogs : 로그 출력
+        progress : 페이지 하나가 끝날 때마다 호출할 함수. progress(완료 수, 전체 수)
+        attributes : 선택자별로 추출할 속성 이름. "text"일때 태그 안의 텍스트.
+                     지정하면 태그 대신 문자열 컬럼을 반환하고 파싱한 페이지는 바로 해제.
+        statsReturn : 파싱 통계 반환. dict(pages, parse_ms_per_page, peak_rss_mb)
+        sink : 페이지가 끝나는 대로 결과를 기록할 RecordSink. attributes와 함께 사용.
+        """
+        # 오류 확인
+        if not cls.__CheckSelectors(selectors, element_names, "BeginCrawlingMany"):
+            return None
+        if attributes != None and len(attributes) != len(selectors):
+            print("\n오류\nFashionTrendCrawling.BeginCrawlingMany()\nattributes 길이와 selectors 길이가 같아야됩니다.")
+            return None
+        if sink != None and attributes == None:
+            print("\n오류\nFashionTrendCrawling.BeginCrawlingMany()\nsink는 문자열 컬럼만 기록할 수 있어서 attributes가 필요합니다.")
+            return None
+
+        # 추출 계획은 한 번만 컴파일
+        plan = None if attributes == None else ExtractionPlan(selectors, element_names, attributes)
+
+        # 파싱 통계
+        stats = {"pages": 0, "parseTime": 0.0, "peakRSS": 0.0}
+        statsLock = threading.Lock()
+
+        def crawl(url:str) -> pd.DataFrame:
+            # 주소가 없으면 건너뜀
+            if pd.isna(url) or url == "":
+                return None
+
+            # 페이지 요청
+            html = cls.__RequestWithSession(url, timeout, maxPerHost, showLogs)
+            if html == None:
+                if showLogs: print(f"\n오류\nFashionTrendCrawling.BeginCrawlingMany()\n페이지를 요청할 수 없습니다.\n{url}")
+                return None
+
+            # 요소 수집
+            startTime = time.perf_counter()
+            if plan != None:
+                result = plan.Extract(html)
+            else:
+                result = cls.__GetElements(BeautifulSoup(html, "lxml"), selectors, element_names, showLogs)
+            elapsed = time.perf_counter() - startTime
+
+            # 통계
+            rss = cls.__RSSMB()
+            with statsLock:
+                stats["pages"] += 1
+                stats["parseTime"] += elapsed
+                stats["peakRSS"] = max(stats["peakRSS"], rss)
+            return result
+
+        # 입력 순서대로 결과를 담을 리스트. sink를 쓰면 sink에 바로 기록.
+        results = [None] * len(urls) if sink == None else sink
+        if len(urls) == 0:
+            return results
+
+        # 동시 요청
+        done = 0
+        with ThreadPoolExecutor(max_workers = max(1, min(maxWorkers, len(urls)))) as executor:
+            futures = {executor.submit(crawl, url) : i for i, url in enumerate(urls)}
+            for future in as_completed(futures):
+                result = None
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if showLogs: print(f"\n오류\nFashionTrendCrawling.BeginCrawlingMany()\n{urls[futures[future]]}\n{e}")
+                if sink != None:
+                    sink.Append(futures[future], result)
+                else:
+                    results[futures[future]] = result
+                done += 1
+                if progress != None:
+                    progress(done, len(urls))
+
+        # 필요 시 파싱 통계 반환
+        stats = {
+            "pages": stats["pages"],
+            "parse_ms_per_page": stats["parseTime"] / stats["pages"] * 1000 if stats["pages"] > 0 else 0.0,
+            "peak_rss_mb": stats["peakRSS"]
+        }
+        if showLogs: print(f"파싱 {stats['pages']}페이지, 페이지당 {stats['parse_ms_per_page']:.1f}ms, 최대 메모리 {stats['peak_rss_mb']:.1f}MB")
+        if statsReturn != None:
+            statsReturn.append(stats)
+
+        # 반환
+        return results
+
+
+
+    @classmethod
+    def BeginCrawlingOne(
+        cls,
+        url:str,
+        plan:ExtractionPlan,
+        timeout:int = 5000,
+        maxPerHost:int = 8,
+        showLogs:bool = False
+    ) -> pd.DataFrame:
+        """
+        웹 페이지 하나를 요청해서 추출 계획으로 문자열 수집. 스크롤 없음.
+        여러 스레드에서 동시에 호출해도 공용 세션, 호스트당 동시 요청 수 제한, 캐시를 함께 사용.
+
+        반환 : 문자열 컬럼 DataFrame, 실패 시 None
+
+        url : 웹 페이지 주소
+        plan : 미리 컴파일한 추출 계획
+        timeout : 요청 제한 시간 (ms)
+        maxPerHost : 호스트당 최대 동시 요청 수
+        showLogs : 로그 출력
+        """
+        # 주소가 없으면 건너뜀
+        if pd.isna(url) or url == "":
+            return None
+
+        # 페이지 요청
+        html = cls.__RequestWithSession(url, timeout, maxPerHost, showLogs)
+        if html == None:
+            if showLogs: print(f"\n오류\nFashionTrendCrawling.BeginCrawlingOne()\n페이지를 요청할 수 없습니다.\n{url}")
+            return None
+
+        # 요소 수집
+        return plan.Extract(html)
+
+
+
+    @classmethod
+    def EnableCache(
+        cls,
+        cacheDir:str = None,
+        ttl:float = 86400.0,
+        maxBytes:int = 512 * 1024 * 1024
+    ):
+        """
+        디스크 응답 캐시 사용. 스크롤 없이 요청하는 페이지에 적용.
+        같은 cacheDir을 쓰는 모든 프로세스가 캐시를 공유.
+
+        cacheDir : 캐시 폴더. None이면 사용자 폴더의 .cache/FashionTrendCrawling
+        ttl : 저장한 응답을 다시 확인하지 않고 쓰는 시간 (초)
+        maxBytes : 캐시 최대 크기 (byte)
+        """
+        with cls.__lock:
+            cls.__cache = ResponseCache(cacheDir, ttl, maxBytes)
+
+
+
+    @classmethod
+    def DisableCache(cls):
+        """
+        디스크 응답 캐시 사용 안 함
+        """
+        with cls.__lock:
+            cls.__cache = None
+
+
+
+    @classmethod
+    def GetCacheStats(cls) -> dict:
+        """
+        캐시 적중 통계
+
+        반환 : dict, 캐시를 사용하지 않으면 None
+        """
+        if cls.__cache == None:
+            return None
+        return cls.__cache.GetStats()
+
+
+
     def GetSpecific(
         tags:pd.Series,
         element:str
@@ -280,7 +763,11 @@ class FashionTrendCrawling:
 
         # 요소 수집
         for tag in tags:
-            results.append(tag.get(element, ""))
+            # 요청에 실패한 페이지는 결측치로 채워져 있음
+            if hasattr(tag, "get"):
+                results.append(tag.get(element, ""))
+            else:
+                results.append("")
 
         # 반환
         return results
@@ -293,18 +780,19 @@ class FashionTrendCrawling:
 
         반환 : DataFrame
 
-        dataList : DataFrame 리스트
+        dataList : DataFrame 리스트. 요청에 실패한 페이지는 None.
         """
         # 컬럼 확인
+        columns = []
         for data in dataList:
-            if len(data.columns) > 0:
+            if data is not None and len(data.columns) > 0:
                 columns = data.columns
                 break
 
         # 빈 DataFrame을 결측치로 생성
         i = 0
         while i < len(dataList):
-            if dataList[i].empty:
+            if dataList[i] is None or dataList[i].empty:
                 dataList[i] = pd.DataFrame(index = [0], columns = columns, data = pd.NA)
             i += 1
 
@@ -330,4 +818,84 @@ class FashionTrendCrawling:
         text = re.sub(r'\s+', ' ', text).strip()
 
         # 이모지 제거 후 반환
-        return emoji.replace_emoji(text, replace = "")
\ No newline at end of file
+        return emoji.replace_emoji(text, replace = "")
+
+
+
+    def __CharClass(chars:set[str]) -> str:
+        """
+        문자 집합을 정규식 문자 범위로 변환
+
+        반환 : 문자열 (예: 0-9\\#\\*)
+        """
+        codes = sorted(ord(c) for c in chars)
+        result = ""
+        i = 0
+        while i < len(codes):
+            # 연속된 코드 포인트는 범위 하나로 묶음
+            j = i
+            while j + 1 < len(codes) and codes[j + 1] == codes[j] + 1:
+                j += 1
+            result += re.escape(chr(codes[i])) if i == j else f"{re.escape(chr(codes[i]))}-{re.escape(chr(codes[j]))}"
+            i = j + 1
+        return result
+
+
+
+    @classmethod
+    def __GetEmojiRuns(cls) -> re.Pattern:
+        """
+        이모지를 이루는 문자 구간 패턴. 처음 호출될 때 컴파일.
+        emoji.replace_emoji는 이모지 밖의 변형 선택자(FE0E, FE0F)도 지우므로 함께 포함.
+
+        반환 : re.Pattern
+        """
+        if cls.__EMOJI_RUNS == None:
+            chars = {c for key in emoji.EMOJI_DATA for c in key} | {"\ufe0e", "\ufe0f"}
+            asciiChars = cls.__CharClass({c for c in chars if c.isascii()})
+            otherChars = cls.__CharClass({c for c in chars if not c.isascii()})
+            cls.__EMOJI_RUNS = re.compile(f"[{asciiChars}]*[{otherChars}][{asciiChars}{otherChars}]*")
+        return cls.__EMOJI_RUNS
+
+
+
+    def CleanTexts(
+        texts,
+        workers:int = 0,
+        chunkSize:int = 256
+    ):
+        """
+        여러 글의 특수문자, 다중 공백, 이모지를 한 번에 제거. 결과는 CleanText와 같음.
+
+        반환 : texts가 Series면 같은 인덱스의 Series, 아니면 리스트
+
+        texts : 글 Series 또는 리스트. 문자열이 아닌 값(결측치)은 그대로 둠.
+        workers : 작업 프로세스 수. 1 이하일때 현재 프로세스에서 처리.
+        chunkSize : 작업 프로세스에 한 번에 보낼 글 수
+        """
+        values = list(texts)
+
+        # 글이 많으면 작업 프로세스로 나눠서 처리
+        if workers > 1 and len(values) > chunkSize:
+            chunks = [values[i : i + chunkSize] for i in range(0, len(values), chunkSize)]
+            with ProcessPoolExecutor(max_workers = workers) as executor:
+                cleaned = [text for chunk in executor.map(FashionTrendCrawling.CleanTexts, chunks) for text in chunk]
+
+        # 현재 프로세스에서 처리
+        else:
+            brackets = FashionTrendCrawling.__BRACKETS
+            spaces = FashionTrendCrawling.__SPACES
+            emojiRuns = FashionTrendCrawling.__GetEmojiRuns()
+            replaceEmoji = lambda match : emoji.replace_emoji(match.group(), replace = "")
+            cleaned = []
+            for text in values:
+                if isinstance(text, str):
+                    # 괄호 안의 광고성 문구 제거 후 공백 정리. 줄바꿈, 탭도 공백이므로 한 번에 처리.
+                    text = spaces.sub(" ", brackets.sub("", text)).strip()
+                    text = emojiRuns.sub(replaceEmoji, text)
+                cleaned.append(text)
+
+        # 반환
+        if isinstance(texts, pd.Series):
+            return pd.Series(cleaned, index = texts.index, name = texts.name)
+        return cleaned
@@ -0,0 +1,165 @@
+import threading
+import time
+
+class JobHandle:
+    """
+    JobQueue 작업 하나의 상태와 결과. 화면에서 주기적으로 상태를 확인하고 끝나면 결과를 가져옴.
+    같은 작업을 요청한 모든 사용자가 같은 핸들을 공유.
+
+    GetState : 작업 상태
+    IsDone : 완료 여부
+    GetResult : 결과 반환. 끝날 때까지 대기 가능.
+    SetPartial : 작업 중간 결과 저장
+    GetPartial : 작업 중간 결과
+    GetTimings : 대기, 실행 시간
+    Start, Finish, Fail : 상태 변경. JobQueue에서 호출.
+    """
+    # 작업 상태
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+
+    def __init__(self, key):
+        """
+        key : 작업 키. 같은 키의 작업은 하나만 실행.
+        """
+        self.__key = key
+        self.__state = JobHandle.QUEUED
+        self.__result = None
+        self.__error = None
+        self.__partial = None
+        self.__done = threading.Event()
+        self.__lock = threading.Lock()
+
+        # 시각
+        self.__submittedAt = time.perf_counter()
+        self.__startedAt = None
+        self.__finishedAt = None
+
+
+
+    def GetKey(self):
+        """
+        작업 키
+        """
+        return self.__key
+
+
+
+    def GetState(self) -> str:
+        """
+        작업 상태
+
+        반환 : "queued", "running", "done", "failed"
+        """
+        with self.__lock:
+            return self.__state
+
+
+
+    def IsDone(self) -> bool:
+        """
+        완료 여부. 실패도 완료로 봄.
+        """
+        return self.__done.is_set()
+
+
+
+    def GetResult(self, timeout:float = None):
+        """
+        결과 반환
+
+        반환 : 작업 함수의 반환값
+
+        timeout : 최대 대기 시간 (초). None이면 끝날 때까지 대기.
+
+        예외 : 작업 함수의 예외, 제한 시간 안에 끝나지 않으면 TimeoutError
+        """
+        if not self.__done.wait(timeout):
+            raise TimeoutError(f"작업이 끝나지 않음 : {self.__key}")
+        if self.__error != None:
+            raise self.__error
+        return self.__result
+
+
+
+    def SetPartial(self, value):
+        """
+        작업 중간 결과 저장. 예) 지금까지 생성된 리포트.
+
+        value : 중간 결과
+        """
+        with self.__lock:
+            self.__partial = value
+
+
+
+    def GetPartial(self):
+        """
+        작업 중간 결과
+
+        반환 : 마지막으로 저장된 중간 결과, 없으면 None
+        """
+        with self.__lock:
+            return self.__partial
+
+
+
+    def GetTimings(self) -> dict:
+        """
+        대기, 실행 시간. 끝나지 않았으면 지금까지의 시간.
+
+        반환 : dict(key, state, queued_seconds, run_seconds, error)
+        """
+        with self.__lock:
+            now = time.perf_counter()
+            startedAt = self.__startedAt if self.__startedAt != None else now
+            finishedAt = self.__finishedAt if self.__finishedAt != None else now
+            return {
+                "key" : self.__key,
+                "state" : self.__state,
+                "queued_seconds" : startedAt - self.__submittedAt,
+                "run_seconds" : max(0.0, finishedAt - startedAt),
+                "error" : repr(self.__error) if self.__error != None else None
+            }
+
+
+
+    def Start(self):
+        """
+        실행 시작으로 변경
+        """
+        with self.__lock:
+            self.__state = JobHandle.RUNNING
+            self.__startedAt = time.perf_counter()
+
+
+
+    def Finish(self, result):
+        """
+        완료로 변경하고 결과 저장
+
+        result : 작업 함수의 반환값
+        """
+        with self.__lock:
+            self.__state = JobHandle.DONE
+            self.__result = result
+            self.__finishedAt = time.perf_counter()
+        self.__done.set()
+
+
+
+    def Fail(self, error:Exception):
+        """
+        실패로 변경하고 예외 저장
+
+        error : 작업 함수의 예외
+        """
+        with self.__lock:
+            self.__state = JobHandle.FAILED
+            self.__error = error
+            self.__finishedAt = time.perf_counter()
+        self.__done.set()
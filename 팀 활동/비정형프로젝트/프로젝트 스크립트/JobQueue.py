@@ -0,0 +1,138 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from JobHandle import JobHandle
+import threading
+
+class JobQueue:
+    """
+    프로세스 전체가 공유하는 백그라운드 작업 큐. 동시에 실행하는 작업 수를 제한하고,
+    같은 키의 작업이 대기 중이거나 실행 중이면 새로 실행하지 않고 같은 핸들을 반환 (single-flight).
+
+    Submit : 작업 추가
+    GetHandle : 대기 중이거나 실행 중인 작업의 핸들
+    GetStats : 대기 수, 실행 수, 작업별 시간 통계
+    Close : 작업 큐 종료
+    """
+    def __init__(
+        self,
+        workers:int = 2,
+        historySize:int = 100
+    ):
+        """
+        workers : 동시에 실행할 최대 작업 수
+        historySize : 통계에 남길 최근 완료 작업 수
+        """
+        self.__workers = workers
+        self.__pool = ThreadPoolExecutor(max_workers = workers, thread_name_prefix = "JobQueue")
+        self.__lock = threading.Lock()
+
+        # 대기 중이거나 실행 중인 키별 핸들
+        self.__inflight = {}
+
+        # 통계
+        self.__history = deque(maxlen = historySize)
+        self.__stats = {
+            "submitted": 0,
+            "deduplicated": 0,
+            "completed": 0,
+            "failed": 0
+        }
+
+
+
+    def __Run(
+        self,
+        handle:JobHandle,
+        function:callable
+    ):
+        """
+        작업 실행. 작업 함수에는 핸들을 넘겨서 중간 결과를 저장할 수 있게 함.
+        """
+        handle.Start()
+        try:
+            handle.Finish(function(handle))
+            name = "completed"
+        except Exception as e:
+            handle.Fail(e)
+            name = "failed"
+        finally:
+            with self.__lock:
+                self.__inflight.pop(handle.GetKey(), None)
+
+        with self.__lock:
+            self.__stats[name] += 1
+            self.__history.append(handle.GetTimings())
+
+
+
+    def Submit(
+        self,
+        key,
+        function:callable
+    ) -> JobHandle:
+        """
+        작업 추가. 같은 키의 작업이 끝나지 않았으면 그 작업의 핸들 반환.
+
+        반환 : JobHandle
+
+        key : 작업 키. 예) 검색어
+        function : 핸들을 받아서 결과를 반환하는 함수. function(handle)
+        """
+        with self.__lock:
+            handle = self.__inflight.get(key)
+            if handle != None:
+                self.__stats["deduplicated"] += 1
+                return handle
+            handle = JobHandle(key)
+            self.__inflight[key] = handle
+            self.__stats["submitted"] += 1
+        self.__pool.submit(self.__Run, handle, function)
+        return handle
+
+
+
+    def GetHandle(self, key) -> JobHandle:
+        """
+        대기 중이거나 실행 중인 작업의 핸들
+
+        반환 : JobHandle, 없으면 None
+
+        key : 작업 키
+        """
+        with self.__lock:
+            return self.__inflight.get(key)
+
+
+
+    def GetStats(self) -> dict:
+        """
+        대기 수, 실행 수, 작업별 시간 통계
+
+        반환 : dict(workers, queued, running, submitted, deduplicated, completed, failed,
+                    average_queued_seconds, average_run_seconds, recent)
+               recent는 최근 완료 작업의 JobHandle.GetTimings 결과 리스트
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            states = [handle.GetState() for handle in self.__inflight.values()]
+            recent = list(self.__history)
+        stats["workers"] = self.__workers
+        stats["queued"] = states.count(JobHandle.QUEUED)
+        stats["running"] = states.count(JobHandle.RUNNING)
+        stats["average_queued_seconds"] = sum(job["queued_seconds"] for job in recent) / len(recent) if len(recent) > 0 else 0.0
+        stats["average_run_seconds"] = sum(job["run_seconds"] for job in recent) / len(recent) if len(recent) > 0 else 0.0
+        stats["recent"] = recent
+        return stats
+
+
+
+    def Close(self):
+        """
+        작업 큐 종료. 대기 중인 작업은 실행하지 않고 실패로 처리, 실행 중인 작업은 끝날 때까지 대기.
+        """
+        self.__pool.shutdown(wait = True, cancel_futures = True)
+        with self.__lock:
+            cancelled = list(self.__inflight.values())
+            self.__inflight.clear()
+        for handle in cancelled:
+            handle.Fail(RuntimeError(f"작업 큐 종료로 취소 : {handle.GetKey()}"))
@@ -1,65 +1,174 @@
-from konlpy.tag import Okt
+from KeywordMatcher import KeywordMatcher
+from KeywordCounts import KeywordCounts
+from NounAnalyzer import NounAnalyzer
+from TrendSketch import TrendSketch
+from NounCache import NounCache
 import pandas as pd
+import numpy as np
 
 class KeywordCounter:
     def __init__(
         self,
         items:list[str],
         colours:list[str],
-        materials:list[str]
+        materials:list[str],
+        backend:str = "okt",
+        workers:int = 0,
+        cache:NounCache = None,
+        sketch:TrendSketch = None,
+        bucketSeconds:float = 86400.0,
+        matcher:KeywordMatcher = None,
+        analyzer:NounAnalyzer = None
     ):
         """
         items : 아이템 리스트
         colours : 색상 리스트
         materials : 재질 리스트
+        backend : 형태소 분석기. "okt" 또는 "kiwi"
+        workers : BeginCountingBatch 작업 프로세스 수. 0이면 현재 프로세스에서 분석.
+        cache : 명사 추출 결과 캐시. None이면 매번 분석.
+        sketch : 고정 키워드 밖의 유행 단어 계측. None이면 계측하지 않음.
+        bucketSeconds : 글 작성 시각을 나눌 구간 길이 (초). 기본값 하루.
+        matcher : 같은 키워드로 컴파일한 키워드 검색기. None이면 새로 생성.
+        analyzer : 명사 추출기. None이면 backend, workers, cache로 새로 생성.
         """
         # 키워드 카테고리의 시작 인덱스를 기억
         self.__colourIndex = len(items)
         self.__materialIndex = self.__colourIndex + len(colours)
 
-        # 모든 키워드 병합
-        self.__keywords = items
-        for key in colours:
-            self.__keywords.append(key)
-        for key in materials:
-            self.__keywords.append(key)
+        # 모든 키워드 병합. 같은 키워드가 여러 카테고리에 있어도 각각 계측.
+        self.__keywords = list(items) + list(colours) + list(materials)
 
-        # 키워드 계측 수를 0으로 초기화
-        self.__counts = pd.Series()
-        for keyword in self.__keywords:
-            self.__counts.loc[keyword] = 0
+        # 키워드 검색기를 한 번만 생성
+        self.__matcher = matcher if matcher != None else KeywordMatcher(self.__keywords)
 
-        # 명사 추출 용도
-        self.__okt = Okt()
+        # 키워드 계측 수를 0으로 초기화. 키워드 위치별, 시간 구간별로 계측.
+        self.__bucketSeconds = bucketSeconds
+        self.__counts = self.NewCounts()
+        self.__sketch = sketch
+
+        # 명사 추출 용도. 분석기는 프로세스마다 하나를 공유하고, 백그라운드에서 미리 생성.
+        if analyzer != None:
+            self.__analyzer = analyzer
+        else:
+            self.__analyzer = NounAnalyzer(backend, workers, cache)
+            NounAnalyzer.WarmUp(backend)
 
         # 출력
         print(f"items : {len(items)}, colours : {len(colours)}, materials : {len(materials)}")
 
 
 
+    def Share(self) -> "KeywordCounter":
+        """
+        키워드 검색기와 명사 추출기는 공유하고 계측 수만 따로 가진 계측기.
+        세션마다 계측기가 필요할 때 키워드 컴파일, 작업 프로세스 생성 없이 만드는 용도.
+        유행 단어 계측은 공유하지 않음.
+
+        반환 : KeywordCounter
+        """
+        return KeywordCounter(
+            items = self.__keywords[ : self.__colourIndex],
+            colours = self.__keywords[self.__colourIndex : self.__materialIndex],
+            materials = self.__keywords[self.__materialIndex : ],
+            bucketSeconds = self.__bucketSeconds,
+            matcher = self.__matcher,
+            analyzer = self.__analyzer
+        )
+
+
+
+    def NewCounts(self) -> KeywordCounts:
+        """
+        같은 키워드의 빈 계측 수. 따로 계측한 뒤 MergeCounts로 합치는 용도.
+
+        반환 : KeywordCounts
+        """
+        return KeywordCounts(self.__keywords, self.__colourIndex, self.__materialIndex, self.__bucketSeconds)
+
+
+
+    def NounsBatch(
+        self,
+        texts:list[str],
+        chunkSize:int = 64
+    ) -> list[list[str]]:
+        """
+        여러 글에서 명사 추출. 계측 수는 바뀌지 않으므로 여러 스레드에서 동시에 호출 가능.
+        CountNouns로 따로 계측한 뒤 MergeCounts로 합치는 용도.
+
+        반환 : 글별 명사 리스트
+
+        texts : 대상 글 리스트. 결측치 없음.
+        chunkSize : 작업 프로세스에 한 번에 전달할 글 수
+        """
+        return self.__analyzer.NounsBatch(texts, chunkSize = chunkSize)
+
+
+
+    def CountNouns(
+        self,
+        nouns:list[list[str]],
+        timestamps:list = None,
+        counts:KeywordCounts = None
+    ) -> KeywordCounts:
+        """
+        명사 리스트에서 키워드 계측. 계측기의 계측 수는 바뀌지 않음.
+
+        반환 : 계측 수
+
+        nouns : 글별 명사 리스트
+        timestamps : 글별 작성 시각. None이면 시각 없이 계측.
+        counts : 계측 수를 더할 KeywordCounts. None이면 새로 생성.
+        """
+        if counts == None:
+            counts = self.NewCounts()
+        if timestamps == None:
+            timestamps = [None] * len(nouns)
+
+        for words, timestamp in zip(nouns, timestamps):
+            # 텍스트에서 키워드가 포함된 단어 수를 계측
+            values = np.zeros(len(self.__keywords), dtype = np.int64)
+            self.__matcher.CountWords(words, values)
+            counts.Add(values, timestamp)
+        return counts
+
+
+
+    def MergeCounts(self, counts:KeywordCounts):
+        """
+        따로 계측한 계측 수를 계측기에 병합
+
+        counts : NewCounts, CountNouns로 만든 계측 수
+        """
+        self.__counts = self.__counts.Merge(counts)
+
+
+
     def BeginCounting(
         self,
         text:str,
-        textReturn:list[None] = None
+        textReturn:list[None] = None,
+        timestamp = None
     ):
         """
         키워드 계측
 
         text : 대상 글
         textReturn : 가공된 텍스트 반환
+        timestamp : 글 작성 시각. None이면 시각 없이 계측.
         """
         # 결측치 확인
         if pd.isna(text) or (text == None):
             return
 
         # 명사만 추출
-        text = self.__okt.nouns(text)
+        text = self.__analyzer.Nouns(text)
 
-        # 텍스트에서 키워드가 포함된 횟수를 계측
-        for keyword in self.__keywords:
-            for word in text:
-                if keyword in word:
-                    self.__counts[keyword] += 1
+        # 키워드 계측
+        self.CountNouns([text], [timestamp], self.__counts)
+        if self.__sketch != None:
+            self.__sketch.AddWords(text)
 
         # 가공된 텍스트 반환
         if textReturn != None:
@@ -67,24 +176,81 @@ class KeywordCounter:
 
 
 
-    def GetCounts(self) -> tuple[pd.Series, pd.Series, pd.Series]:
+    def BeginCountingBatch(
+        self,
+        texts:list[str],
+        textReturn:list[None] = None,
+        progress:callable = None,
+        timestamps:list = None
+    ):
+        """
+        여러 글의 키워드 계측. 명사 추출은 작업 프로세스에서 묶음 단위로 실행.
+
+        texts : 대상 글 리스트
+        textReturn : 가공된 텍스트 반환. 결측치가 아닌 글 순서대로 추가.
+        progress : 명사 추출 묶음이 끝날 때마다 호출할 함수. progress(끝난 글 수, 전체 글 수)
+        timestamps : 글별 작성 시각. None이면 시각 없이 계측.
+        """
+        if timestamps == None:
+            timestamps = [None] * len(texts)
+
+        # 결측치 제외
+        valid = [
+            (text, timestamp) for text, timestamp in zip(texts, timestamps)
+            if not ((text is None) or pd.isna(text))
+        ]
+        texts = [text for text, _ in valid]
+        timestamps = [timestamp for _, timestamp in valid]
+
+        # 명사만 추출
+        nouns = self.__analyzer.NounsBatch(texts, progress = progress)
+
+        # 키워드 계측
+        self.CountNouns(nouns, timestamps, self.__counts)
+        if self.__sketch != None:
+            for words in nouns:
+                self.__sketch.AddWords(words)
+
+        # 가공된 텍스트 반환
+        if textReturn != None:
+            textReturn += nouns
+
+
+
+    def GetCounts(
+        self,
+        start = None,
+        end = None
+    ) -> tuple[pd.Series, pd.Series, pd.Series]:
         """
         키워드 계측 수 반환
         
         반환 : (아이템 Series, 색상 Series, 재질 Series)
+
+        start : 글 작성 시각 시작 (포함). start, end가 모두 None이면 전체.
+        end : 글 작성 시각 끝 (제외)
         """
-        # 각각의 Series로 생성
-        items = self.__counts[ : self.__colourIndex]
-        colours = self.__counts[self.__colourIndex : self.__materialIndex]
-        materials = self.__counts[self.__materialIndex : ]
+        return self.__counts.ToSeries(start, end)
+
 
-        # 이름 부여
-        items.name = "items"
-        colours.name = "colours"
-        materials.name = "materials"
-        
-        # 튜플로 반환
-        return (items, colours, materials)
+
+    def GetKeywordCounts(self) -> KeywordCounts:
+        """
+        시간 구간별 키워드 계측 수. 기간 조회, 기간 비교 용도.
+
+        반환 : 계측기 계측 수의 복사본
+        """
+        return self.__counts.Merge(self.NewCounts())
+
+
+
+    def GetSketch(self) -> TrendSketch:
+        """
+        고정 키워드 밖의 유행 단어 계측
+
+        반환 : TrendSketch, 없으면 None
+        """
+        return self.__sketch
 
 
 
@@ -92,4 +258,14 @@ class KeywordCounter:
         """
         키워드 계측 수 초기화
         """
-        self.__counts[:] = 0
\ No newline at end of file
+        self.__counts.Clear()
+        if self.__sketch != None:
+            self.__sketch.Clear()
+
+
+
+    def Close(self):
+        """
+        명사 추출 작업 프로세스 종료. Share로 만든 계측기도 같은 작업 프로세스를 사용하며, 다음 분석 때 다시 생성.
+        """
+        self.__analyzer.Close()
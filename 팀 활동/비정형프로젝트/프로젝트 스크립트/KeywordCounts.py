@@ -0,0 +1,255 @@
+import pandas as pd
+import numpy as np
+import time
+
+class KeywordCounts:
+    """
+    시간 구간별 키워드 계측 수. 키워드가 같은 계측 수끼리 더해서 병합 가능.
+    작업 프로세스마다 따로 계측한 뒤 Merge로 합칠 수 있음.
+
+    Add : 글 하나의 계측 수 추가
+    Merge : 다른 계측 수와 병합한 새 계측 수
+    Total : 기간 안의 계측 수 합
+    ToSeries : 기간 안의 계측 수를 카테고리별 Series로 변환
+    Window : 기준 시각 이전 일정 기간의 계측 수
+    CompareWindows : 최근 기간과 그 이전 기간 비교
+    Clear : 계측 수 초기화
+    """
+    def __init__(
+        self,
+        keywords:list[str],
+        colourIndex:int,
+        materialIndex:int,
+        bucketSeconds:float = 86400.0
+    ):
+        """
+        keywords : 모든 키워드 리스트. 아이템, 색상, 재질 순서.
+        colourIndex : 색상 키워드 시작 인덱스
+        materialIndex : 재질 키워드 시작 인덱스
+        bucketSeconds : 시간 구간 길이 (초). 기본값 하루.
+        """
+        self.__keywords = list(keywords)
+        self.__colourIndex = colourIndex
+        self.__materialIndex = materialIndex
+        self.__bucketSeconds = bucketSeconds
+
+        # 시간 구간별 계측 수. 시각이 없는 글은 None 구간.
+        self.__buckets = {}
+
+
+
+    def __Seconds(timestamp) -> float:
+        """
+        시각을 초 단위로 변환
+
+        반환 : 유닉스 시간 (초)
+
+        timestamp : 유닉스 시간 (초), datetime, pd.Timestamp 또는 날짜 문자열. 시간대가 없으면 UTC로 간주.
+        """
+        if isinstance(timestamp, (int, float, np.integer, np.floating)):
+            return float(timestamp)
+        return pd.Timestamp(timestamp).timestamp()
+
+
+
+    def __Bucket(self, timestamp):
+        """
+        시각이 속한 구간
+
+        반환 : 구간 번호, 시각이 없으면 None
+        """
+        if timestamp is None:
+            return None
+        return int(KeywordCounts.__Seconds(timestamp) // self.__bucketSeconds)
+
+
+
+    def __Check(self, other:"KeywordCounts"):
+        """
+        병합할 수 있는 계측 수인지 확인
+        """
+        if (
+            self.__keywords != other.__keywords
+            or self.__colourIndex != other.__colourIndex
+            or self.__materialIndex != other.__materialIndex
+            or self.__bucketSeconds != other.__bucketSeconds
+        ):
+            raise ValueError("키워드와 시간 구간 길이가 같은 계측 수만 병합할 수 있음")
+
+
+
+    def Add(
+        self,
+        counts:np.ndarray,
+        timestamp = None
+    ):
+        """
+        글 하나의 계측 수 추가
+
+        counts : 키워드 수만큼의 계측 수 배열
+        timestamp : 글 작성 시각. None이면 기간 조회에서는 제외되고 전체 합에만 포함.
+        """
+        self.__AddBucket(self.__Bucket(timestamp), counts)
+
+
+
+    def __AddBucket(
+        self,
+        bucket,
+        counts:np.ndarray
+    ):
+        """
+        구간에 계측 수 추가
+        """
+        if bucket not in self.__buckets:
+            self.__buckets[bucket] = np.zeros(len(self.__keywords), dtype = np.int64)
+        self.__buckets[bucket] += counts
+
+
+
+    def Merge(self, other:"KeywordCounts") -> "KeywordCounts":
+        """
+        다른 계측 수와 병합. 두 계측 수는 바뀌지 않음.
+        a.Merge(b).Merge(c)와 a.Merge(b.Merge(c))는 같음.
+
+        반환 : 병합한 새 KeywordCounts
+
+        other : 병합할 계측 수
+        """
+        self.__Check(other)
+        result = KeywordCounts(self.__keywords, self.__colourIndex, self.__materialIndex, self.__bucketSeconds)
+        for counts in [self, other]:
+            for bucket, values in counts.__buckets.items():
+                result.__AddBucket(bucket, values)
+        return result
+
+
+
+    def __add__(self, other:"KeywordCounts") -> "KeywordCounts":
+        return self.Merge(other)
+
+
+
+    def Total(
+        self,
+        start = None,
+        end = None
+    ) -> np.ndarray:
+        """
+        기간 안의 계측 수 합. start, end가 모두 None이면 시각이 없는 글까지 포함한 전체 합.
+
+        반환 : 키워드 수만큼의 int64 배열
+
+        start : 시작 시각 (포함). None이면 처음부터.
+        end : 끝 시각 (제외). None이면 끝까지.
+        """
+        total = np.zeros(len(self.__keywords), dtype = np.int64)
+        everything = start is None and end is None
+        first = None if start is None else self.__Bucket(start)
+        last = None if end is None else self.__Bucket(end)
+        for bucket, values in self.__buckets.items():
+            if bucket is None:
+                if everything:
+                    total += values
+                continue
+            if (first is None or bucket >= first) and (last is None or bucket < last):
+                total += values
+        return total
+
+
+
+    def ToSeries(
+        self,
+        start = None,
+        end = None
+    ) -> tuple[pd.Series, pd.Series, pd.Series]:
+        """
+        기간 안의 계측 수를 카테고리별 Series로 변환
+
+        반환 : (아이템 Series, 색상 Series, 재질 Series)
+
+        start : 시작 시각 (포함). None이면 처음부터.
+        end : 끝 시각 (제외). None이면 끝까지.
+        """
+        counts = self.Total(start, end)
+        return (
+            pd.Series(
+                counts[ : self.__colourIndex],
+                index = self.__keywords[ : self.__colourIndex],
+                name = "items"
+            ),
+            pd.Series(
+                counts[self.__colourIndex : self.__materialIndex],
+                index = self.__keywords[self.__colourIndex : self.__materialIndex],
+                name = "colours"
+            ),
+            pd.Series(
+                counts[self.__materialIndex : ],
+                index = self.__keywords[self.__materialIndex : ],
+                name = "materials"
+            )
+        )
+
+
+
+    def Window(
+        self,
+        buckets:int,
+        end = None
+    ) -> tuple[pd.Series, pd.Series, pd.Series]:
+        """
+        기준 시각 이전 일정 구간 수의 계측 수. 기준 시각이 속한 구간까지 포함.
+
+        반환 : (아이템 Series, 색상 Series, 재질 Series)
+
+        buckets : 구간 수. 기본 구간 길이에서는 일 수.
+        end : 기준 시각. None이면 현재 시각.
+        """
+        last = self.__Bucket(time.time() if end is None else end) + 1
+        return self.ToSeries(
+            (last - buckets) * self.__bucketSeconds,
+            last * self.__bucketSeconds
+        )
+
+
+
+    def CompareWindows(
+        self,
+        buckets:int,
+        end = None
+    ) -> pd.DataFrame:
+        """
+        최근 구간과 그 이전 같은 길이 구간 비교. 예) 최근 7일과 그 전 7일.
+
+        반환 : 키워드별 (category, current, previous, change) DataFrame
+
+        buckets : 비교할 구간 수. 기본 구간 길이에서는 일 수.
+        end : 기준 시각. None이면 현재 시각.
+        """
+        last = self.__Bucket(time.time() if end is None else end) + 1
+        current = self.Total((last - buckets) * self.__bucketSeconds, last * self.__bucketSeconds)
+        previous = self.Total((last - 2 * buckets) * self.__bucketSeconds, (last - buckets) * self.__bucketSeconds)
+
+        # 카테고리 이름
+        categories = (
+            ["items"] * self.__colourIndex
+            + ["colours"] * (self.__materialIndex - self.__colourIndex)
+            + ["materials"] * (len(self.__keywords) - self.__materialIndex)
+        )
+        return pd.DataFrame(
+            {
+                "category" : categories,
+                "current" : current,
+                "previous" : previous,
+                "change" : current - previous
+            },
+            index = self.__keywords
+        )
+
+
+
+    def Clear(self):
+        """
+        계측 수 초기화
+        """
+        self.__buckets = {}
@@ -0,0 +1,114 @@
+from collections import Counter, deque
+import numpy as np
+
+class KeywordMatcher:
+    """
+    Aho–Corasick 키워드 검색기. 키워드 리스트를 한 번만 컴파일해서 재사용.
+    컴파일한 뒤에는 바뀌지 않으므로 여러 스레드, 여러 계측기가 함께 사용 가능.
+
+    Match : 단어에 포함된 키워드 인덱스
+    CountWords : 키워드별로 키워드를 포함한 단어 수 계측
+    """
+    # 단어별 검색 결과를 기억할 최대 단어 수
+    __CACHE_SIZE = 100000
+
+
+
+    def __init__(self, keywords:list[str]):
+        """
+        keywords : 키워드 리스트. 같은 키워드가 여러 번 있으면 각 위치에 모두 계측.
+        """
+        # 같은 키워드는 한 패턴으로 묶고, 패턴별로 키워드 위치 기억
+        positions = {}
+        for i, keyword in enumerate(keywords):
+            if keyword != "":
+                positions.setdefault(keyword, []).append(i)
+
+        # 트라이 생성
+        self.__goto = [{}]
+        self.__output = [[]]
+        for keyword, indices in positions.items():
+            node = 0
+            for char in keyword:
+                if char not in self.__goto[node]:
+                    self.__goto.append({})
+                    self.__output.append([])
+                    self.__goto[node][char] = len(self.__goto) - 1
+                node = self.__goto[node][char]
+            self.__output[node] += indices
+
+        # 실패 링크 생성 (너비 우선)
+        self.__fail = [0] * len(self.__goto)
+        queue = deque(self.__goto[0].values())
+        while len(queue) > 0:
+            node = queue.popleft()
+            for char, child in self.__goto[node].items():
+                queue.append(child)
+                fail = self.__fail[node]
+                while fail != 0 and char not in self.__goto[fail]:
+                    fail = self.__fail[fail]
+                self.__fail[child] = self.__goto[fail].get(char, 0)
+                self.__output[child] = self.__output[child] + self.__output[self.__fail[child]]
+
+        # 단어별 검색 결과
+        self.__cache = {}
+
+
+
+    def Match(self, word:str) -> tuple[int]:
+        """
+        단어에 포함된 키워드 검색. keyword in word와 같은 기준.
+
+        반환 : 포함된 키워드 인덱스 튜플 (중복 없음)
+
+        word : 대상 단어
+        """
+        result = self.__cache.get(word)
+        if result != None:
+            return result
+
+        # 트라이를 따라가며 끝나는 키워드 수집
+        goto = self.__goto
+        fail = self.__fail
+        output = self.__output
+        found = set()
+        node = 0
+        for char in word:
+            while node != 0 and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if len(output[node]) > 0:
+                found.update(output[node])
+        result = tuple(sorted(found))
+
+        # 결과 기억
+        if len(self.__cache) >= KeywordMatcher.__CACHE_SIZE:
+            self.__cache.clear()
+        self.__cache[word] = result
+        return result
+
+
+
+    def CountWords(
+        self,
+        words:list[str],
+        counts:np.ndarray
+    ):
+        """
+        키워드별로 키워드를 포함한 단어 수를 counts에 더함.
+
+        words : 단어 리스트
+        counts : 키워드 수만큼의 int64 배열
+        """
+        indices = []
+        weights = []
+
+        # 같은 단어는 한 번만 검색
+        for word, count in Counter(words).items():
+            for index in self.Match(word):
+                indices.append(index)
+                weights.append(count)
+
+        # 한 번에 더함
+        if len(indices) > 0:
+            np.add.at(counts, indices, weights)
@@ -1,38 +1,101 @@
 from FashionTrendCrawling import FashionTrendCrawling as ftc
 from KeywordCounter import KeywordCounter as kc
+from NounCache import NounCache
 from FashionChatbot import FashionChatbot
+from ChatResponseCache import ChatResponseCache
+from ExtractionPlan import ExtractionPlan
+from BlogUrlResolver import BlogUrlResolver
+from StagePipeline import StagePipeline
+from PassageRanker import PassageRanker
 from IPython.display import clear_output
 import pandas as pd
+import threading
 import time
 
 
 class LLMResponse:
+    # 블로그 본문 텍스트 추출 계획
+    __TEXT_PLAN = ExtractionPlan(["#viewTypeSelector > div > div.se-main-container"], ["text"], ["text"])
+
+    # 프로세스의 모든 LLMResponse가 공유하는 자원. 처음 생성할 때 한 번만 만듦.
+    __shared = None
+    __sharedLock = threading.Lock()
+
+
+    @classmethod
+    def __GetShared(cls) -> dict:
+        """
+        공유 자원 반환. 없으면 생성.
+        키워드 검색기, 명사 추출 작업 프로세스, 명사 캐시, 응답 캐시, 링크 변환 기록, 문단 선택기는
+        세션마다 다를 필요가 없으므로 한 번만 만들어서 모든 세션이 함께 사용.
+
+        반환 : dict(counter, responseCache, resolver, ranker)
+        """
+        with cls.__sharedLock:
+            if cls.__shared != None:
+                return cls.__shared
+
+            # 원본 계측기. 세션별 계측기는 Share로 만들어서 계측 수만 따로 가짐.
+            counter = kc(
+                items = [
+                    "코트", "패딩", "자켓", "점퍼", "블레이저", "가디건", "니트", "스웨터",
+                    "셔츠", "블라우스", "티셔츠", "후드티", "바지", "청바지", "슬랙스", "스커트",
+                    "치마", "원피스", "부츠", "로퍼", "운동화", "스니커즈", "가방", "백팩",
+                    "머플러", "목도리", "장갑", "모자", "비니",
+                    "조거팬츠", "바라클라바", "스웻셔츠", "레깅스", "후리스", "롱부츠", "숄더백"
+                ],
+                colours = [
+                    "블랙", "화이트", "아이보리", "베이지", "그레이", "네이비", "브라운",
+                    "카키", "버건디", "레드", "핑크", "블루", "스카이블루", "옐로우", "오렌지",
+                    "민트", "퍼플",
+                    "크림", "오트밀", "라떼", "딥그린", "와인", "카멜", "톤온톤"
+                ],
+                materials = [
+                    "울", "캐시미어", "가죽", "코튼", "면", "데님", "린넨", "실크", "나일론",
+                    "폴리에스터", "스웨이드", "니트", "퍼", "벨벳",
+                    "아크릴", "레이온", "스판덱스", "코듀로이", "플리스",
+                    "다운", "웰론", "양털", "무스탕"
+                ],
+                workers = 4,
+                cache = NounCache()
+            )
+
+            # 블로그 페이지는 거의 바뀌지 않으므로 디스크 캐시 사용
+            if ftc.GetCacheStats() == None:
+                ftc.EnableCache()
+
+            cls.__shared = {
+                "counter" : counter,
+
+                # 같은 요청만 저장된 응답 사용. 마지막 메세지에 검색 결과가 들어가므로 비슷한 요청은 다른 검색어의 리포트일 수 있음.
+                "responseCache" : ChatResponseCache(similarity = None),
+
+                # 검색 결과 링크를 본문 주소로 변환. 변환 결과는 모든 세션이 재사용.
+                "resolver" : BlogUrlResolver(),
+
+                # 프롬프트에 넣을 블로그 문단 선택기
+                "ranker" : PassageRanker()
+            }
+            return cls.__shared
+
+
     def __init__(self):
-        # 계측기 생성
-        self.__counter = kc(
-            items = [
-                "코트", "패딩", "자켓", "점퍼", "블레이저", "가디건", "니트", "스웨터",
-                "셔츠", "블라우스", "티셔츠", "후드티", "바지", "청바지", "슬랙스", "스커트",
-                "치마", "원피스", "부츠", "로퍼", "운동화", "스니커즈", "가방", "백팩",
-                "머플러", "목도리", "장갑", "모자", "비니",
-                "조거팬츠", "바라클라바", "스웻셔츠", "레깅스", "후리스", "롱부츠", "숄더백"
-            ],
-            colours = [
-                "블랙", "화이트", "아이보리", "베이지", "그레이", "네이비", "브라운",
-                "카키", "버건디", "레드", "핑크", "블루", "스카이블루", "옐로우", "오렌지",
-                "민트", "퍼플",
-                "크림", "오트밀", "라떼", "딥그린", "와인", "카멜", "톤온톤"
-            ],
-            materials = [
-                "울", "캐시미어", "가죽", "코튼", "면", "데님", "린넨", "실크", "나일론",
-                "폴리에스터", "스웨이드", "니트", "퍼", "벨벳",
-                "아크릴", "레이온", "스판덱스", "코듀로이", "플리스",
-                "다운", "웰론", "양털", "무스탕"
-            ]
-        )
-        
-        # 챗봇 참조할 변수
-        self.__bot = None
+        """
+        세션별 분석기. 무거운 자원은 공유하고 계측 수와 마지막 결과만 따로 가짐.
+        """
+        shared = LLMResponse.__GetShared()
+
+        # 계측기. 키워드 검색기와 명사 추출기는 공유.
+        self.__counter = shared["counter"].Share()
+
+        # 챗봇은 요청마다 새로 생성. 응답 캐시는 공유.
+        self.__responseCache = shared["responseCache"]
+        self.__resolver = shared["resolver"]
+        self.__ranker = shared["ranker"]
+
+        # 마지막 수집의 단계별 처리 통계, 호출별 프롬프트 토큰 수와 응답 시간 기록
+        self.__pipelineStats = None
+        self.__callLogs = []
 
 
     def __progressbar(self, startTime:float, progress:float, title:str = ""):
@@ -50,17 +113,25 @@ class LLMResponse:
         """
         토큰 비용 출력
         """
-        if "gpt-4.1-nano" in response_metadata["model_name"]:
+        if response_metadata.get("cached"):
+            return "\n저장된 응답 사용 | 토큰 비용 없음\n"
+
+        # 조각 없이 끝난 스트리밍은 모델 이름과 토큰 사용량이 없을 수 있음
+        model_name = response_metadata.get("model_name", "")
+        if "token_usage" not in response_metadata:
+            return f"\n사용 모델 {model_name} | 토큰 사용량 없음\n"
+
+        if "gpt-4.1-nano" in model_name:
             inputToken = 0.2 / 1000000
             outputToken = 0.8 / 1000000
-        elif "gpt-4.1-mini" in response_metadata["model_name"]:
+        elif "gpt-4.1-mini" in model_name:
             inputToken = 0.8 / 1000000
             outputToken = 3.2 / 1000000
-        elif "gpt-4.1" in response_metadata["model_name"]:
+        elif "gpt-4.1" in model_name:
             inputToken = 3.0 / 1000000
             outputToken = 12.0 / 1000000
         else:
-            print(f"사용 모델 {response_metadata["model_name"]}")
+            print(f"사용 모델 {model_name}")
             return
     
         inputToken = response_metadata["token_usage"]["prompt_tokens"] * inputToken
@@ -82,117 +153,90 @@ f"""
         scrollCountLimit:int = 0
     ) -> pd.DataFrame:
         """
-        네이버 블로그 글 수집
+        네이버 블로그 글 수집.
+        검색 → 링크 변환 → 본문 수집 → 정리 → 명사 추출, 계측 단계를 큐로 연결해서
+        글마다 본문이 도착하는 대로 다음 단계로 넘김.
     
         반환 : pd.DataFrame
     
         query : 검색 키워드
         scrollCountLimit : 최대 스크롤 수
+
+        예외 : 검색 실패 (브라우저 오류 등). 빈 결과로 답변을 요청하고 저장하지 않도록 그대로 전달.
         """
         print(f"{query} 네이버 블로그 검색")
-        
-        # 1. a 태그 수집
-        elements = ftc.BeginCrawling(
-            url = f"https://search.naver.com/search.naver?ssc=tab.blog.all&sm=tab_jum&query={query}",
-            selectors = [
-                "div > div > div > div > div > div.sds-comps-vertical-layout.sds-comps-full-layout.ubuDRz_QzPbskEJRLpc9 > div > div > a"
-            ],
-            element_names = [
-                "블로그 a 태그"
-            ],
-            timeout = 1000,
-            scrolling = True,
-            scrollCountLimit = scrollCountLimit
-        )
-    
-        # 2. 수집한 a 태그에서 링크 추출
-        elements = pd.DataFrame(
-            data = ftc.GetSpecific(elements["블로그 a 태그"], "href"),
-            columns = ["url"]
-        )
-    
-        # 3. 추출한 링크에서 iframe 태그 수집
-        temp = []
-        length = len(elements)
-        i = 0
-        startTime = time.perf_counter()
-        while i < length:
-            temp.append(
-                ftc.BeginCrawling(
-                    url = elements.loc[i, "url"],
-                    selectors = [
-                        "iframe"
-                    ],
-                    element_names = [
-                        "iframe 태그"
-                    ],
-                    scrolling = False,
-                    showLogs = False
-                )
-            )
-            i += 1
-            self.__progressbar(startTime, i / length, "추출한 링크에서 iframe 태그 수집")
-        temp = ftc.ToDataFrame(temp)
-    
-        # 4. 수집한 iframe 태그에서 src 추출
-        elements = pd.concat(
-            [
-                elements,
-                pd.Series(ftc.GetSpecific(temp["iframe 태그"], "src"), name = "link")
-            ],
-            axis = 1
-        )
-    
-        # 5. 수집한 src를 실제 주소로 변경
-        i = 0
-        while i < len(elements):
-            elements.loc[i, "link"] = "https://m.blog.naver.com/" + elements.loc[i, "link"]
-            i += 1
-    
-        # 6. 추출한 링크에서 본문 요소 수집
-        temp = []
-        length = len(elements)
-        i = 0
+
+        # 1. 검색 : 스크롤하면서 새로 추가된 a 태그의 링크를 바로 전달
+        def search():
+            for batch in ftc.BeginCrawlingIncremental(
+                url = f"https://search.naver.com/search.naver?ssc=tab.blog.all&sm=tab_jum&query={query}",
+                selectors = [
+                    "div > div > div > div > div > div.sds-comps-vertical-layout.sds-comps-full-layout.ubuDRz_QzPbskEJRLpc9 > div > div > a"
+                ],
+                element_names = [
+                    "블로그 a 태그"
+                ],
+                timeout = 1000,
+                scrollCountLimit = scrollCountLimit
+            ):
+                for url in ftc.GetSpecific(batch["블로그 a 태그"], "href"):
+                    yield {"url" : url, "link" : pd.NA, "text" : pd.NA}
+
+        # 2. 링크 변환 : 링크의 블로그 아이디와 글 번호로 모바일 주소 생성. 알 수 없는 형식만 블로그 페이지 요청.
+        def resolve(row:dict) -> dict:
+            link = self.__resolver.Resolve(row["url"])
+            if link != None:
+                row["link"] = link
+            return row
+
+        # 3. 본문 수집
+        def fetch(row:dict) -> dict:
+            temp = ftc.BeginCrawlingOne(row["link"], LLMResponse.__TEXT_PLAN)
+            if temp is not None and len(temp) > 0:
+                row["text"] = temp.loc[0, "text"]
+            return row
+
+        # 4. 본문 텍스트 정리. 도착한 글을 묶어서 한 번에 정리.
+        def clean(rows:list[dict]) -> list[dict]:
+            texts = ftc.CleanTexts([row["text"] for row in rows])
+            for row, text in zip(rows, texts):
+                row["text"] = text
+            return rows
+
+        # 5. 명사 추출, 계측. 묶음마다 명사 추출 작업 프로세스에 나눠 보내고 따로 계측한 뒤 끝나고 합침.
+        partials = []
+        def count(rows:list[dict]) -> list[dict]:
+            texts = [row["text"] for row in rows if isinstance(row["text"], str)]
+            if len(texts) > 0:
+                nouns = self.__counter.NounsBatch(texts, chunkSize = 4)
+                partials.append(self.__counter.CountNouns(nouns))
+            return rows
+
+        # 단계별 동시 처리 수. 네트워크 단계는 많이, 정리와 명사 추출은 묶음 단위.
+        pipeline = StagePipeline(queueSize = 64)
+        pipeline.AddStage("resolve", resolve, workers = 8)
+        pipeline.AddStage("fetch", fetch, workers = 8)
+        pipeline.AddStage("clean", clean, workers = 1, batchSize = 16, batchWait = 0.2)
+        pipeline.AddStage("count", count, workers = 2, batchSize = 16, batchWait = 0.2)
+
         startTime = time.perf_counter()
-        while i < length:
-            temp.append(
-                ftc.BeginCrawling(
-                    url = elements.loc[i, "link"],
-                    selectors = [
-                        "#viewTypeSelector > div > div.se-main-container"
-                    ],
-                    element_names = [
-                        "text"
-                    ],
-                    scrolling = False,
-                    showLogs = False
-                )
+        try:
+            rows = pipeline.Run(
+                search(),
+                progress = lambda done, total : self.__progressbar(startTime, done / total, f"블로그 글 수집, 정리, 계측 ({done} / {total})")
             )
-            i += 1
-            self.__progressbar(startTime, i / length, "추출한 링크에서 본문 요소 수집")
-        temp = ftc.ToDataFrame(temp)
-    
-        # 7. 본문 요소에서 텍스트 추출
-        texts = []
-        i = 0
-        while i < len(temp):
-            if pd.isna(temp.loc[i, "text"]):
-                texts.append(pd.NA)
-            else:
-                texts.append(ftc.CleanText(temp.loc[i, "text"].text))
-            i += 1
-        elements["text"] = texts
-        
-        # 8. 계측
-        length = len(elements)
-        i = 0
-        while i < length:
-            self.__counter.BeginCounting(elements.loc[i, "text"])
-            i += 1
-            self.__progressbar(startTime, i / length, "키워드 계측")
-        
-        # 9. 계측 결과 (아이템, 색상, 재질)
-        result = self.__counter.GetCounts()
+        finally:
+            self.__pipelineStats = pipeline.GetStats()
+
+        # 묶음별 계측 수 병합
+        for counts in partials:
+            self.__counter.MergeCounts(counts)
+
+        # 6. 수집 결과. 처리 중 오류가 난 글은 결측치.
+        elements = pd.DataFrame(
+            data = [row if row is not None else {} for row in rows],
+            columns = ["url", "link", "text"]
+        ).astype("string")
     
         # 출력물 모두 제거
         clear_output()
@@ -201,20 +245,21 @@ f"""
         return elements
     
 
-    def GetLLMResponse(
+    def __PrepareRequest(
         self,
         userInput:str,
-        max_scroll_count:int = 0,
-        model_name:str = "openai:gpt-4.1-nano",
-        max_tokens:int = 512
-    ) -> str:
+        max_scroll_count:int,
+        model_name:str,
+        max_tokens:int,
+        passage_token_budget:int
+    ) -> tuple[FashionChatbot, str, list[pd.Series], int]:
         """
-        LLM에서 답변 얻기.
+        블로그 수집, 계측 후 프롬프트 생성.
+        챗봇은 요청마다 새로 만들어서 다른 검색어의 대화 내역이 프롬프트와 응답 캐시 키에 섞이지 않게 함.
+        모델은 챗봇끼리 공유하므로 생성 비용은 작음.
 
-        userInput : 사용자 입력
-        max_tokens : 최대 토큰 수
+        반환 : (챗봇, 프롬프트, [아이템 top5, 색상 top5, 재질 top5], 선택한 문단 수)
         """
-        
         # 계측기 초기화
         self.__counter.ClearCounts()
         
@@ -232,19 +277,22 @@ f"""
             counts[2].sort_values(ascending = False).head(5)
         ]
         
-        # 챗봇 생성
-        if self.__bot == None:
-            self.__bot = FashionChatbot(
-                model_name = model_name,
-                max_tokens = max_tokens
-            )
+        # 빈 대화로 시작하는 챗봇 생성
+        bot = FashionChatbot(
+            model_name = model_name,
+            max_tokens = max_tokens,
+            response_cache = self.__responseCache
+        )
         clear_output(wait = True)
+
+        # 질문과 관련 있는 블로그 문단만 선택
+        passages = self.__ranker.Select(userInput, data["text"].tolist(), passage_token_budget)
         
-        # 응답 요청
-        response = self.__bot.RequestResponse(
+        # 프롬프트 생성
+        prompt = (
         f"""
-        다음 링크의 내용을 참고하라.
-        {data["link"].str.cat(sep = "\n")}
+        다음 네이버 블로그 발췌 내용을 참고하라.
+        {"\n".join(f"[{rank + 1}] {passage} (출처 : {data.loc[index, "link"]})" for rank, (index, passage, _) in enumerate(passages))}
         
         
         다음 키워드 언급 횟수를 참고하라.
@@ -261,6 +309,57 @@ f"""
         네이버 블로그 내용을 요약하고 \"{userInput}\"에 대해 추천하라.
         """
         )
+        return (bot, prompt, counts, len(passages))
+
+
+    def __LogCall(
+        self,
+        userInput:str,
+        prompt:str,
+        passages:int,
+        response,
+        latency:float,
+        firstTokenLatency:float = None
+    ):
+        """
+        프롬프트 토큰 수와 응답 시간 기록
+        """
+        usage = response.response_metadata.get("token_usage", {})
+        log = {
+            "query" : userInput,
+            "passages" : passages,
+            "prompt_tokens_estimate" : PassageRanker.CountTokens(prompt),
+            "prompt_tokens" : usage.get("prompt_tokens"),
+            "latency_seconds" : latency,
+            "first_token_seconds" : firstTokenLatency,
+            "cached" : response.response_metadata.get("cached")
+        }
+        self.__callLogs.append(log)
+        print(f"문단 {log['passages']}개, 프롬프트 토큰 {log['prompt_tokens']} (추정 {log['prompt_tokens_estimate']}), 응답 {latency:.2f}초")
+
+
+    def GetLLMResponse(
+        self,
+        userInput:str,
+        max_scroll_count:int = 0,
+        model_name:str = "openai:gpt-4.1-nano",
+        max_tokens:int = 512,
+        passage_token_budget:int = 1500
+    ) -> str:
+        """
+        LLM에서 답변 얻기.
+
+        userInput : 사용자 입력
+        max_tokens : 최대 토큰 수
+        passage_token_budget : 프롬프트에 넣을 블로그 문단의 최대 토큰 수 (추정)
+        """
+        # 프롬프트 생성
+        bot, prompt, counts, passages = self.__PrepareRequest(userInput, max_scroll_count, model_name, max_tokens, passage_token_budget)
+
+        # 응답 요청
+        startTime = time.perf_counter()
+        response = bot.RequestResponse(prompt)
+        self.__LogCall(userInput, prompt, passages, response, time.perf_counter() - startTime)
         
         # 응답 반환
         return (
@@ -268,4 +367,87 @@ f"""
             counts[0],
             counts[1],
             counts[2]
-        )
\ No newline at end of file
+        )
+
+
+    def GetLLMResponseStream(
+        self,
+        userInput:str,
+        max_scroll_count:int = 0,
+        model_name:str = "openai:gpt-4.1-nano",
+        max_tokens:int = 512,
+        passage_token_budget:int = 1500
+    ) -> tuple:
+        """
+        LLM에서 답변을 조각으로 나눠서 얻기. 블로그 수집과 계측은 호출할 때 끝나고, 답변은 생성기로 반환.
+        생성기를 끝까지 읽으면 GetLLMResponse의 답변 문자열과 같은 내용.
+
+        반환 : (답변 문자열 조각 생성기, 아이템 Series, 색상 Series, 재질 Series)
+
+        userInput : 사용자 입력
+        max_tokens : 최대 토큰 수
+        passage_token_budget : 프롬프트에 넣을 블로그 문단의 최대 토큰 수 (추정)
+        """
+        # 프롬프트 생성
+        bot, prompt, counts, passages = self.__PrepareRequest(userInput, max_scroll_count, model_name, max_tokens, passage_token_budget)
+
+        def stream():
+            yield f"```검색 키워드 >> {userInput}```\n\n"
+
+            # 조각이 도착하는 대로 반환
+            responseReturn = []
+            firstTokenLatency = None
+            startTime = time.perf_counter()
+            for chunk in bot.RequestResponseStream(prompt, responseReturn):
+                if firstTokenLatency == None:
+                    firstTokenLatency = time.perf_counter() - startTime
+                yield chunk
+            self.__LogCall(userInput, prompt, passages, responseReturn[0], time.perf_counter() - startTime, firstTokenLatency)
+
+            # 토큰 비용
+            yield f"\n\n```{self.__TokenPrice(responseReturn[0].response_metadata)}```"
+
+        # 응답 반환
+        return (
+            stream(),
+            counts[0],
+            counts[1],
+            counts[2]
+        )
+
+
+    def GetPipelineStats(self) -> dict:
+        """
+        마지막 블로그 수집의 단계별 처리 통계
+
+        반환 : StagePipeline.GetStats 결과, 수집 전이면 None
+        """
+        return self.__pipelineStats
+
+
+    def GetResponseCacheStats(self) -> dict:
+        """
+        챗봇 응답 캐시 적중 통계. 모든 세션 합계.
+
+        반환 : ChatResponseCache.GetStats 결과
+        """
+        return self.__responseCache.GetStats()
+
+
+    def GetResolverStats(self) -> dict:
+        """
+        블로그 링크 변환 통계. 페이지 요청 없이 변환한 비율 확인용. 모든 세션 합계.
+
+        반환 : BlogUrlResolver.GetStats 결과
+        """
+        return self.__resolver.GetStats()
+
+
+    def GetCallLogs(self) -> list[dict]:
+        """
+        GetLLMResponse 호출별 기록
+
+        반환 : dict(query, passages, prompt_tokens_estimate, prompt_tokens, latency_seconds, first_token_seconds, cached) 리스트
+               cached는 저장된 응답을 사용했으면 적중 종류, 아니면 None
+        """
+        return list(self.__callLogs)
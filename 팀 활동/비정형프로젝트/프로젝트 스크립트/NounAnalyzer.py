@@ -0,0 +1,276 @@
+from concurrent.futures import ProcessPoolExecutor
+from NounCache import NounCache
+import importlib.metadata
+import threading
+import time
+
+class NounAnalyzer:
+    """
+    명사 추출기. 형태소 분석기는 Okt 또는 Kiwi 중에서 선택.
+    분석기는 처음 사용할 때 프로세스마다 하나만 생성해서 공유.
+    여러 스레드가 같은 명사 추출기를 함께 사용 가능.
+
+    WarmUp : 백그라운드 스레드에서 분석기 미리 생성
+    GetLoadStats : 분석기 생성에 걸린 시간
+    Version : 분석기 버전
+    Nouns : 글 하나에서 명사 추출
+    NounsBatch : 여러 글에서 명사 추출. 작업 프로세스에 글을 묶어서 전달.
+    NounsChunk : 작업 프로세스에서 실행되는 묶음 단위 명사 추출
+    Close : 작업 프로세스 종료
+    """
+    # 선택 가능한 분석기
+    BACKENDS = ("okt", "kiwi")
+
+    # 분석기별 패키지 이름
+    __PACKAGES = {"okt" : "konlpy", "kiwi" : "kiwipiepy"}
+
+    # 분석기별 명사 품사
+    __KIWI_NOUN_TAGS = ("NNG", "NNP")
+
+    # 미리 생성할 때 분석할 문장
+    __WARM_UP_SENTENCE = "가을 뮤트톤 니트와 울 코트로 출근 코디를 완성했어요."
+
+    # 프로세스마다 공유하는 분석기
+    __analyzers = {}
+    __loadSeconds = {}
+    __lock = threading.Lock()
+
+    # 분석기별 버전. 패키지 정보 조회는 느리므로 분석기마다 한 번만 조회.
+    __versions = {}
+
+    # 분석기별 미리 생성 스레드
+    __warmUps = {}
+    __warmUpLock = threading.Lock()
+
+
+
+    def __init__(
+        self,
+        backend:str = "okt",
+        workers:int = 0,
+        cache:NounCache = None
+    ):
+        """
+        backend : 형태소 분석기. "okt" 또는 "kiwi"
+        workers : NounsBatch 작업 프로세스 수. 0이면 현재 프로세스에서 분석.
+        cache : 명사 추출 결과 캐시. None이면 매번 분석.
+        """
+        if backend not in NounAnalyzer.BACKENDS:
+            raise ValueError(f"backend는 {NounAnalyzer.BACKENDS} 중 하나 : {backend}")
+        self.__backend = backend
+        self.__workers = workers
+        self.__cache = cache
+        self.__pool = None
+        self.__poolLock = threading.Lock()
+
+
+
+    @classmethod
+    def __Get(cls, backend:str):
+        """
+        현재 프로세스의 분석기. 없으면 생성.
+
+        반환 : Okt 또는 Kiwi
+        """
+        analyzer = cls.__analyzers.get(backend)
+        if analyzer != None:
+            return analyzer
+
+        # 여러 스레드가 동시에 호출해도 한 번만 생성
+        with cls.__lock:
+            if backend not in cls.__analyzers:
+                startTime = time.perf_counter()
+                if backend == "okt":
+                    from konlpy.tag import Okt
+                    cls.__analyzers[backend] = Okt()
+                else:
+                    from kiwipiepy import Kiwi
+                    cls.__analyzers[backend] = Kiwi()
+                cls.__loadSeconds[backend] = time.perf_counter() - startTime
+            return cls.__analyzers[backend]
+
+
+
+    @classmethod
+    def WarmUp(cls, backend:str = "okt") -> threading.Thread:
+        """
+        백그라운드 스레드에서 분석기를 생성하고 예시 문장을 한 번 분석.
+        Okt는 JVM 시작과 첫 분석이 느리므로 앱 시작 시 호출.
+        이미 시작했으면 기존 스레드 반환. 생성 도중 분석을 요청하면 생성이 끝날 때까지 대기.
+
+        반환 : 미리 생성 스레드. join으로 완료 대기 가능.
+
+        backend : 형태소 분석기. "okt" 또는 "kiwi"
+        """
+        if backend not in cls.BACKENDS:
+            raise ValueError(f"backend는 {cls.BACKENDS} 중 하나 : {backend}")
+
+        with cls.__warmUpLock:
+            thread = cls.__warmUps.get(backend)
+            if thread == None:
+                thread = threading.Thread(
+                    target = cls.NounsChunk,
+                    args = (backend, [cls.__WARM_UP_SENTENCE]),
+                    name = f"NounAnalyzer-WarmUp-{backend}",
+                    daemon = True
+                )
+                thread.start()
+                cls.__warmUps[backend] = thread
+            return thread
+
+
+
+    @classmethod
+    def GetLoadStats(cls) -> dict:
+        """
+        현재 프로세스에서 분석기 생성에 걸린 시간
+
+        반환 : dict(분석기 : 초). 생성하지 않은 분석기는 없음.
+        """
+        return dict(cls.__loadSeconds)
+
+
+
+    @staticmethod
+    def NounsChunk(
+        backend:str,
+        texts:list[str]
+    ) -> list[list[str]]:
+        """
+        여러 글에서 명사 추출. 작업 프로세스에서도 호출할 수 있도록 정적 메서드로 구현.
+
+        반환 : 글별 명사 리스트
+
+        backend : 형태소 분석기. "okt" 또는 "kiwi"
+        texts : 대상 글 리스트
+        """
+        analyzer = NounAnalyzer.__Get(backend)
+
+        # Okt는 글 하나씩 분석
+        if backend == "okt":
+            return [analyzer.nouns(text) for text in texts]
+
+        # Kiwi는 여러 글을 한 번에 분석
+        return [
+            [token.form for token in tokens if token.tag in NounAnalyzer.__KIWI_NOUN_TAGS]
+            for tokens in analyzer.tokenize(texts)
+        ]
+
+
+
+    def Version(self) -> str:
+        """
+        분석기 버전. 분석기 패키지가 바뀌면 캐시를 새로 쌓기 위한 용도.
+
+        반환 : "분석기-패키지 버전" 문자열
+        """
+        version = NounAnalyzer.__versions.get(self.__backend)
+        if version != None:
+            return version
+        try:
+            version = importlib.metadata.version(NounAnalyzer.__PACKAGES[self.__backend])
+        except importlib.metadata.PackageNotFoundError:
+            version = "unknown"
+        version = f"{self.__backend}-{version}"
+        NounAnalyzer.__versions[self.__backend] = version
+        return version
+
+
+
+    def __Analyze(
+        self,
+        texts:list[str],
+        chunkSize:int,
+        progress:callable,
+        done:int,
+        total:int
+    ) -> list[list[str]]:
+        """
+        캐시 없이 명사 추출. 글 순서대로 반환.
+
+        반환 : 글별 명사 리스트
+        """
+        chunks = [texts[i : i + chunkSize] for i in range(0, len(texts), chunkSize)]
+
+        # 현재 프로세스에서 분석
+        if self.__workers <= 1 or len(chunks) <= 1:
+            results = (NounAnalyzer.NounsChunk(self.__backend, chunk) for chunk in chunks)
+
+        # 작업 프로세스에서 분석. 분석기 생성 비용이 크므로 작업 프로세스 재사용.
+        else:
+            with self.__poolLock:
+                if self.__pool == None:
+                    self.__pool = ProcessPoolExecutor(max_workers = self.__workers)
+                pool = self.__pool
+            results = pool.map(NounAnalyzer.NounsChunk, [self.__backend] * len(chunks), chunks)
+
+        # 글 순서대로 병합
+        result = []
+        for nouns in results:
+            result += nouns
+            if progress != None:
+                progress(done + len(result), total)
+        return result
+
+
+
+    def Nouns(self, text:str) -> list[str]:
+        """
+        글 하나에서 명사 추출. 현재 프로세스에서 분석.
+
+        반환 : 명사 리스트
+
+        text : 대상 글
+        """
+        return self.NounsBatch([text])[0]
+
+
+
+    def NounsBatch(
+        self,
+        texts:list[str],
+        chunkSize:int = 64,
+        progress:callable = None
+    ) -> list[list[str]]:
+        """
+        여러 글에서 명사 추출. 글 순서대로 반환.
+        캐시가 있으면 이미 분석한 글은 캐시에서 가져오고 나머지만 분석.
+        작업 프로세스는 처음 호출할 때 생성하고 Close 전까지 재사용.
+
+        반환 : 글별 명사 리스트
+
+        texts : 대상 글 리스트
+        chunkSize : 작업 프로세스에 한 번에 전달할 글 수
+        progress : 묶음이 끝날 때마다 호출할 함수. progress(끝난 글 수, 전체 글 수)
+        """
+        texts = list(texts)
+        if self.__cache == None:
+            return self.__Analyze(texts, chunkSize, progress, 0, len(texts))
+
+        # 캐시에서 조회
+        version = self.Version()
+        result = self.__cache.GetMany(version, texts)
+        missing = [i for i, nouns in enumerate(result) if nouns == None]
+        if progress != None and len(missing) < len(texts):
+            progress(len(texts) - len(missing), len(texts))
+
+        # 나머지만 분석해서 저장
+        if len(missing) > 0:
+            targets = [texts[i] for i in missing]
+            analyzed = self.__Analyze(targets, chunkSize, progress, len(texts) - len(missing), len(texts))
+            self.__cache.PutMany(version, targets, analyzed)
+            for i, nouns in zip(missing, analyzed):
+                result[i] = nouns
+        return result
+
+
+
+    def Close(self):
+        """
+        작업 프로세스 종료
+        """
+        with self.__poolLock:
+            pool = self.__pool
+            self.__pool = None
+        if pool != None:
+            pool.shutdown()
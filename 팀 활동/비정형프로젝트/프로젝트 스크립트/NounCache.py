@@ -0,0 +1,255 @@
+import threading
+import hashlib
+import sqlite3
+import json
+import time
+import os
+
+class NounCache:
+    """
+    디스크 명사 추출 결과 캐시. 같은 컴퓨터의 모든 프로세스가 공유.
+    글 내용 해시와 분석기 버전을 키로 명사 리스트를 SQLite 파일 하나에 저장.
+
+    GetMany : 저장된 명사 리스트 조회
+    PutMany : 명사 리스트 저장
+    GetStats : 캐시 적중 통계
+    Clear : 캐시 비우기
+    """
+    # 한 번에 조회할 최대 키 수
+    __QUERY_SIZE = 500
+
+
+
+    def __init__(
+        self,
+        cachePath:str = None,
+        maxBytes:int = 256 * 1024 * 1024
+    ):
+        """
+        cachePath : 캐시 파일 경로. None이면 사용자 폴더의 .cache/FashionTrendCrawling/nouns.sqlite
+        maxBytes : 캐시 최대 크기 (byte). 넘으면 오래 안 쓴 결과부터 삭제.
+        """
+        if cachePath == None:
+            cachePath = os.path.join(os.path.expanduser("~"), ".cache", "FashionTrendCrawling", "nouns.sqlite")
+        os.makedirs(os.path.dirname(os.path.abspath(cachePath)), exist_ok = True)
+        self.__cachePath = cachePath
+        self.__maxBytes = maxBytes
+
+        # 스레드별 DB 연결
+        self.__local = threading.local()
+        self.__Connect().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS nouns (
+                digest TEXT NOT NULL,
+                version TEXT NOT NULL,
+                nouns TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (digest, version)
+            );
+            CREATE INDEX IF NOT EXISTS nouns_accessed ON nouns (accessed_at);
+            """
+        )
+
+        # 전체 크기를 매번 합산하지 않도록 저장, 삭제할 때마다 트리거로 누적. 여러 프로세스가 같은 값을 사용.
+        self.__Connect().executescript(
+            """
+            BEGIN IMMEDIATE;
+            CREATE TABLE IF NOT EXISTS nouns_size (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO nouns_size SELECT 1, COALESCE(SUM(size), 0) FROM nouns;
+            CREATE TRIGGER IF NOT EXISTS nouns_size_insert AFTER INSERT ON nouns BEGIN
+                UPDATE nouns_size SET total = total + NEW.size WHERE id = 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS nouns_size_delete AFTER DELETE ON nouns BEGIN
+                UPDATE nouns_size SET total = total - OLD.size WHERE id = 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS nouns_size_update AFTER UPDATE OF size ON nouns BEGIN
+                UPDATE nouns_size SET total = total + NEW.size - OLD.size WHERE id = 1;
+            END;
+            COMMIT;
+            """
+        )
+
+        # 통계
+        self.__lock = threading.Lock()
+        self.__stats = {
+            "hits": 0,
+            "misses": 0,
+            "stored": 0,
+            "evicted": 0
+        }
+
+
+
+    def __Connect(self) -> sqlite3.Connection:
+        """
+        현재 스레드의 DB 연결. 없으면 생성.
+
+        반환 : sqlite3.Connection
+        """
+        connection = getattr(self.__local, "connection", None)
+        if connection == None:
+            connection = sqlite3.connect(
+                self.__cachePath,
+                timeout = 30.0,
+                isolation_level = None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+
+            # INSERT OR REPLACE로 지워지는 결과도 삭제 트리거로 크기에서 빼도록 설정
+            connection.execute("PRAGMA recursive_triggers=ON")
+            self.__local.connection = connection
+        return connection
+
+
+
+    def __Count(
+        self,
+        name:str,
+        count:int
+    ):
+        """
+        통계 증가
+        """
+        with self.__lock:
+            self.__stats[name] += count
+
+
+
+    def __Digest(text:str) -> str:
+        """
+        글 내용 해시
+
+        반환 : sha256 16진수 문자열
+        """
+        return hashlib.sha256(text.encode("utf-8", errors = "surrogatepass")).hexdigest()
+
+
+
+    def __Evict(self):
+        """
+        최대 크기를 넘으면 오래 안 쓴 결과부터 삭제
+        """
+        connection = self.__Connect()
+        total = connection.execute("SELECT total FROM nouns_size WHERE id = 1").fetchone()[0]
+        if total <= self.__maxBytes:
+            return
+
+        # 최대 크기의 90%까지 삭제
+        rows = connection.execute("SELECT rowid, size FROM nouns ORDER BY accessed_at").fetchall()
+        removed = []
+        for rowid, size in rows:
+            if total <= self.__maxBytes * 0.9:
+                break
+            removed.append((rowid,))
+            total -= size
+        connection.executemany("DELETE FROM nouns WHERE rowid = ?", removed)
+        self.__Count("evicted", len(removed))
+
+
+
+    def GetMany(
+        self,
+        version:str,
+        texts:list[str]
+    ) -> list[list[str]]:
+        """
+        저장된 명사 리스트 조회. 찾은 결과는 최근 사용으로 기록.
+
+        반환 : 글 순서대로 명사 리스트. 저장되지 않은 글은 None.
+
+        version : 분석기 버전
+        texts : 대상 글 리스트
+        """
+        digests = [NounCache.__Digest(text) for text in texts]
+        found = {}
+
+        # 나눠서 조회
+        connection = self.__Connect()
+        unique = list(set(digests))
+        for i in range(0, len(unique), NounCache.__QUERY_SIZE):
+            keys = unique[i : i + NounCache.__QUERY_SIZE]
+            placeholders = ", ".join("?" * len(keys))
+            rows = connection.execute(
+                f"SELECT digest, nouns FROM nouns WHERE version = ? AND digest IN ({placeholders})",
+                [version] + keys
+            ).fetchall()
+            for digest, nouns in rows:
+                found[digest] = nouns
+
+        # 최근 사용 기록
+        if len(found) > 0:
+            now = time.time()
+            connection.executemany(
+                "UPDATE nouns SET accessed_at = ? WHERE digest = ? AND version = ?",
+                [(now, digest, version) for digest in found]
+            )
+
+        result = [json.loads(found[digest]) if digest in found else None for digest in digests]
+        hits = sum(nouns != None for nouns in result)
+        self.__Count("hits", hits)
+        self.__Count("misses", len(result) - hits)
+        return result
+
+
+
+    def PutMany(
+        self,
+        version:str,
+        texts:list[str],
+        nouns:list[list[str]]
+    ):
+        """
+        명사 리스트 저장
+
+        version : 분석기 버전
+        texts : 대상 글 리스트
+        nouns : 글 순서대로 명사 리스트
+        """
+        now = time.time()
+        rows = []
+        for text, words in zip(texts, nouns):
+            data = json.dumps(words, ensure_ascii = False)
+            rows.append((NounCache.__Digest(text), version, data, len(data.encode("utf-8")), now))
+        if len(rows) == 0:
+            return
+
+        # 한 트랜잭션으로 저장
+        connection = self.__Connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany("INSERT OR REPLACE INTO nouns VALUES (?, ?, ?, ?, ?)", rows)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        self.__Count("stored", len(rows))
+        self.__Evict()
+
+
+
+    def GetStats(self) -> dict:
+        """
+        캐시 적중 통계. 현재 프로세스 기준.
+
+        반환 : dict(hits, misses, stored, evicted, hit_rate, entries, bytes)
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / total if total > 0 else 0.0
+        stats["entries"], stats["bytes"] = self.__Connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM nouns"
+        ).fetchone()
+        return stats
+
+
+
+    def Clear(self):
+        """
+        캐시 비우기
+        """
+        self.__Connect().execute("DELETE FROM nouns")
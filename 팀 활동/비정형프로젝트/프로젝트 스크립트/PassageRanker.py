@@ -0,0 +1,144 @@
+from collections import Counter
+import math
+import re
+
+class PassageRanker:
+    """
+    BM25 문단 선택기. 블로그 본문을 문단으로 나누고 질문과 관련 있는 문단만 토큰 예산 안에서 선택.
+    한국어는 띄어쓰기 단위가 길어서 단어마다 글자 2개씩 묶어서 비교.
+
+    CountTokens : 토큰 수 추정
+    Select : 질문과 관련 있는 문단 선택
+    """
+    # 문단 나누기
+    __WORDS = re.compile(r'\S+')
+    __ASCII = re.compile(r'[\x00-\x7f]')
+
+    # BM25 매개변수
+    __K1 = 1.5
+    __B = 0.75
+
+
+
+    def __init__(
+        self,
+        passageWords:int = 60,
+        maxPerText:int = 2
+    ):
+        """
+        passageWords : 문단 하나의 단어 수
+        maxPerText : 글 하나에서 선택할 최대 문단 수. 여러 글이 고르게 선택되도록 제한.
+        """
+        self.__passageWords = passageWords
+        self.__maxPerText = maxPerText
+
+
+
+    @staticmethod
+    def CountTokens(text:str) -> int:
+        """
+        토큰 수 추정. 토크나이저 없이 계산하므로 실제보다 조금 많게 추정.
+        영문, 숫자, 기호는 4글자당 1토큰, 한글 등 나머지 글자는 글자당 1토큰.
+
+        반환 : 추정 토큰 수
+
+        text : 대상 글
+        """
+        asciiCount = len(PassageRanker.__ASCII.findall(text))
+        return math.ceil(asciiCount / 4) + (len(text) - asciiCount)
+
+
+
+    def __Terms(text:str) -> list[str]:
+        """
+        비교할 단위로 분리. 한 글자 단어는 그대로, 나머지는 글자 2개씩.
+
+        반환 : 단위 리스트
+        """
+        terms = []
+        for word in PassageRanker.__WORDS.findall(text.lower()):
+            if len(word) == 1:
+                terms.append(word)
+            else:
+                terms += [word[i : i + 2] for i in range(len(word) - 1)]
+        return terms
+
+
+
+    def __Split(self, text:str) -> list[str]:
+        """
+        글을 문단으로 분리
+
+        반환 : 문단 리스트
+        """
+        words = PassageRanker.__WORDS.findall(text)
+        return [
+            " ".join(words[i : i + self.__passageWords])
+            for i in range(0, len(words), self.__passageWords)
+        ]
+
+
+
+    def Select(
+        self,
+        query:str,
+        texts:list[str],
+        tokenBudget:int = 1500
+    ) -> list[tuple[int, str, float]]:
+        """
+        질문과 관련 있는 문단을 점수 순서대로 토큰 예산 안에서 선택
+
+        반환 : (글 인덱스, 문단, 점수) 리스트. 점수 내림차순.
+
+        query : 질문
+        texts : 대상 글 리스트. 결측치는 건너뜀.
+        tokenBudget : 선택한 문단의 추정 토큰 수 합의 최대값
+        """
+        # 문단 나누기
+        passages = []
+        for i, text in enumerate(texts):
+            if not isinstance(text, str):
+                continue
+            for passage in self.__Split(text):
+                passages.append((i, passage, Counter(PassageRanker.__Terms(passage))))
+        if len(passages) == 0:
+            return []
+
+        # 문서 빈도
+        documentFrequency = Counter()
+        for _, _, terms in passages:
+            documentFrequency.update(terms.keys())
+        averageLength = sum(sum(terms.values()) for _, _, terms in passages) / len(passages)
+
+        # BM25 점수
+        queryTerms = set(PassageRanker.__Terms(query))
+        scored = []
+        for i, passage, terms in passages:
+            length = sum(terms.values())
+            score = 0.0
+            for term in queryTerms:
+                frequency = terms.get(term, 0)
+                if frequency == 0:
+                    continue
+                idf = math.log(1 + (len(passages) - documentFrequency[term] + 0.5) / (documentFrequency[term] + 0.5))
+                score += idf * frequency * (PassageRanker.__K1 + 1) / (
+                    frequency + PassageRanker.__K1 * (1 - PassageRanker.__B + PassageRanker.__B * length / averageLength)
+                )
+            if score > 0:
+                scored.append((i, passage, score))
+
+        # 점수 순서대로 예산 안에서 선택
+        scored.sort(key = lambda item : -item[2])
+        selected = []
+        perText = Counter()
+        used = 0
+        for i, passage, score in scored:
+            if perText[i] >= self.__maxPerText:
+                continue
+            tokens = PassageRanker.CountTokens(passage)
+            if used + tokens > tokenBudget:
+                continue
+            selected.append((i, passage, score))
+            perText[i] += 1
+            used += tokens
+        return selected
@@ -0,0 +1,98 @@
+import pyarrow.parquet as pq
+import pyarrow as pa
+import pandas as pd
+import threading
+
+class RecordSink:
+    """
+    페이지 결과를 끝나는 대로 쌓아두는 저장소.
+    결과는 Arrow 테이블로 보관하고, 필요할 때만 DataFrame으로 변환.
+
+    Append : 페이지 결과 추가
+    Count : 지금까지 추가된 페이지 수, 행 수
+    ToDataFrame : 지금까지 추가된 결과를 페이지 순서대로 DataFrame으로 변환
+    Close : Parquet 파일 저장 마무리
+    """
+    def __init__(
+        self,
+        columns:list[str],
+        path:str = None
+    ):
+        """
+        columns : 저장할 컬럼 이름 리스트. 모두 문자열 컬럼.
+        path : Parquet 파일 경로. 지정하면 페이지마다 row group으로 기록. 파일에는 끝난 순서대로 기록됨.
+        """
+        self.__schema = pa.schema([(column, pa.string()) for column in columns])
+        self.__tables = []
+        self.__rows = 0
+        self.__lock = threading.Lock()
+
+        # Parquet 파일
+        self.__writer = None if path == None else pq.ParquetWriter(path, self.__schema)
+
+
+
+    def Append(
+        self,
+        page:int,
+        data:pd.DataFrame
+    ):
+        """
+        페이지 결과 추가. 여러 스레드에서 동시에 호출해도 됨.
+        비었거나 None인 결과는 ToDataFrame처럼 결측치 한 행으로 기록.
+
+        page : 페이지 순서. ToDataFrame에서 이 순서대로 정렬.
+        data : 페이지 결과 DataFrame
+        """
+        # 결측치 한 행
+        if data is None or data.empty:
+            table = pa.Table.from_pylist([{}], schema = self.__schema)
+
+        # 없는 컬럼은 결측치로 채워서 변환
+        else:
+            data = data.reindex(columns = self.__schema.names)
+            table = pa.Table.from_pandas(data, schema = self.__schema, preserve_index = False)
+
+        with self.__lock:
+            self.__tables.append((page, table))
+            self.__rows += table.num_rows
+            if self.__writer != None:
+                self.__writer.write_table(table)
+
+
+
+    def Count(self) -> tuple[int, int]:
+        """
+        지금까지 추가된 결과 수
+
+        반환 : (페이지 수, 행 수)
+        """
+        with self.__lock:
+            return (len(self.__tables), self.__rows)
+
+
+
+    def ToDataFrame(self) -> pd.DataFrame:
+        """
+        지금까지 추가된 결과를 페이지 순서대로 DataFrame으로 변환.
+        크롤링 도중에도 호출할 수 있음.
+
+        반환 : 문자열 컬럼 DataFrame
+        """
+        with self.__lock:
+            tables = sorted(self.__tables, key = lambda item : item[0])
+
+        # 변환
+        table = pa.concat_tables([table for _, table in tables]) if len(tables) > 0 else self.__schema.empty_table()
+        return table.to_pandas(types_mapper = {pa.string() : pd.StringDtype()}.get)
+
+
+
+    def Close(self):
+        """
+        Parquet 파일 저장 마무리. 이후에도 ToDataFrame은 사용 가능.
+        """
+        with self.__lock:
+            if self.__writer != None:
+                self.__writer.close()
+                self.__writer = None
@@ -0,0 +1,337 @@
+import requests
+import threading
+import hashlib
+import sqlite3
+import time
+import os
+
+class ResponseCache:
+    """
+    디스크 HTTP 응답 캐시. 같은 컴퓨터의 모든 프로세스가 공유.
+    본문은 내용 해시 이름의 파일로 저장하고, 목록은 SQLite로 관리.
+
+    Fetch : 캐시를 거쳐 웹 페이지 요청
+    GetStats : 캐시 적중 통계
+    Clear : 캐시 비우기
+    """
+    def __init__(
+        self,
+        cacheDir:str = None,
+        ttl:float = 86400.0,
+        maxBytes:int = 512 * 1024 * 1024
+    ):
+        """
+        cacheDir : 캐시 폴더. None이면 사용자 폴더의 .cache/FashionTrendCrawling
+        ttl : 저장한 응답을 다시 확인하지 않고 쓰는 시간 (초)
+        maxBytes : 캐시 최대 크기 (byte). 넘으면 오래 안 쓴 응답부터 삭제.
+        """
+        if cacheDir == None:
+            cacheDir = os.path.join(os.path.expanduser("~"), ".cache", "FashionTrendCrawling")
+        self.__cacheDir = cacheDir
+        self.__bodyDir = os.path.join(cacheDir, "bodies")
+        self.__ttl = ttl
+        self.__maxBytes = maxBytes
+        os.makedirs(self.__bodyDir, exist_ok = True)
+
+        # 스레드별 DB 연결
+        self.__local = threading.local()
+        self.__Connect().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                encoding TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+            CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+            """
+        )
+
+        # 전체 크기를 매번 합산하지 않도록 저장, 삭제할 때마다 트리거로 누적. 여러 프로세스가 같은 값을 사용.
+        self.__Connect().executescript(
+            """
+            BEGIN IMMEDIATE;
+            CREATE TABLE IF NOT EXISTS entries_size (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO entries_size SELECT 1, COALESCE(SUM(size), 0) FROM entries;
+            CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN
+                UPDATE entries_size SET total = total + NEW.size WHERE id = 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN
+                UPDATE entries_size SET total = total - OLD.size WHERE id = 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries BEGIN
+                UPDATE entries_size SET total = total + NEW.size - OLD.size WHERE id = 1;
+            END;
+            COMMIT;
+            """
+        )
+
+        # 통계
+        self.__lock = threading.Lock()
+        self.__stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stored": 0,
+            "evicted": 0
+        }
+
+
+
+    def __Connect(self) -> sqlite3.Connection:
+        """
+        현재 스레드의 DB 연결. 없으면 생성.
+
+        반환 : sqlite3.Connection
+        """
+        connection = getattr(self.__local, "connection", None)
+        if connection == None:
+            connection = sqlite3.connect(
+                os.path.join(self.__cacheDir, "index.sqlite"),
+                timeout = 30.0,
+                isolation_level = None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+
+            # INSERT OR REPLACE로 지워지는 응답도 삭제 트리거로 크기에서 빼도록 설정
+            connection.execute("PRAGMA recursive_triggers=ON")
+            self.__local.connection = connection
+        return connection
+
+
+
+    def __Count(self, name:str):
+        """
+        통계 증가
+        """
+        with self.__lock:
+            self.__stats[name] += 1
+
+
+
+    def __BodyPath(self, digest:str) -> str:
+        """
+        본문 파일 경로
+
+        반환 : 경로
+        """
+        return os.path.join(self.__bodyDir, digest[:2], digest)
+
+
+
+    def __ReadBody(
+        self,
+        entry:tuple
+    ) -> str:
+        """
+        저장한 본문 읽기
+
+        반환 : 문자열, 파일이 없으면 None
+        """
+        digest, encoding = entry[0], entry[2]
+        try:
+            with open(self.__BodyPath(digest), "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        return content.decode(encoding or "utf-8", errors = "replace")
+
+
+
+    def __Store(
+        self,
+        url:str,
+        res:requests.Response
+    ):
+        """
+        응답 저장. 같은 내용은 파일 하나만 저장.
+        """
+        content = res.content
+        digest = hashlib.sha256(content).hexdigest()
+
+        # 본문 파일과 목록은 한 트랜잭션에서 저장. 다른 프로세스가 삭제 중인 본문 파일을 가리키는 응답이 생기지 않도록 함.
+        path = self.__BodyPath(digest)
+        now = time.time()
+        connection = self.__Connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # 본문 파일. 다른 프로세스와 겹치지 않도록 임시 파일에 쓰고 이름 변경.
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok = True)
+                temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp, "wb") as f:
+                    f.write(content)
+                os.replace(temp, path)
+
+            # 목록 갱신
+            connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    digest,
+                    res.status_code,
+                    res.encoding or res.apparent_encoding,
+                    res.headers.get("ETag"),
+                    res.headers.get("Last-Modified"),
+                    len(content),
+                    now,
+                    now
+                )
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        self.__Count("stored")
+        self.__Evict()
+
+
+
+    def __Evict(self):
+        """
+        최대 크기를 넘으면 오래 안 쓴 응답부터 삭제.
+        응답 삭제, 본문 파일 사용 여부 확인, 파일 삭제는 한 트랜잭션에서 진행해서 다른 프로세스의 저장과 겹치지 않게 함.
+        """
+        connection = self.__Connect()
+        if connection.execute("SELECT total FROM entries_size WHERE id = 1").fetchone()[0] <= self.__maxBytes:
+            return
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # 다른 프로세스가 먼저 삭제했을 수 있으므로 다시 확인
+            total = connection.execute("SELECT total FROM entries_size WHERE id = 1").fetchone()[0]
+            if total <= self.__maxBytes:
+                connection.execute("COMMIT")
+                return
+
+            # 최대 크기의 90%까지 삭제
+            evicted = 0
+            rows = connection.execute("SELECT url, digest, size FROM entries ORDER BY accessed_at").fetchall()
+            for url, digest, size in rows:
+                if total <= self.__maxBytes * 0.9:
+                    break
+                connection.execute("DELETE FROM entries WHERE url = ?", (url,))
+                total -= size
+                evicted += 1
+
+                # 다른 주소가 같은 본문을 쓰지 않으면 파일 삭제
+                if connection.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone() == None:
+                    try:
+                        os.remove(self.__BodyPath(digest))
+                    except OSError:
+                        pass
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        with self.__lock:
+            self.__stats["evicted"] += evicted
+
+
+
+    def Fetch(
+        self,
+        session:requests.Session,
+        url:str,
+        timeout:float = None
+    ) -> tuple[int, str]:
+        """
+        캐시를 거쳐 웹 페이지 요청.
+        ttl이 지나지 않은 응답은 그대로 쓰고, 지난 응답은 ETag/Last-Modified로 변경 여부만 확인.
+
+        반환 : (상태 코드, html 문자열)
+
+        session : 요청에 사용할 세션
+        url : 웹 페이지 주소
+        timeout : 요청 제한 시간 (초)
+        """
+        connection = self.__Connect()
+        entry = connection.execute(
+            "SELECT digest, status, encoding, etag, last_modified, stored_at FROM entries WHERE url = ?",
+            (url,)
+        ).fetchone()
+        now = time.time()
+
+        # 저장된 응답이 있을 때
+        headers = {}
+        if entry != None:
+            # 유효 기간 안이면 그대로 사용
+            if now - entry[5] < self.__ttl:
+                text = self.__ReadBody(entry)
+                if text != None:
+                    connection.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (now, url))
+                    self.__Count("hits")
+                    return (entry[1], text)
+
+            # 유효 기간이 지났으면 변경 여부 확인
+            if entry[3] != None:
+                headers["If-None-Match"] = entry[3]
+            if entry[4] != None:
+                headers["If-Modified-Since"] = entry[4]
+
+        # 페이지 요청
+        res = session.get(url, headers = headers, timeout = timeout)
+
+        # 변경되지 않았으면 저장된 응답 사용
+        if res.status_code == 304 and entry != None:
+            text = self.__ReadBody(entry)
+            if text != None:
+                connection.execute("UPDATE entries SET stored_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+                self.__Count("revalidated")
+                return (entry[1], text)
+            # 본문 파일이 없어졌으면 다시 요청
+            res = session.get(url, timeout = timeout)
+
+        # 새 응답 저장
+        self.__Count("misses")
+        if res.status_code == 200:
+            self.__Store(url, res)
+        return (res.status_code, res.text)
+
+
+
+    def GetStats(self) -> dict:
+        """
+        캐시 적중 통계. 현재 프로세스 기준.
+
+        반환 : dict(hits, misses, revalidated, stored, evicted, hit_rate, entries, bytes)
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+        total = stats["hits"] + stats["misses"] + stats["revalidated"]
+        stats["hit_rate"] = (stats["hits"] + stats["revalidated"]) / total if total > 0 else 0.0
+        connection = self.__Connect()
+        stats["entries"] = connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        stats["bytes"] = connection.execute("SELECT total FROM entries_size WHERE id = 1").fetchone()[0]
+        return stats
+
+
+
+    def Clear(self):
+        """
+        캐시 비우기. 다른 프로세스의 저장과 겹치지 않도록 한 트랜잭션에서 삭제.
+        """
+        connection = self.__Connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            digests = [row[0] for row in connection.execute("SELECT DISTINCT digest FROM entries").fetchall()]
+            connection.execute("DELETE FROM entries")
+            for digest in digests:
+                try:
+                    os.remove(self.__BodyPath(digest))
+                except OSError:
+                    pass
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
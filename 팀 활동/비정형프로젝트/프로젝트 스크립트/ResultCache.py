@@ -0,0 +1,288 @@
+import threading
+import pickle
+import time
+import os
+
+class ResultCache:
+    """
+    분석 결과 캐시. 유효 기간이 지난 결과도 바로 반환하고 백그라운드에서 새로 계산 (stale-while-revalidate).
+    같은 키의 계산은 한 번만 실행하고, 계산 함수는 한 번에 하나씩만 실행.
+
+    Get : 결과 조회. 없으면 계산.
+    Peek : 계산 없이 저장된 결과와 저장 시각 조회
+    Put : 밖에서 계산한 결과 저장
+    Refresh : 백그라운드에서 새로 계산
+    StartScheduler : 주기적으로 모든 키를 미리 계산
+    StopScheduler : 주기적 계산 중지
+    GetStats : 캐시 적중 통계
+    """
+    def __init__(
+        self,
+        compute:callable,
+        ttl:float = 3600.0,
+        cachePath:str = None
+    ):
+        """
+        compute : 키를 받아서 결과를 반환하는 함수. 스레드 하나에서만 호출됨.
+        ttl : 결과를 새것으로 보는 시간 (초). 지나면 반환은 하되 새로 계산.
+        cachePath : 결과를 저장할 파일 경로. 지정하면 재시작해도 저장된 결과를 바로 사용.
+        """
+        self.__compute = compute
+        self.__ttl = ttl
+        self.__cachePath = cachePath
+
+        # 키별 (결과, 저장 시각)
+        self.__entries = {}
+        self.__lock = threading.Lock()
+
+        # 계산 중인 키별 완료 이벤트, 계산 함수 실행 잠금
+        self.__inflight = {}
+        self.__computeLock = threading.Lock()
+
+        # 주기적 계산
+        self.__scheduler = None
+        self.__stop = threading.Event()
+
+        # 통계
+        self.__stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "errors": 0,
+            "compute_seconds": 0.0
+        }
+
+        # 저장된 결과 불러오기
+        if cachePath != None and os.path.exists(cachePath):
+            try:
+                with open(cachePath, "rb") as f:
+                    self.__entries = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError) as e:
+                print(f"결과 캐시를 불러올 수 없습니다 : {cachePath}\n{e}")
+
+
+
+    def __Count(
+        self,
+        name:str,
+        value = 1
+    ):
+        """
+        통계 증가
+        """
+        with self.__lock:
+            self.__stats[name] += value
+
+
+
+    def __Save(self):
+        """
+        결과를 파일에 저장. 임시 파일에 쓰고 이름 변경.
+        """
+        if self.__cachePath == None:
+            return
+        with self.__lock:
+            entries = dict(self.__entries)
+        temp = f"{self.__cachePath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp, "wb") as f:
+                pickle.dump(entries, f)
+            os.replace(temp, self.__cachePath)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"결과 캐시를 저장할 수 없습니다 : {self.__cachePath}\n{e}")
+
+
+
+    def __Compute(self, key):
+        """
+        키의 결과 계산. 같은 키를 이미 계산 중이면 끝날 때까지 대기.
+
+        반환 : 결과
+
+        예외 : 계산 함수의 예외
+        """
+        # 같은 키는 한 번만 계산
+        with self.__lock:
+            event = self.__inflight.get(key)
+            owner = event == None
+            if owner:
+                event = threading.Event()
+                self.__inflight[key] = event
+        if not owner:
+            event.wait()
+            with self.__lock:
+                entry = self.__entries.get(key)
+            if entry == None:
+                raise RuntimeError(f"결과 계산 실패 : {key}")
+            return entry[0]
+
+        # 계산 함수는 한 번에 하나씩
+        try:
+            with self.__computeLock:
+                startTime = time.perf_counter()
+                try:
+                    value = self.__compute(key)
+                except Exception:
+                    self.__Count("errors")
+                    raise
+                self.__Count("compute_seconds", time.perf_counter() - startTime)
+            with self.__lock:
+                self.__entries[key] = (value, time.time())
+            self.__Save()
+            return value
+        finally:
+            with self.__lock:
+                del self.__inflight[key]
+            event.set()
+
+
+
+    def Get(self, key):
+        """
+        결과 조회. 유효 기간이 지났으면 저장된 결과를 바로 반환하고 백그라운드에서 새로 계산.
+        저장된 결과가 없을 때만 계산이 끝날 때까지 대기.
+
+        반환 : 결과
+
+        key : 조회할 키
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+        # 없으면 계산
+        if entry == None:
+            self.__Count("misses")
+            return self.__Compute(key)
+
+        # 유효 기간이 지났으면 새로 계산
+        if time.time() - entry[1] >= self.__ttl:
+            self.__Count("stale_hits")
+            self.Refresh(key)
+        else:
+            self.__Count("hits")
+        return entry[0]
+
+
+
+    def Peek(self, key) -> tuple:
+        """
+        계산 없이 저장된 결과 조회
+
+        반환 : (결과, 저장 시각), 없으면 None
+
+        key : 조회할 키
+        """
+        with self.__lock:
+            return self.__entries.get(key)
+
+
+
+    def Put(
+        self,
+        key,
+        value
+    ):
+        """
+        밖에서 계산한 결과 저장. 예) 스트리밍으로 받은 결과.
+
+        key : 저장할 키
+        value : 결과
+        """
+        with self.__lock:
+            self.__entries[key] = (value, time.time())
+        self.__Save()
+
+
+
+    def Refresh(self, key) -> threading.Thread:
+        """
+        백그라운드에서 새로 계산. 이미 계산 중이면 새로 시작하지 않음.
+
+        반환 : 계산 스레드, 이미 계산 중이면 None
+
+        key : 계산할 키
+        """
+        with self.__lock:
+            if key in self.__inflight:
+                return None
+
+        def refresh():
+            try:
+                self.__Compute(key)
+                self.__Count("refreshes")
+            except Exception as e:
+                print(f"결과 갱신 실패 : {key}\n{e}")
+
+        thread = threading.Thread(target = refresh, name = "ResultCache-Refresh", daemon = True)
+        thread.start()
+        return thread
+
+
+
+    def StartScheduler(
+        self,
+        keys:list,
+        interval:float = 21600.0,
+        checkSeconds:float = 60.0
+    ):
+        """
+        주기적으로 모든 키를 미리 계산. 저장된 결과가 없는 키부터, 오래된 키 순서로 계산.
+        이미 실행 중이면 아무것도 하지 않음.
+
+        keys : 미리 계산할 키 리스트
+        interval : 결과를 새로 계산하는 주기 (초)
+        checkSeconds : 새로 계산할 키를 확인하는 주기 (초)
+        """
+        if self.__scheduler != None and self.__scheduler.is_alive():
+            return
+        self.__stop.clear()
+
+        def schedule():
+            while not self.__stop.is_set():
+                # 저장된 결과가 없거나 오래된 키
+                now = time.time()
+                ages = []
+                for key in keys:
+                    entry = self.Peek(key)
+                    age = float("inf") if entry == None else now - entry[1]
+                    if age >= interval:
+                        ages.append((age, key))
+
+                # 오래된 키부터 하나씩 계산
+                for _, key in sorted(ages, key = lambda item : -item[0]):
+                    if self.__stop.is_set():
+                        break
+                    try:
+                        self.__Compute(key)
+                        self.__Count("refreshes")
+                    except Exception as e:
+                        print(f"결과 갱신 실패 : {key}\n{e}")
+                self.__stop.wait(checkSeconds)
+
+        self.__scheduler = threading.Thread(target = schedule, name = "ResultCache-Scheduler", daemon = True)
+        self.__scheduler.start()
+
+
+
+    def StopScheduler(self):
+        """
+        주기적 계산 중지. 계산 중인 키는 끝날 때까지 진행.
+        """
+        self.__stop.set()
+
+
+
+    def GetStats(self) -> dict:
+        """
+        캐시 적중 통계
+
+        반환 : dict(hits, stale_hits, misses, refreshes, errors, compute_seconds, hit_rate, entries, inflight)
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats["entries"] = len(self.__entries)
+            stats["inflight"] = len(self.__inflight)
+        total = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["stale_hits"]) / total if total > 0 else 0.0
+        return stats
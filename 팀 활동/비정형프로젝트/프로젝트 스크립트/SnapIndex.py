@@ -0,0 +1,141 @@
+from collections import defaultdict
+import numpy as np
+import threading
+import json
+import os
+
+class SnapIndex:
+    """
+    스냅 태그 역색인. 태그의 글자, 글자 쌍별로 스냅 번호 목록을 만들어 두고, 키워드의 글자 쌍 목록만 교집합해서 후보를 찾음.
+    후보만 실제로 키워드가 태그에 포함되는지 확인하므로 전체 스냅을 훑지 않고도 부분 문자열 일치 결과가 같음.
+    JSON 파일의 수정 시각이 바뀌면 조회할 때 다시 읽음.
+
+    Search : 키워드가 가장 많이 포함된 스냅 조회
+    GetStats : 색인 크기와 다시 읽은 횟수
+    """
+    def __init__(self, path:str):
+        """
+        path : 스냅 JSON 파일 경로. [{"tags" : [...], "image_path" : ..., "url" : ...}, ...]
+        """
+        self.__path = path
+        self.__lock = threading.Lock()
+
+        # 색인. 파일을 다시 읽으면 통째로 교체.
+        self.__mtime = None
+        self.__items = []
+        self.__tags = []
+        self.__postings = {}
+        self.__matches = {}
+        self.__reloads = 0
+
+
+
+    def __Grams(text:str) -> set[str]:
+        """
+        글자 쌍 집합. 한 글자면 그 글자.
+        """
+        if len(text) < 2:
+            return {text}
+        return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+
+    def __Load(self):
+        """
+        파일이 바뀌었으면 다시 읽고 색인 생성
+
+        예외 : 파일을 읽을 수 없거나 JSON 형식이 아님
+        """
+        mtime = os.stat(self.__path).st_mtime_ns
+        if mtime == self.__mtime:
+            return
+        with open(self.__path, "r", encoding = "utf-8") as f:
+            items = json.load(f)
+
+        # 한 글자, 두 글자 단위 역색인. 스냅 번호 오름차순 배열.
+        tags = []
+        postings = defaultdict(list)
+        for i, item in enumerate(items):
+            tags.append(" ".join(item.get("tags", [])))
+            grams = set()
+            for tag in item.get("tags", []):
+                grams.update(tag)
+                grams.update(tag[j : j + 2] for j in range(len(tag) - 1))
+            for gram in grams:
+                postings[gram].append(i)
+
+        self.__items = items
+        self.__tags = tags
+        self.__postings = {gram : np.array(ids, dtype = np.int32) for gram, ids in postings.items()}
+        self.__matches = {}
+        self.__mtime = mtime
+        self.__reloads += 1
+
+
+
+    def __Match(self, keyword:str) -> np.ndarray:
+        """
+        태그에 키워드가 포함된 스냅 번호. 키워드별로 기억.
+
+        반환 : 스냅 번호 배열. 오름차순.
+        """
+        found = self.__matches.get(keyword)
+        if found is not None:
+            return found
+
+        # 글자 쌍 목록이 짧은 것부터 교집합
+        empty = np.zeros(0, dtype = np.int32)
+        postings = sorted((self.__postings.get(gram, empty) for gram in SnapIndex.__Grams(keyword)), key = len)
+        candidates = postings[0]
+        for posting in postings[1 : ]:
+            candidates = np.intersect1d(candidates, posting, assume_unique = True)
+            if len(candidates) == 0:
+                break
+
+        # 후보만 실제 포함 여부 확인
+        found = np.array([i for i in candidates.tolist() if keyword in self.__tags[i]], dtype = np.int32)
+        self.__matches[keyword] = found
+        return found
+
+
+
+    def Search(self, keywords:list[str]) -> tuple[int, list[dict]]:
+        """
+        키워드가 가장 많이 포함된 스냅 조회. 태그를 이어 붙인 문자열에 키워드가 포함되면 일치.
+
+        반환 : (일치한 키워드 수, 스냅 리스트). 일치하는 스냅이 없으면 (0, [])
+
+        keywords : 키워드 리스트. 공백 없는 단어.
+
+        예외 : 파일을 읽을 수 없거나 JSON 형식이 아님
+        """
+        with self.__lock:
+            self.__Load()
+            if len(keywords) == 0 or len(self.__items) == 0:
+                return (0, [])
+
+            # 스냅별 일치한 키워드 수
+            scores = np.bincount(
+                np.concatenate([self.__Match(keyword) for keyword in keywords]),
+                minlength = len(self.__items)
+            )
+            best = int(scores.max())
+            if best == 0:
+                return (0, [])
+            return (best, [self.__items[i] for i in np.flatnonzero(scores == best).tolist()])
+
+
+
+    def GetStats(self) -> dict:
+        """
+        색인 크기와 다시 읽은 횟수
+
+        반환 : dict(items, grams, cached_keywords, reloads)
+        """
+        with self.__lock:
+            return {
+                "items" : len(self.__items),
+                "grams" : len(self.__postings),
+                "cached_keywords" : len(self.__matches),
+                "reloads" : self.__reloads
+            }
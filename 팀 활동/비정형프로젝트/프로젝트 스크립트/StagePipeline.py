@@ -0,0 +1,231 @@
+import threading
+import queue
+import time
+
+class StagePipeline:
+    """
+    단계별 스트리밍 처리. 단계 사이를 크기 제한 큐로 연결하고 단계마다 작업 스레드 수를 따로 지정.
+    항목은 앞 단계가 끝나는 대로 바로 다음 단계로 넘어가므로,
+    전체 시간이 단계별 시간의 합이 아니라 가장 느린 단계에 가까워짐.
+
+    AddStage : 단계 추가
+    Run : 입력을 흘려보내고 결과를 입력 순서대로 반환
+    GetStats : 마지막 실행의 단계별 처리 통계
+    """
+    # 단계 종료 표시
+    __DONE = object()
+
+
+
+    def __init__(self, queueSize:int = 64):
+        """
+        queueSize : 단계 사이 큐의 최대 크기. 앞 단계가 너무 앞서가면 대기.
+        """
+        self.__queueSize = queueSize
+        self.__stages = []
+        self.__stats = None
+
+
+
+    def AddStage(
+        self,
+        name:str,
+        function:callable,
+        workers:int = 1,
+        batchSize:int = 1,
+        batchWait:float = 0.0
+    ) -> "StagePipeline":
+        """
+        단계 추가. 추가한 순서대로 실행.
+        함수가 예외를 던지면 오류로 기록하고 그 항목은 None으로 전달.
+        None인 항목은 함수를 호출하지 않고 그대로 다음 단계로 전달.
+        batchSize가 1보다 크면 도착한 항목을 모아서 함수를 한 번 호출. 예외가 나면 묶음 전체가 None.
+
+        반환 : 자기 자신. 이어서 AddStage 호출 가능.
+
+        name : 단계 이름
+        function : 항목 하나를 받아서 다음 단계로 넘길 값을 반환하는 함수.
+                   batchSize가 1보다 크면 항목 리스트를 받아서 같은 길이의 리스트를 반환하는 함수.
+        workers : 단계의 작업 스레드 수
+        batchSize : 한 번에 처리할 최대 항목 수
+        batchWait : 묶음을 채우기 위해 첫 항목 이후 기다릴 최대 시간 (초)
+        """
+        self.__stages.append({
+            "name" : name,
+            "function" : function,
+            "workers" : max(1, workers),
+            "batchSize" : max(1, batchSize),
+            "batchWait" : batchWait
+        })
+        return self
+
+
+
+    def __Worker(
+        self,
+        stage:dict,
+        stats:dict,
+        inbox:queue.Queue,
+        outbox:queue.Queue,
+        remaining:list[int],
+        lock:threading.Lock,
+        nextWorkers:int
+    ):
+        """
+        단계 작업 스레드. 종료 표시를 받으면 끝내고, 단계의 마지막 스레드가 다음 단계에 종료 표시 전달.
+        """
+        done = False
+        while not done:
+            item = inbox.get()
+            if item is StagePipeline.__DONE:
+                break
+
+            # 단계 앞에 쌓인 항목 수
+            waiting = inbox.qsize() + 1
+            with lock:
+                stats["maxQueue"] = max(stats["maxQueue"], waiting)
+
+            # 묶음 채우기. 종료 표시를 받으면 모은 항목까지만 처리하고 종료.
+            batch = [item]
+            deadline = time.perf_counter() + stage["batchWait"]
+            while len(batch) < stage["batchSize"]:
+                try:
+                    item = inbox.get(timeout = max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if item is StagePipeline.__DONE:
+                    done = True
+                    break
+                batch.append(item)
+
+            # 항목 처리
+            indices = [index for index, value in batch if value is not None]
+            values = [value for _, value in batch if value is not None]
+            results = {}
+            if len(values) > 0:
+                startTime = time.perf_counter()
+                try:
+                    if stage["batchSize"] > 1:
+                        results = dict(zip(indices, stage["function"](values)))
+                    else:
+                        results = {indices[0] : stage["function"](values[0])}
+                except Exception as e:
+                    results = {}
+                    with lock:
+                        stats["errors"] += len(values)
+                        stats["lastError"] = repr(e)
+                elapsed = time.perf_counter() - startTime
+                with lock:
+                    stats["items"] += len(values)
+                    stats["busySeconds"] += elapsed
+
+            # 다음 단계로 전달
+            for index, _ in batch:
+                outbox.put((index, results.get(index)))
+
+        # 단계의 마지막 스레드
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            for _ in range(nextWorkers):
+                outbox.put(StagePipeline.__DONE)
+
+
+
+    def Run(
+        self,
+        source,
+        progress:callable = None
+    ) -> list:
+        """
+        입력을 단계에 흘려보내고 마지막 단계 결과를 입력 순서대로 반환.
+        입력은 별도 스레드에서 읽으므로 생성기가 값을 만드는 동안에도 앞서 들어온 항목은 처리됨.
+
+        반환 : 결과 리스트. 입력 순서대로.
+
+        source : 입력 항목을 만드는 반복 가능 객체. 생성기 가능.
+        progress : 항목 하나가 끝날 때마다 호출할 함수. progress(완료 수, 지금까지 입력된 수)
+
+        예외 : 입력을 읽는 중 발생한 예외. 통계는 GetStats로 확인 가능.
+        """
+        lock = threading.Lock()
+        startTime = time.perf_counter()
+
+        # 단계별 큐와 통계. 마지막 큐는 결과 수집용이라 크기 제한 없음.
+        inboxes = [queue.Queue(maxsize = self.__queueSize) for _ in self.__stages] + [queue.Queue()]
+        stats = [
+            {"name" : stage["name"], "workers" : stage["workers"], "batchSize" : stage["batchSize"], "items" : 0, "errors" : 0, "lastError" : None, "busySeconds" : 0.0, "maxQueue" : 0}
+            for stage in self.__stages
+        ]
+        fed = [0]
+        sourceError = [None]
+
+        # 입력 스레드
+        def feed():
+            firstWorkers = self.__stages[0]["workers"] if len(self.__stages) > 0 else 1
+            try:
+                for value in source:
+                    inboxes[0].put((fed[0], value))
+                    with lock:
+                        fed[0] += 1
+            except Exception as e:
+                sourceError[0] = e
+            finally:
+                for _ in range(firstWorkers):
+                    inboxes[0].put(StagePipeline.__DONE)
+
+        threads = [threading.Thread(target = feed, name = "StagePipeline-source", daemon = True)]
+
+        # 단계별 작업 스레드
+        for i, stage in enumerate(self.__stages):
+            nextWorkers = self.__stages[i + 1]["workers"] if i + 1 < len(self.__stages) else 1
+            remaining = [stage["workers"]]
+            for j in range(stage["workers"]):
+                threads.append(threading.Thread(
+                    target = self.__Worker,
+                    args = (stage, stats[i], inboxes[i], inboxes[i + 1], remaining, lock, nextWorkers),
+                    name = f"StagePipeline-{stage['name']}-{j}",
+                    daemon = True
+                ))
+        for thread in threads:
+            thread.start()
+
+        # 결과 수집
+        results = {}
+        while True:
+            item = inboxes[-1].get()
+            if item is StagePipeline.__DONE:
+                break
+            results[item[0]] = item[1]
+            if progress != None:
+                with lock:
+                    total = fed[0]
+                progress(len(results), max(total, len(results)))
+        for thread in threads:
+            thread.join()
+
+        # 통계
+        self.__stats = {
+            "items" : fed[0],
+            "elapsedSeconds" : time.perf_counter() - startTime,
+            "sourceError" : repr(sourceError[0]) if sourceError[0] != None else None,
+            "stages" : stats
+        }
+
+        # 입력이 중간에 실패하면 일부 결과만으로 계속하지 않도록 예외 전달
+        if sourceError[0] != None:
+            raise sourceError[0]
+        return [results[i] for i in range(fed[0])]
+
+
+
+    def GetStats(self) -> dict:
+        """
+        마지막 실행의 처리 통계
+
+        반환 : dict(items, elapsedSeconds, sourceError, stages)
+               stages는 단계별 dict(name, workers, batchSize, items, errors, lastError, busySeconds, maxQueue)
+               maxQueue는 단계 앞 큐에 쌓였던 최대 항목 수
+        """
+        return self.__stats
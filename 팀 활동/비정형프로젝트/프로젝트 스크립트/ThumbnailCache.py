@@ -0,0 +1,254 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image, ImageOps
+import threading
+import hashlib
+import os
+
+class ThumbnailCache:
+    """
+    스냅 이미지 썸네일 캐시. 원본을 정해진 크기 안으로 줄인 WebP 또는 JPEG 파일을 만들어 두고 재사용.
+    썸네일은 원본의 전체 경로, 수정 시각, 크기로 구분하므로 이름이 같은 다른 폴더의 이미지와 겹치지 않고, 원본이 바뀌면 다시 만듦.
+    폴더 전체를 작업 프로세스로 한 번에 만들거나, 없을 때 조회하면서 만듦.
+
+    Get : 썸네일 경로 조회. 없으면 생성.
+    BuildAll : 폴더의 모든 이미지 썸네일 생성
+    MakeThumbnail : 썸네일 파일 하나 생성
+    GetStats : 생성, 적중, 용량 통계
+    """
+    # 원본 이미지 확장자
+    __EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+    # 저장 형식별 확장자
+    __FORMATS = {"WEBP" : ".webp", "JPEG" : ".jpg"}
+
+
+
+    def __init__(
+        self,
+        cacheDir:str = None,
+        size:tuple[int, int] = (480, 600),
+        format:str = "WEBP",
+        quality:int = 80,
+        workers:int = None
+    ):
+        """
+        cacheDir : 썸네일 폴더. None이면 사용자 폴더의 .cache/FashionTrendCrawling/thumbnails
+        size : 기본 썸네일 최대 (가로, 세로). 비율은 유지.
+        format : 저장 형식. "WEBP" 또는 "JPEG"
+        quality : 저장 품질 (1 ~ 100)
+        workers : BuildAll 작업 프로세스 수. None이면 CPU 수.
+        """
+        if format not in ThumbnailCache.__FORMATS:
+            raise ValueError(f"지원하지 않는 형식 : {format}")
+        if cacheDir == None:
+            cacheDir = os.path.join(os.path.expanduser("~"), ".cache", "FashionTrendCrawling", "thumbnails")
+        os.makedirs(cacheDir, exist_ok = True)
+        self.__cacheDir = cacheDir
+        self.__size = tuple(size)
+        self.__format = format
+        self.__quality = quality
+        self.__workers = workers
+
+        # 통계
+        self.__lock = threading.Lock()
+        self.__stats = {
+            "hits": 0,
+            "generated": 0,
+            "failed": 0,
+            "source_bytes": 0,
+            "thumbnail_bytes": 0
+        }
+
+
+
+    def __Count(
+        self,
+        name:str,
+        value:int = 1
+    ):
+        """
+        통계 증가
+        """
+        with self.__lock:
+            self.__stats[name] += value
+
+
+
+    def __Path(
+        self,
+        source:str,
+        size:tuple[int, int]
+    ) -> str:
+        """
+        썸네일 경로. 원본의 정규화한 전체 경로와 수정 시각의 해시, 크기로 구분. 파일 이름은 알아보기 쉽게 앞에 붙임.
+
+        반환 : 썸네일 파일 경로
+
+        예외 : 원본이 없음
+        """
+        imageId = os.path.splitext(os.path.basename(source))[0]
+        key = f"{os.path.normcase(os.path.abspath(source))}\0{os.stat(source).st_mtime_ns}"
+        digest = hashlib.sha256(key.encode("utf-8", errors = "surrogatepass")).hexdigest()[ : 16]
+        return os.path.join(
+            self.__cacheDir,
+            f"{imageId}_{digest}_{size[0]}x{size[1]}{ThumbnailCache.__FORMATS[self.__format]}"
+        )
+
+
+
+    @staticmethod
+    def MakeThumbnail(
+        source:str,
+        target:str,
+        size:tuple[int, int],
+        format:str = "WEBP",
+        quality:int = 80
+    ) -> int:
+        """
+        썸네일 파일 하나 생성. 작업 프로세스에서도 호출할 수 있도록 정적 메서드로 구현.
+        JPEG 원본은 필요한 크기에 가깝게 줄여서 읽으므로 전체 해상도로 풀지 않음.
+
+        반환 : 썸네일 크기 (byte)
+
+        source : 원본 이미지 경로
+        target : 썸네일 경로
+        size : 최대 (가로, 세로). 비율은 유지.
+        format : 저장 형식. "WEBP" 또는 "JPEG"
+        quality : 저장 품질 (1 ~ 100)
+
+        예외 : 원본을 읽거나 썸네일을 저장할 수 없음
+        """
+        with Image.open(source) as image:
+            image.draft("RGB", size)
+            image = ImageOps.exif_transpose(image)
+            image = image.convert("RGB")
+            image.thumbnail(size, Image.LANCZOS)
+
+            # 임시 파일에 쓰고 이름 변경
+            temp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                if format == "WEBP":
+                    image.save(temp, format = format, quality = quality, method = 4)
+                else:
+                    image.save(temp, format = format, quality = quality, optimize = True, progressive = True)
+                os.replace(temp, target)
+            finally:
+                if os.path.exists(temp):
+                    os.remove(temp)
+        return os.path.getsize(target)
+
+
+
+    def Get(
+        self,
+        source:str,
+        size:tuple[int, int] = None
+    ) -> str:
+        """
+        썸네일 경로 조회. 없으면 이 스레드에서 바로 생성.
+
+        반환 : 썸네일 경로, 만들 수 없으면 None
+
+        source : 원본 이미지 경로
+        size : 최대 (가로, 세로). None이면 기본 크기.
+        """
+        size = self.__size if size == None else tuple(size)
+        try:
+            target = self.__Path(source, size)
+        except OSError as e:
+            print(f"썸네일을 만들 수 없습니다 : {source}\n{e}")
+            self.__Count("failed")
+            return None
+        if os.path.exists(target):
+            self.__Count("hits")
+        else:
+            try:
+                ThumbnailCache.MakeThumbnail(source, target, size, self.__format, self.__quality)
+                self.__Count("generated")
+            except Exception as e:
+                print(f"썸네일을 만들 수 없습니다 : {source}\n{e}")
+                self.__Count("failed")
+                return None
+
+        # 전송량 비교용
+        self.__Count("source_bytes", os.path.getsize(source))
+        self.__Count("thumbnail_bytes", os.path.getsize(target))
+        return target
+
+
+
+    def BuildAll(
+        self,
+        sourceDir:str,
+        sizes:list[tuple[int, int]] = None,
+        progress:callable = None
+    ) -> dict:
+        """
+        폴더의 모든 이미지 썸네일을 작업 프로세스로 생성. 원본이 바뀌지 않아 이미 있는 썸네일은 건너뜀.
+
+        반환 : dict(images, generated, skipped, failed, source_bytes, thumbnail_bytes)
+
+        sourceDir : 원본 이미지 폴더. 예) raw_data
+        sizes : 만들 크기 리스트. None이면 기본 크기만.
+        progress : 썸네일 하나가 끝날 때마다 호출할 함수. progress(완료 수, 전체 수)
+        """
+        sizes = [self.__size] if sizes == None else [tuple(size) for size in sizes]
+        sources = sorted(
+            os.path.join(sourceDir, name)
+            for name in os.listdir(sourceDir)
+            if name.lower().endswith(ThumbnailCache.__EXTENSIONS)
+        )
+
+        # 새로 만들 썸네일
+        jobs = []
+        skipped = 0
+        for source in sources:
+            for size in sizes:
+                target = self.__Path(source, size)
+                if os.path.exists(target):
+                    skipped += 1
+                else:
+                    jobs.append((source, target, size))
+
+        result = {
+            "images" : len(sources),
+            "generated" : 0,
+            "skipped" : skipped,
+            "failed" : 0,
+            "source_bytes" : 0,
+            "thumbnail_bytes" : 0
+        }
+        if len(jobs) == 0:
+            return result
+
+        # 이미지 디코딩과 크기 변경은 CPU 작업이므로 프로세스로 나눠서 실행
+        with ProcessPoolExecutor(max_workers = self.__workers) as pool:
+            futures = {
+                pool.submit(ThumbnailCache.MakeThumbnail, source, target, size, self.__format, self.__quality) : source
+                for source, target, size in jobs
+            }
+            for done, future in enumerate(as_completed(futures), start = 1):
+                try:
+                    result["thumbnail_bytes"] += future.result()
+                    result["source_bytes"] += os.path.getsize(futures[future])
+                    result["generated"] += 1
+                except Exception as e:
+                    print(f"썸네일을 만들 수 없습니다 : {futures[future]}\n{e}")
+                    result["failed"] += 1
+                if progress != None:
+                    progress(done, len(jobs))
+        return result
+
+
+
+    def GetStats(self) -> dict:
+        """
+        Get 호출 통계. 현재 프로세스 기준.
+
+        반환 : dict(hits, generated, failed, source_bytes, thumbnail_bytes, bytes_ratio)
+               bytes_ratio는 원본 대신 썸네일을 보내서 줄어든 전송량 비율 (썸네일 / 원본)
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+        stats["bytes_ratio"] = stats["thumbnail_bytes"] / stats["source_bytes"] if stats["source_bytes"] > 0 else 0.0
+        return stats
@@ -0,0 +1,172 @@
+from collections import Counter
+import numpy as np
+import hashlib
+
+class TrendSketch:
+    """
+    고정 키워드 밖의 유행 단어 계측. 메모리 사용량이 단어 수와 관계없이 일정.
+    Count-Min 스케치로 단어별 횟수를 추정하고, 추정값이 큰 단어만 후보로 기억.
+    크기와 시드가 같은 스케치끼리 병합 가능.
+
+    AddWords : 단어 리스트 추가
+    Estimate : 단어 횟수 추정
+    TopK : 횟수가 많은 단어
+    Merge : 다른 스케치와 병합한 새 스케치
+    Total : 추가된 전체 단어 수
+    Clear : 초기화
+    """
+    def __init__(
+        self,
+        width:int = 4096,
+        depth:int = 4,
+        capacity:int = 200,
+        seed:int = 0
+    ):
+        """
+        추정값은 실제 횟수 이상이고, 확률 1 - e^-depth로 초과분이 e / width * 전체 단어 수 이하.
+
+        width : 행마다 칸 수
+        depth : 행 수
+        capacity : 기억할 후보 단어 수
+        seed : 해시 시드. 병합할 스케치끼리 같아야 함.
+        """
+        if width < 1 or depth < 1:
+            raise ValueError(f"width, depth는 1 이상 : {width}, {depth}")
+        self.__width = width
+        self.__depth = depth
+        self.__capacity = capacity
+        self.__seed = seed
+        self.__table = np.zeros((depth, width), dtype = np.int64)
+        self.__rows = np.arange(depth)
+        self.__total = 0
+
+        # 후보 단어와 추정값
+        self.__candidates = {}
+
+
+
+    def __Columns(self, word:str) -> np.ndarray:
+        """
+        단어의 행별 칸 위치
+
+        반환 : depth 길이의 배열
+        """
+        # 해시 하나는 최대 64 byte (8행). 행이 더 많으면 person을 바꿔서 8행씩 이어 붙임.
+        data = word.encode("utf-8", errors = "surrogatepass")
+        digest = b"".join(
+            hashlib.blake2b(
+                data,
+                digest_size = 8 * min(8, self.__depth - block * 8),
+                salt = self.__seed.to_bytes(16, "little"),
+                person = block.to_bytes(16, "little")
+            ).digest()
+            for block in range((self.__depth + 7) // 8)
+        )
+        return np.frombuffer(digest, dtype = np.uint64) % np.uint64(self.__width)
+
+
+
+    def __Offer(
+        self,
+        word:str,
+        estimate:int
+    ):
+        """
+        후보 단어 갱신. 자리가 없으면 추정값이 가장 작은 후보와 비교해서 교체.
+        """
+        candidates = self.__candidates
+        if word in candidates or len(candidates) < self.__capacity:
+            candidates[word] = estimate
+            return
+        smallest = min(candidates, key = candidates.get)
+        if estimate > candidates[smallest]:
+            del candidates[smallest]
+            candidates[word] = estimate
+
+
+
+    def AddWords(self, words:list[str]):
+        """
+        단어 리스트 추가
+
+        words : 단어 리스트
+        """
+        for word, count in Counter(words).items():
+            columns = self.__Columns(word)
+            self.__table[self.__rows, columns] += count
+            self.__total += count
+            self.__Offer(word, int(self.__table[self.__rows, columns].min()))
+
+
+
+    def Estimate(self, word:str) -> int:
+        """
+        단어 횟수 추정. 실제 횟수보다 작지 않음.
+
+        반환 : 추정 횟수
+
+        word : 대상 단어
+        """
+        return int(self.__table[self.__rows, self.__Columns(word)].min())
+
+
+
+    def TopK(self, k:int = 20) -> list[tuple[str, int]]:
+        """
+        횟수가 많은 단어
+
+        반환 : (단어, 추정 횟수) 리스트. 추정 횟수 내림차순.
+
+        k : 단어 수. capacity 이하.
+        """
+        estimates = [(word, self.Estimate(word)) for word in self.__candidates]
+        return sorted(estimates, key = lambda item : (-item[1], item[0]))[ : k]
+
+
+
+    def Merge(self, other:"TrendSketch") -> "TrendSketch":
+        """
+        다른 스케치와 병합. 두 스케치는 바뀌지 않음.
+
+        반환 : 병합한 새 TrendSketch
+
+        other : 병합할 스케치
+        """
+        if (self.__width, self.__depth, self.__seed) != (other.__width, other.__depth, other.__seed):
+            raise ValueError("크기와 시드가 같은 스케치만 병합할 수 있음")
+        result = TrendSketch(self.__width, self.__depth, max(self.__capacity, other.__capacity), self.__seed)
+        result.__table = self.__table + other.__table
+        result.__total = self.__total + other.__total
+
+        # 두 스케치의 후보를 다시 추정해서 큰 순서대로 유지
+        words = set(self.__candidates) | set(other.__candidates)
+        for word, estimate in sorted(((word, result.Estimate(word)) for word in words), key = lambda item : -item[1]):
+            if len(result.__candidates) >= result.__capacity:
+                break
+            result.__candidates[word] = estimate
+        return result
+
+
+
+    def __add__(self, other:"TrendSketch") -> "TrendSketch":
+        return self.Merge(other)
+
+
+
+    def Total(self) -> int:
+        """
+        추가된 전체 단어 수
+
+        반환 : 단어 수
+        """
+        return self.__total
+
+
+
+    def Clear(self):
+        """
+        초기화
+        """
+        self.__table[:] = 0
+        self.__total = 0
+        self.__candidates = {}
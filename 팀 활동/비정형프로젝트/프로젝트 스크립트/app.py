@@ -1,10 +1,116 @@
 import streamlit as st
 import pandas as pd
 import os
-import json
 import random
+import time
 import urllib.parse
 from LLMResponse import LLMResponse
+from NounAnalyzer import NounAnalyzer
+from ResultCache import ResultCache
+from SnapIndex import SnapIndex
+from ThumbnailCache import ThumbnailCache
+from JobQueue import JobQueue
+import threading
+
+# 형태소 분석기를 백그라운드에서 미리 생성. 프로세스마다 한 번만 실행.
+NounAnalyzer.WarmUp()
+
+# 사이드바 선택지. 4 x 4 x 4 = 64개 조합을 미리 분석.
+WEATHERS = ["추움", "보통", "더움", "한파"]
+SITUATIONS = ["출근", "데이트", "캐주얼", "여행"]
+TONES = ["가을뮤트", "봄웜톤", "겨울쿨톤", "여름쿨톤"]
+
+# 데이터 폴더. 다른 폴더에서 실행해도 app.py 위치 기준으로 찾음.
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+RAW_DATA_DIR = os.path.join(APP_DIR, 'raw_data')
+
+# 분석 결과를 새로 계산하는 주기 (초)
+REFRESH_INTERVAL = 6 * 60 * 60
+
+# 동시에 실행할 최대 분석 수, 분석 진행 상황 확인 주기 (초)
+MAX_ANALYSES = 2
+POLL_INTERVAL = 1.0
+
+def make_query(tone, weather, situation):
+    """ 사이드바 선택으로 검색어 생성 """
+    return f"{tone} {weather} {situation} 코디"
+
+# ==========================================
+# [함수 0] 모든 세션이 공유하는 분석 결과 캐시
+# ==========================================
+@st.cache_resource
+def get_result_cache():
+    """
+    64개 조합의 분석 결과를 주기적으로 미리 계산. 오래된 결과는 바로 보여주고 백그라운드에서 갱신.
+    미리 계산과 갱신도 분석 작업 큐로 실행하므로, 화면에서 요청한 분석과 같은 검색어는 한 번만 분석하고 동시 분석 수도 함께 제한됨.
+    """
+    job_queue = get_job_queue()
+    cache = ResultCache(
+        compute = lambda query: job_queue.Submit(
+            query,
+            lambda handle: run_analysis(handle, cache)
+        ).GetResult(),
+        ttl = REFRESH_INTERVAL,
+        cachePath = os.path.join(APP_DIR, "result_cache.pkl")
+    )
+    cache.StartScheduler(
+        [make_query(t, w, s) for t in TONES for w in WEATHERS for s in SITUATIONS],
+        interval = REFRESH_INTERVAL
+    )
+    return cache
+
+# ==========================================
+# [함수 0-3] 모든 세션이 공유하는 분석 작업 큐
+# ==========================================
+@st.cache_resource
+def get_job_queue():
+    """ 캐시에 없는 검색어 분석과 결과 캐시의 미리 계산, 갱신을 백그라운드에서 실행. 같은 검색어는 한 번만 분석. """
+    return JobQueue(workers=MAX_ANALYSES)
+
+# 작업 스레드별 분석기. 분석기는 한 번에 한 검색어만 처리할 수 있음.
+# 키워드 검색기, 명사 추출기, 캐시, 모델은 모든 분석기가 공유하므로 분석기마다 계측 수만 늘어남. 분석마다 빈 대화로 시작.
+_analyzers = threading.local()
+
+def run_analysis(handle, result_cache):
+    """ 작업 큐에서 실행하는 분석. 리포트는 생성되는 대로 중간 결과로 저장하고, 끝나면 결과 캐시에 저장. """
+    if not hasattr(_analyzers, 'analyzer'):
+        _analyzers.analyzer = LLMResponse()
+    query = handle.GetKey()
+    stream, items, colours, materials = _analyzers.analyzer.GetLLMResponseStream(
+        userInput = query,
+        model_name = "gpt-4o-mini"
+    )
+    report = ""
+    handle.SetPartial((report, items, colours, materials))
+    for chunk in stream:
+        report += chunk
+        handle.SetPartial((report, items, colours, materials))
+    response = (report, items, colours, materials)
+    result_cache.Put(query, response)
+    return response
+
+# ==========================================
+# [함수 0-1] 모든 세션이 공유하는 스냅 태그 색인
+# ==========================================
+@st.cache_resource
+def get_snap_index():
+    """ fashion_data.json 태그 역색인. 파일이 바뀌면 조회할 때 다시 읽음. """
+    return SnapIndex(os.path.join(APP_DIR, 'fashion_data.json'))
+
+# ==========================================
+# [함수 0-2] 모든 세션이 공유하는 스냅 썸네일 캐시
+# ==========================================
+@st.cache_resource
+def get_thumbnail_cache():
+    """ 스냅 이미지 썸네일. raw_data 전체는 백그라운드에서 미리 만들고, 없는 썸네일은 조회할 때 생성. """
+    cache = ThumbnailCache(os.path.join(APP_DIR, "thumbnails"))
+    if os.path.isdir(RAW_DATA_DIR):
+        threading.Thread(target=cache.BuildAll, args=(RAW_DATA_DIR,), name="ThumbnailCache-BuildAll", daemon=True).start()
+    return cache
+
+def format_bytes(size):
+    """ 용량을 KB, MB 단위 문자열로 변환 """
+    return f"{size / 1024 / 1024:.1f}MB" if size >= 1024 * 1024 else f"{size / 1024:.0f}KB"
 
 # ==========================================
 # [함수 1] 안전하게 통계 수치를 가져오는 함수
@@ -24,54 +130,65 @@ def get_safe_stat(series):
 # ==========================================
 def display_recommend_image(user_input):
     """ fashion_data.json에서 키워드 일치도가 가장 높은 스냅샷 출력 """
-    json_path = 'fashion_data.json'
-    
-    # 파일 존재 여부 확인
-    if not os.path.exists(json_path):
+    # 사용자 입력 키워드 분리 (예: 가을뮤트, 추움, 데이트)
+    user_keywords = user_input.split()
+
+    # 태그 색인에서 입력된 단어가 가장 많이 포함된 스냅 조회
+    try:
+        best_score, top_list = get_snap_index().Search(user_keywords)
+    except FileNotFoundError:
         st.warning("⚠️ 'fashion_data.json' 파일을 찾을 수 없습니다.")
         return
-        
-    try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
     except Exception as e:
         st.error(f"⚠️ JSON 로드 오류: {e}")
         return
 
-    # 사용자 입력 키워드 분리 (예: 가을뮤트, 추움, 데이트)
-    user_keywords = user_input.split()
-    matched_items = []
-
-    # 태그 매칭 로직
-    for item in metadata:
-        all_tags = " ".join(item.get('tags', []))
-        # 입력된 단어 중 몇 개가 태그에 포함되는지 점수 계산
-        score = sum(1 for kw in user_keywords if kw in all_tags)
-        if score > 0:
-            matched_items.append((score, item))
-
     # 결과가 있을 경우 출력
-    if matched_items:
-        # 점수가 가장 높은 것들 중 랜덤 선택
-        matched_items.sort(key=lambda x: x[0], reverse=True)
-        best_score = matched_items[0][0]
-        top_list = [i for s, i in matched_items if s == best_score]
-        selected = random.choice(top_list)
+    if top_list:
+        # 점수가 가장 높은 것들 중 랜덤 선택. 원본 보기로 다시 그려도 같은 스냅 유지.
+        selected = st.session_state.get('recommend_snap')
+        if selected not in top_list:
+            selected = random.choice(top_list)
+            st.session_state.recommend_snap = selected
         
-        # 경로 보정 및 이미지 출력
-        img_path = selected['image_path'].replace('\\', '/')
+        # 경로 보정 및 이미지 출력. 상대 경로는 app.py 위치 기준.
+        img_path = os.path.normpath(os.path.join(APP_DIR, selected['image_path'].replace('\\', '/')))
         
         if os.path.exists(img_path):
             st.divider()
             st.markdown("### 📸 데이터 기반 실제 스타일링 추천")
-            st.image(img_path, caption=f"추천 스냅 (태그: {', '.join(selected['tags'][:3])}...)")
+
+            # 원본 대신 썸네일 출력. 썸네일을 만들 수 없으면 원본 출력.
+            start_time = time.perf_counter()
+            thumb_path = get_thumbnail_cache().Get(img_path)
+            st.image(thumb_path or img_path, caption=f"추천 스냅 (태그: {', '.join(selected['tags'][:3])}...)")
+            render_time = time.perf_counter() - start_time
+            sent_bytes = os.path.getsize(thumb_path or img_path)
+            st.caption(f"🖼️ 전송 {format_bytes(sent_bytes)} (원본 {format_bytes(os.path.getsize(img_path))}), 출력 {render_time:.3f}초")
+
             st.info(f"💡 이 코디는 선택하신 조건({user_input})과 {best_score}개의 태그가 일치합니다.")
+            # 원본은 요청할 때만 전송. 썸네일이 없으면 이미 원본을 출력함.
+            if thumb_path and st.toggle(f"🔍 원본 이미지 보기 ({format_bytes(os.path.getsize(img_path))})"):
+                st.image(img_path, caption="원본 이미지")
             st.write(f"🔗 [무신사 스냅 상세 보기]({selected['url']})")
         else:
             st.warning(f"⚠️ 이미지 파일이 경로에 없습니다: {img_path}")
     else:
         st.info("💡 준비된 데이터 중 현재 조건과 일치하는 스냅 사진이 없습니다.")
 
+# ==========================================
+# [함수 3] 상단 통계 카드 출력
+# ==========================================
+def display_report_cards(response):
+    """ 상단 통계 카드 출력 (IndexError 방지 로직 적용) """
+    m1, m2, m3 = st.columns(3)
+    with m1: 
+        st.markdown(f'<div class="report-card"><div class="report-label">TOP ITEMS</div><div class="report-value">{get_safe_stat(response[1])}</div></div>', unsafe_allow_html=True)
+    with m2: 
+        st.markdown(f'<div class="report-card"><div class="report-label">TOP COLOURS</div><div class="report-value">{get_safe_stat(response[2])}</div></div>', unsafe_allow_html=True)
+    with m3: 
+        st.markdown(f'<div class="report-card"><div class="report-label">TOP MATERIALS</div><div class="report-value">{get_safe_stat(response[3])}</div></div>', unsafe_allow_html=True)
+
 # ==========================================
 # [설정] 페이지 디자인 및 레이아웃
 # ==========================================
@@ -89,48 +206,89 @@ st.markdown("""
 
 st.markdown('<p class="main-title">lookXpertM</p>', unsafe_allow_html=True)
 
-# LLM 봇 초기화 (세션 상태 유지하여 성능 최적화)
-if 'bot' not in st.session_state:
-    st.session_state.bot = LLMResponse()
-bot = st.session_state.bot
+# 분석 결과 캐시, 분석 작업 큐 (모든 세션이 공유)
+result_cache = get_result_cache()
+job_queue = get_job_queue()
+
+# 분석 작업 현황
+queue_stats = job_queue.GetStats()
+if queue_stats['queued'] + queue_stats['running'] > 0:
+    st.sidebar.caption(f"📊 분석 진행 {queue_stats['running']}건, 대기 {queue_stats['queued']}건")
 
 # ==========================================
 # [사이드바] 사용자 입력 컨트롤러
 # ==========================================
-w = st.sidebar.selectbox("🌡️ 날씨", ["추움", "보통", "더움", "한파"])
-s = st.sidebar.selectbox("📍 상황", ["출근", "데이트", "캐주얼", "여행"])
-t = st.sidebar.selectbox("🌈 톤", ["가을뮤트", "봄웜톤", "겨울쿨톤", "여름쿨톤"])
-user_query = f"{t} {w} {s} 코디"
+w = st.sidebar.selectbox("🌡️ 날씨", WEATHERS)
+s = st.sidebar.selectbox("📍 상황", SITUATIONS)
+t = st.sidebar.selectbox("🌈 톤", TONES)
+user_query = make_query(t, w, s)
 
 # ==========================================
 # [메인 화면] 기능 탭 구성
 # ==========================================
 tab1, tab2, tab3, tab4 = st.tabs(["✨ 스마트 추천", "🛍️ 쇼핑몰 연동", "🔗 트렌드 링크", "🎥 영상 & 트렌드"])
 
+# 분석 중이면 화면을 모두 그린 뒤 잠시 후 다시 확인
+poll_analysis = False
+
 with tab1:
     if st.button("🚀 실시간 트렌드 분석 추천", use_container_width=True, type="primary"):
-        with st.spinner("AI가 트렌드 데이터를 분석하고 리포트를 생성 중입니다..."):
-            
-            # 1. LLMResponse로부터 분석 데이터 가져오기
-            # response 구조: (리포트문구, items_series, colors_series, materials_series)
-            response = bot.GetLLMResponse(
-                userInput = user_query,
-                model_name = "gpt-4o-mini"
+        # 캐시에 없으면 작업 큐에 분석 추가. 같은 검색어를 분석 중이면 (미리 계산, 갱신 포함) 그 작업을 같이 기다림.
+        st.session_state.analysis_query = user_query
+        st.session_state.recommend_snap = None
+        st.session_state.analysis_job = None
+        if result_cache.Peek(user_query) is None:
+            st.session_state.analysis_job = job_queue.Submit(
+                user_query,
+                lambda handle: run_analysis(handle, result_cache)
             )
-            
-            # 2. 상단 통계 카드 출력 (IndexError 방지 로직 적용)
-            m1, m2, m3 = st.columns(3)
-            with m1: 
-                st.markdown(f'<div class="report-card"><div class="report-label">TOP ITEMS</div><div class="report-value">{get_safe_stat(response[1])}</div></div>', unsafe_allow_html=True)
-            with m2: 
-                st.markdown(f'<div class="report-card"><div class="report-label">TOP COLOURS</div><div class="report-value">{get_safe_stat(response[2])}</div></div>', unsafe_allow_html=True)
-            with m3: 
-                st.markdown(f'<div class="report-card"><div class="report-label">TOP MATERIALS</div><div class="report-value">{get_safe_stat(response[3])}</div></div>', unsafe_allow_html=True)
-
-            # 3. 실제 패션 데이터(JSON) 기반 이미지 검색 결과 출력
-            display_recommend_image(user_query)
-
-            # 4. AI 리포트 전문 출력
+
+    if st.session_state.get('analysis_query') is not None:
+        query = st.session_state.analysis_query
+        job = st.session_state.analysis_job
+
+        # 1. 분석 중이면 진행 상황과 지금까지 생성된 리포트를 출력하고 잠시 후 다시 확인
+        # response 구조: (리포트문구, items_series, colors_series, materials_series)
+        if job is not None and not job.IsDone():
+            timings = job.GetTimings()
+            if timings['state'] == 'queued':
+                st.info(f"⏳ 분석 대기 중... (대기 {job_queue.GetStats()['queued']}건, {timings['queued_seconds']:.0f}초)")
+            else:
+                st.info(f"🔄 AI가 트렌드 데이터를 분석하고 있습니다... ({timings['run_seconds']:.0f}초)")
+            partial = job.GetPartial()
+            if partial is not None:
+                display_report_cards(partial)
+                st.divider()
+                st.subheader("📋 AI 스타일 전문가 리포트")
+                st.markdown(partial[0])
+            poll_analysis = True
+
+        # 2. 분석이 끝났으면 결과 가져오기. 결과는 결과 캐시에도 저장되어 있음.
+        elif job is not None:
+            try:
+                response = job.GetResult()
+            except Exception as e:
+                response = None
+                st.session_state.analysis_query = None
+                st.error(f"⚠️ 분석 실패: {e}")
+            timings = job.GetTimings()
+            st.caption(f"⏱️ 분석 {timings['run_seconds']:.0f}초 (대기 {timings['queued_seconds']:.0f}초)")
+
+        # 캐시에 있으면 바로 가져오기. 오래된 결과는 백그라운드에서 갱신.
+        else:
+            entry = result_cache.Peek(query)
+            response = result_cache.Get(query)
+            if entry is not None:
+                st.caption(f"🕒 {int((time.time() - entry[1]) // 60)}분 전 분석 결과")
+
+        if not poll_analysis and response is not None:
+            # 3. 상단 통계 카드 출력
+            display_report_cards(response)
+
+            # 4. 실제 패션 데이터(JSON) 기반 이미지 검색 결과 출력
+            display_recommend_image(query)
+
+            # 5. AI 리포트 전문 출력
             st.divider()
             st.subheader("📋 AI 스타일 전문가 리포트")
             st.markdown(response[0])
@@ -150,4 +308,9 @@ with tab3:
 with tab4:
     cv1, cv2 = st.columns(2)
     cv1.link_button("🎬 유튜브 검색", f"https://www.youtube.com/results?search_query={urllib.parse.quote(user_query)}+추천", use_container_width=True)
-    cv2.link_button("🔬 패션넷", "https://www.fashionnet.or.kr/trend/trend-now/", use_container_width=True)
\ No newline at end of file
+    cv2.link_button("🔬 패션넷", "https://www.fashionnet.or.kr/trend/trend-now/", use_container_width=True)
+
+# 분석 진행 상황 다시 확인
+if poll_analysis:
+    time.sleep(POLL_INTERVAL)
+    st.rerun()